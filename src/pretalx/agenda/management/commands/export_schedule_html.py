@@ -1,28 +1,125 @@
+import hashlib
+import json
 import os.path
-from shutil import make_archive
+import shutil
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
 
 from bakery.management.commands.build import Command as BakeryBuildCommand
 from django.conf import settings
 from django.core.management.base import CommandError
+from django.db import connections
 from django.test import override_settings
 from django.urls import get_callable
 from django.utils import translation
 from django.utils.timezone import override as override_timezone
 
+from pretalx import __version__
+from pretalx.agenda.views.htmlexport import get_fingerprint, get_model_data
+from pretalx.common.models.settings import settings_scope
 from pretalx.event.models import Event
 
+ZIP_MAX_WASTE = 0.5
+ZIP_ENTRY_OVERHEAD = 76  # local file header and central directory record
+
+
+def build_pages(view_name, event_id, pks):
+    """Builds the pages of the given objects with a fresh view for each
+    object, and returns the paths of the files that were written per object.
+
+    This function also runs in the worker processes of parallel exports."""
+    with settings_scope():
+        event = Event.objects.get(pk=event_id)
+        view_class = get_callable(view_name)
+        queryset = view_class(_exporting_event=event).get_queryset().filter(pk__in=pks)
+        return {
+            str(obj.pk): view_class(_exporting_event=event).build_object(obj)
+            for obj in queryset
+        }
+
+
+def get_file_hash(path):
+    content_hash = hashlib.sha256()
+    with open(path, 'rb') as content:
+        for block in iter(lambda: content.read(65536), b''):
+            content_hash.update(block)
+    return content_hash.hexdigest()
+
+
+def write_zip(zip_path, root_dir, names):
+    temp_path = zip_path + '.tmp'
+    with zipfile.ZipFile(temp_path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name in sorted(names):
+            archive.write(os.path.join(root_dir, name), name)
+    os.replace(temp_path, zip_path)
+
+
+def update_zip(zip_path, root_dir, names, changed):
+    """Updates the zip file at ``zip_path``, so that it contains the files
+    ``names`` (relative to ``root_dir``).
+
+    Only the ``changed`` files and files missing from the archive are
+    compressed and appended. Replaced and removed entries are dropped from
+    the central directory, and their data is left behind in the file. Once
+    more than ``ZIP_MAX_WASTE`` of the file is unused, it is written anew.
+
+    The update is made to a copy of the zip file, which then replaces it, so
+    that downloads in progress keep reading a complete file."""
+    if not os.path.exists(zip_path):
+        return write_zip(zip_path, root_dir, names)
+    names = set(names)
+    temp_path = zip_path + '.tmp'
+    shutil.copyfile(zip_path, temp_path)
+    with zipfile.ZipFile(temp_path, 'a', zipfile.ZIP_DEFLATED) as archive:
+        existing = {info.filename for info in archive.infolist()}
+        added = (names - existing) | (names & set(changed))
+        stale = [
+            info
+            for info in archive.infolist()
+            if info.filename not in names or info.filename in added
+        ]
+        for info in stale:
+            archive.filelist.remove(info)
+            archive.NameToInfo.pop(info.filename, None)
+        for name in sorted(added):
+            archive.write(os.path.join(root_dir, name), name)
+        used = sum(
+            info.compress_size + ZIP_ENTRY_OVERHEAD + 2 * len(info.filename)
+            for info in archive.infolist()
+        )
+    # Without new entries, the central directory is not written again
+    if (stale and not added) or used < os.path.getsize(temp_path) * (1 - ZIP_MAX_WASTE):
+        os.remove(temp_path)
+        return write_zip(zip_path, root_dir, names)
+    os.replace(temp_path, zip_path)
+
 
 class Command(BakeryBuildCommand):
     help = 'Exports event schedule as a static HTML dump'
 
     def __init__(self, *args, **kwargs):
         self._exporting_event = None
+        self.manifest = {}
+        self.pages = {}
+        self.processes = 1
         super().__init__(*args, **kwargs)
 
     def add_arguments(self, parser):
         super().add_arguments(parser)
         parser.add_argument('event', type=str)
         parser.add_argument('--zip', action='store_true')
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Build all pages, even if they did not change since the last export.',
+        )
+        parser.add_argument(
+            '--processes',
+            type=int,
+            default=1,
+            help='Build pages in this many parallel processes.',
+        )
 
     @classmethod
     def get_output_dir(cls, event):
@@ -34,6 +131,44 @@ class Command(BakeryBuildCommand):
     def get_output_zip_path(cls, event):
         return cls.get_output_dir(event) + '.zip'
 
+    @classmethod
+    def get_manifest_path(cls, event):
+        return cls.get_output_dir(event) + '.manifest.json'
+
+    @staticmethod
+    def get_event_fingerprint(event):
+        """Changes whenever all pages of the event have to be built again."""
+        compress_manifest = os.path.join(
+            settings.COMPRESS_ROOT,
+            settings.COMPRESS_OUTPUT_DIR,
+            settings.COMPRESS_OFFLINE_MANIFEST,
+        )
+        return get_fingerprint(
+            [
+                __version__,
+                translation.get_language(),
+                # The content revision changes with every page, not just all of them
+                get_model_data(event, exclude=('content_revision',)),
+                event.settings.freeze(),
+                [get_model_data(room) for room in event.rooms.all()],
+                [get_model_data(track) for track in event.tracks.all()],
+                [get_model_data(typ) for typ in event.submission_types.all()],
+                get_file_hash(compress_manifest)
+                if os.path.exists(compress_manifest)
+                else None,
+            ]
+        )
+
+    def load_manifest(self, event, fingerprint):
+        try:
+            with open(self.get_manifest_path(event)) as manifest_file:
+                manifest = json.load(manifest_file)
+        except (OSError, ValueError):
+            return {}
+        if manifest.get('event') != fingerprint:
+            return {}
+        return manifest
+
     def build_media(self):
         output_dir = self.get_output_dir(self._exporting_event)
         os.makedirs(
@@ -49,6 +184,7 @@ class Command(BakeryBuildCommand):
             raise CommandError(f'Could not find event with slug "{event_slug}".')
 
         self._exporting_event = event
+        self.processes = max(options.get('processes') or 1, 1)
         translation.activate(event.locale)
 
         output_dir = self.get_output_dir(event)
@@ -59,19 +195,121 @@ class Command(BakeryBuildCommand):
             MEDIA_URL=os.path.join(settings.MEDIA_URL, event_slug),
             MEDIA_ROOT=os.path.join(settings.MEDIA_ROOT, event_slug),
         ):
-            with override_timezone(event.timezone):
+            with override_timezone(event.timezone), settings_scope():
+                fingerprint = self.get_event_fingerprint(event)
+                self.manifest = (
+                    {}
+                    if options.get('full')
+                    else self.load_manifest(event, fingerprint)
+                )
+                if self.manifest and os.path.exists(output_dir):
+                    options['keep_build_dir'] = True
                 super().handle(*args, **options)
+                files = {
+                    os.path.relpath(os.path.join(path, name), output_dir): get_file_hash(
+                        os.path.join(path, name)
+                    )
+                    for path, _, names in os.walk(output_dir)
+                    for name in names
+                }
                 if options.get('zip', False):
-                    make_archive(
-                        base_name=output_dir,
-                        format='zip',
+                    old_files = self.manifest.get('files', {})
+                    update_zip(
+                        self.get_output_zip_path(event),
                         root_dir=settings.HTMLEXPORT_ROOT,
-                        base_dir=event.slug,
+                        names=[os.path.join(event.slug, path) for path in files],
+                        changed=[
+                            os.path.join(event.slug, path)
+                            for path, file_hash in files.items()
+                            if old_files.get(path) != file_hash
+                        ],
                     )
                     output_dir += '.zip'
+                with open(self.get_manifest_path(event), 'w') as manifest_file:
+                    json.dump(
+                        {'event': fingerprint, 'pages': self.pages, 'files': files},
+                        manifest_file,
+                    )
         self.stdout.write(output_dir)
 
     def build_views(self):
-        for view_str in self.view_list:
-            view = get_callable(view_str)
-            view(_exporting_event=self._exporting_event).build_method()
+        """Builds the pages whose data changed since the last export, and
+        removes the files of pages that no longer exist."""
+        old_pages = self.manifest.get('pages', {})
+        self.pages = {}
+        work = {}
+        for view_name in self.view_list:
+            view = get_callable(view_name)(_exporting_event=self._exporting_event)
+            pages = self.pages[view_name] = {}
+            for obj in view.get_queryset():
+                key = str(obj.pk)
+                data = view.get_page_data(obj)
+                fingerprint = get_fingerprint(data) if data is not None else None
+                page = old_pages.get(view_name, {}).get(key)
+                if (
+                    fingerprint
+                    and page
+                    and page['fingerprint'] == fingerprint
+                    and all(
+                        os.path.exists(os.path.join(self.build_dir, path))
+                        for path in page['files']
+                    )
+                ):
+                    pages[key] = page
+                    continue
+                pages[key] = {'fingerprint': fingerprint, 'files': []}
+                work.setdefault(view_name, []).append(obj.pk)
+
+        for view_name, results in self.run_builds(work):
+            for key, paths in results.items():
+                self.pages[view_name][key]['files'] = [
+                    os.path.relpath(path, self.build_dir) for path in paths
+                ]
+
+        files = {
+            path
+            for pages in self.pages.values()
+            for page in pages.values()
+            for path in page['files']
+        }
+        for pages in old_pages.values():
+            for page in pages.values():
+                for path in set(page['files']) - files:
+                    self.remove_file(os.path.join(self.build_dir, path))
+
+    def run_builds(self, work):
+        if self.processes == 1:
+            for view_name, pks in work.items():
+                yield view_name, build_pages(view_name, self._exporting_event.pk, pks)
+            return
+        # Worker processes are forked and must not share our database connections
+        connections.close_all()
+        with ProcessPoolExecutor(
+            max_workers=self.processes, mp_context=get_context('fork')
+        ) as executor:
+            futures = [
+                (
+                    view_name,
+                    executor.submit(
+                        build_pages,
+                        view_name,
+                        self._exporting_event.pk,
+                        pks[index :: self.processes],
+                    ),
+                )
+                for view_name, pks in work.items()
+                for index in range(min(self.processes, len(pks)))
+            ]
+            for view_name, future in futures:
+                yield view_name, future.result()
+
+    def remove_file(self, path):
+        if not os.path.exists(path):
+            return
+        os.remove(path)
+        directory = os.path.dirname(path)
+        while directory.startswith(self.build_dir + os.sep) and not os.listdir(
+            directory
+        ):
+            os.rmdir(directory)
+            directory = os.path.dirname(directory)
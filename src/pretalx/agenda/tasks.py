@@ -1,5 +1,7 @@
 import logging
 
+from django.conf import settings
+
 from pretalx.celery_app import app
 from pretalx.event.models import Event
 
@@ -21,4 +23,6 @@ def export_schedule_html(*, event_id: int, make_zip=True):
     cmd = ['export_schedule_html', event.slug]
     if make_zip:
         cmd.append('--zip')
+    if settings.HTMLEXPORT_PROCESSES > 1:
+        cmd += ['--processes', str(settings.HTMLEXPORT_PROCESSES)]
     call_command(*cmd)
@@ -1,15 +1,35 @@
+from functools import partial
 from urllib.parse import urlencode
 
 from django.contrib.syndication.views import Feed
 from django.http import Http404
 from django.utils import feedgenerator
 
+from pretalx.common.mixins.views import ConditionalResponse
 
-class ScheduleFeed(Feed):
+
+class ScheduleFeed(ConditionalResponse, Feed):
 
     feed_type = feedgenerator.Atom1Feed
     description_template = 'agenda/feed/description.html'
 
+    def __call__(self, request, *args, **kwargs):
+        if not request.user.has_perm('agenda.view_schedule', request.event):
+            raise Http404()
+        return self.conditional_response(
+            request, partial(super().__call__, request, *args, **kwargs)
+        )
+
+    def get_etag_parts(self, request):
+        schedule = request.event.current_schedule
+        if not schedule:
+            return None
+        return (schedule.pk, schedule.version, schedule.published)
+
+    def get_last_modified(self, request):
+        schedule = request.event.current_schedule
+        return schedule.published if schedule else None
+
     def get_object(self, request, *args, **kwargs):
         if not request.user.has_perm('agenda.view_schedule', request.event):
             raise Http404()
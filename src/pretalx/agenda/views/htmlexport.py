@@ -1,15 +1,49 @@
+import hashlib
+import json
 import os
 
 from bakery.views import BuildableDetailView
 from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
 from django.utils.functional import cached_property
 from django_context_decorator import context
+from i18nfield.utils import I18nJSONEncoder
 
 from pretalx.agenda.views.schedule import ExporterView, ScheduleView
 from pretalx.agenda.views.speaker import SpeakerView
 from pretalx.agenda.views.talk import SingleICalView, TalkView
+from pretalx.event.revision import get_content_revision
 from pretalx.person.models import SpeakerProfile
 from pretalx.schedule.models import Schedule
+from pretalx.submission.models import QuestionTarget
+
+
+def get_response_content(response):
+    if response.streaming:
+        return b''.join(response.streaming_content)
+    return response.content
+
+
+class FingerprintEncoder(I18nJSONEncoder):
+    def default(self, obj):
+        try:
+            return super().default(obj)
+        except TypeError:
+            return str(obj)
+
+
+def get_fingerprint(data) -> str:
+    """Hashes any combination of model instances, querysets and plain values."""
+    content = json.dumps(data, cls=FingerprintEncoder, sort_keys=True)
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def get_model_data(obj, exclude=()) -> list:
+    return [
+        field.value_from_object(obj)
+        for field in obj._meta.concrete_fields
+        if field.name not in exclude
+    ]
 
 
 class PretalxExportContextMixin:
@@ -20,6 +54,7 @@ class PretalxExportContextMixin:
     def create_request(self, *args, **kwargs):
         request = super().create_request(*args, **kwargs)
         request.event = self._exporting_event
+        request.user = AnonymousUser()
         return request
 
     @cached_property
@@ -37,6 +72,22 @@ class PretalxExportContextMixin:
     def get_queryset(self):
         return super().get_queryset().filter(event=self._exporting_event)
 
+    def get_page_data(self, obj):
+        """Returns the data the page of ``obj`` is built from, in addition to
+        the event and its settings. Pages are only built again when this data
+        has changed since the last export. ``None`` builds the page on every
+        export."""
+        return None
+
+    def build_file(self, path, html):
+        self.built_paths.append(path)
+        return super().build_file(path, html)
+
+    def build_object(self, obj):
+        self.built_paths = []
+        super().build_object(obj)
+        return self.built_paths
+
     def get_file_build_path(self, obj):
         dir_path, file_name = os.path.split(self.get_url(obj))
         path = os.path.join(settings.BUILD_DIR, dir_path[1:])
@@ -45,63 +96,63 @@ class PretalxExportContextMixin:
         return os.path.join(path, file_name)
 
 
-class ExportScheduleView(PretalxExportContextMixin, BuildableDetailView, ScheduleView):
-    """ Build the current schedule. """
+class CurrentScheduleExportMixin(PretalxExportContextMixin):
+    """All published schedules share the URL of the current schedule, so
+    only the current schedule is built."""
+
+    def get_queryset(self):
+        return Schedule.objects.filter(
+            pk=getattr(self._exporting_event.current_schedule, 'pk', None)
+        ).select_related('event')
+
 
-    queryset = Schedule.objects.filter(published__isnull=False).order_by('published').select_related('event').prefetch_related('talks')
+class ExportScheduleView(CurrentScheduleExportMixin, BuildableDetailView, ScheduleView):
+    """ Build the current schedule. """
 
     @staticmethod
     def get_url(obj):
         return obj.event.urls.schedule
 
 
-class ExportFrabXmlView(PretalxExportContextMixin, BuildableDetailView, ExporterView):
-    queryset = Schedule.objects.filter(published__isnull=False).order_by('published').select_related('event').prefetch_related('talks')
-
+class ExportFrabXmlView(CurrentScheduleExportMixin, BuildableDetailView, ExporterView):
     def get_url(self, obj):
         return obj.event.urls.frab_xml
 
     def get_content(self):
-        return self.get(self.request, self._exporting_event).content
+        return get_response_content(self.get(self.request, self._exporting_event))
 
     def get_build_path(self, obj):
         return self.get_file_build_path(obj)
 
 
-class ExportFrabXCalView(PretalxExportContextMixin, BuildableDetailView, ExporterView):
-    queryset = Schedule.objects.filter(published__isnull=False).order_by('published').select_related('event').prefetch_related('talks')
-
+class ExportFrabXCalView(CurrentScheduleExportMixin, BuildableDetailView, ExporterView):
     def get_url(self, obj):
         return obj.event.urls.frab_xcal
 
     def get_content(self):
-        return self.get(self.request, self._exporting_event).content
+        return get_response_content(self.get(self.request, self._exporting_event))
 
     def get_build_path(self, obj):
         return self.get_file_build_path(obj)
 
 
-class ExportFrabJsonView(PretalxExportContextMixin, BuildableDetailView, ExporterView):
-    queryset = Schedule.objects.filter(published__isnull=False).order_by('published').select_related('event').prefetch_related('talks')
-
+class ExportFrabJsonView(CurrentScheduleExportMixin, BuildableDetailView, ExporterView):
     def get_url(self, obj):
         return obj.event.urls.frab_json
 
     def get_content(self):
-        return self.get(self.request, self._exporting_event).content
+        return get_response_content(self.get(self.request, self._exporting_event))
 
     def get_build_path(self, obj):
         return self.get_file_build_path(obj)
 
 
-class ExportICalView(PretalxExportContextMixin, BuildableDetailView, ExporterView):
-    queryset = Schedule.objects.filter(published__isnull=False).order_by('published').select_related('event').prefetch_related('talks')
-
+class ExportICalView(CurrentScheduleExportMixin, BuildableDetailView, ExporterView):
     def get_url(self, obj):
         return obj.event.urls.ical
 
     def get_content(self):
-        return self.get(self.request, self._exporting_event).content
+        return get_response_content(self.get(self.request, self._exporting_event))
 
     def get_build_path(self, obj):
         return self.get_file_build_path(obj)
@@ -113,19 +164,13 @@ class ExportScheduleVersionsView(
 ):
     queryset = Schedule.objects.filter(version__isnull=False)
 
+    def get_page_data(self, obj):
+        # Released versions do not change, but they show the current titles
+        # and speakers of their talks, and link to the latest version.
+        return [obj.pk, obj.version, get_content_revision(self._exporting_event)]
 
-class ExportTalkView(PretalxExportContextMixin, BuildableDetailView, TalkView):
-    def get_queryset(self):
-        return self._exporting_event.submissions.filter(
-            pk__in=self._exporting_event.current_schedule.slots.all().values_list(
-                'pk', flat=True
-            )
-        )
 
-
-class ExportTalkICalView(
-    PretalxExportContextMixin, BuildableDetailView, SingleICalView
-):
+class TalkExportMixin(PretalxExportContextMixin):
     def get_queryset(self):
         return self._exporting_event.submissions.filter(
             pk__in=self._exporting_event.current_schedule.slots.all().values_list(
@@ -133,6 +178,38 @@ class ExportTalkICalView(
             )
         )
 
+    def get_page_data(self, obj):
+        schedule = self._exporting_event.current_schedule
+        return [
+            get_model_data(obj),
+            schedule.talks.filter(submission=obj, is_visible=True).values_list(
+                'start', 'end', 'room__name'
+            ),
+            obj.active_resources.values_list('resource', 'description'),
+            obj.answers.filter(
+                question__is_public=True,
+                question__event=self._exporting_event,
+                question__target=QuestionTarget.SUBMISSION,
+            ).values_list('question__question', 'question__variant', 'answer', 'answer_file'),
+            [
+                [
+                    speaker.code,
+                    speaker.name,
+                    schedule.slots.filter(speakers=speaker)
+                    .exclude(pk=obj.pk)
+                    .values_list('code', 'title'),
+                ]
+                for speaker in obj.speakers.all()
+            ],
+        ]
+
+
+class ExportTalkView(TalkExportMixin, BuildableDetailView, TalkView):
+    pass
+
+
+class ExportTalkICalView(TalkExportMixin, BuildableDetailView, SingleICalView):
+
     @staticmethod
     def get_url(obj):
         return obj.urls.ical
@@ -148,3 +225,16 @@ class ExportSpeakerView(PretalxExportContextMixin, BuildableDetailView, SpeakerV
     queryset = SpeakerProfile.objects.filter(
         user__submissions__slots__schedule__published__isnull=False
     ).select_related('user', 'event').prefetch_related('user__submissions').distinct()
+
+    def get_page_data(self, obj):
+        user = obj.user
+        return [
+            obj.biography,
+            [user.code, user.name, user.email, user.avatar, user.get_gravatar],
+            obj.talks.values_list('code', 'title', 'abstract'),
+            user.answers.filter(
+                question__is_public=True,
+                question__event=self._exporting_event,
+                question__target=QuestionTarget.SPEAKER,
+            ).values_list('question__question', 'question__variant', 'answer', 'answer_file'),
+        ]
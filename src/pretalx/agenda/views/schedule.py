@@ -1,19 +1,27 @@
 import hashlib
+import logging
 from datetime import timedelta
+from functools import partial
 from urllib.parse import unquote
 
 import pytz
 from django.http import (
-    Http404, HttpResponse, HttpResponseNotModified, HttpResponsePermanentRedirect,
+    Http404, HttpResponse, HttpResponsePermanentRedirect, StreamingHttpResponse,
 )
 from django.urls import resolve, reverse
+from django.utils.cache import get_conditional_response
 from django.utils.functional import cached_property
+from django.utils.http import quote_etag
 from django.utils.timezone import now
+from django.utils.translation import get_language
 from django.views.generic import TemplateView
 from django_context_decorator import context
 
-from pretalx.common.mixins.views import EventPermissionRequired
+from pretalx.common.mixins.views import ConditionalResponse, EventPermissionRequired
 from pretalx.common.signals import register_data_exporters
+from pretalx.event.revision import get_content_revision
+
+logger = logging.getLogger(__name__)
 
 
 class ScheduleDataView(EventPermissionRequired, TemplateView):
@@ -69,7 +77,7 @@ class ScheduleDataView(EventPermissionRequired, TemplateView):
         return result
 
 
-class ExporterView(ScheduleDataView):
+class ExporterView(ConditionalResponse, ScheduleDataView):
     def get_exporter(self, request):
         url = resolve(request.path_info)
 
@@ -89,31 +97,85 @@ class ExporterView(ScheduleDataView):
                     return ex
         return None
 
+    @cached_property
+    def exporter(self):
+        exporter = self.get_exporter(self.request)
+        if exporter:
+            exporter.schedule = self.schedule
+            exporter.is_orga = getattr(self.request, 'is_orga', False)
+        return exporter
+
+    def get_etag(self, request):
+        return getattr(self.exporter, 'fingerprint', None)
+
+    def get_last_modified(self, request):
+        return getattr(self.exporter, 'last_modified', None)
+
     def get(self, request, *args, **kwargs):
-        exporter = self.get_exporter(request)
-        if not exporter:
+        if not self.exporter:
             raise Http404()
+        return self.conditional_response(
+            request, partial(self.get_export_response, request)
+        )
+
+    def get_export_response(self, request):
+        exporter = self.exporter
         try:
-            exporter.schedule = self.schedule
-            exporter.is_orga = getattr(self.request, 'is_orga', False)
-            file_name, file_type, data = exporter.render()
-            etag = hashlib.sha1(str(data).encode()).hexdigest()
-            if 'HTTP_IF_NONE_MATCH' in request.META:
-                if request.META['HTTP_IF_NONE_MATCH'] == etag:
-                    return HttpResponseNotModified()
-            resp = HttpResponse(data, content_type=file_type)
-            resp['ETag'] = etag
+            if hasattr(exporter, 'render_stream'):
+                file_name, file_type, chunks = exporter.render_stream()
+                resp = StreamingHttpResponse(
+                    self.stream_export(chunks), content_type=file_type
+                )
+            else:
+                file_name, file_type, data = exporter.render()
+                if not self.get_etag(request):
+                    # Without fingerprint, we can only compare the rendered content
+                    etag = quote_etag(hashlib.sha1(str(data).encode()).hexdigest())
+                    not_modified = get_conditional_response(request, etag=etag)
+                    if not_modified:
+                        return not_modified
+                    resp = HttpResponse(data, content_type=file_type)
+                    resp['ETag'] = etag
+                else:
+                    resp = HttpResponse(data, content_type=file_type)
             if file_type not in ['application/json', 'text/xml']:
                 resp['Content-Disposition'] = f'attachment; filename="{file_name}"'
             return resp
         except Exception:
             raise Http404()
 
+    def stream_export(self, chunks):
+        """Errors while streaming cannot be turned into an error response
+        anymore, as the status has already been sent. They are logged, and
+        abort the response instead of ending it like a complete export."""
+        try:
+            yield from chunks
+        except Exception:
+            logger.exception(
+                f'Export {self.exporter.identifier} of event {self.request.event.slug} failed.'
+            )
+            raise
+
 
-class ScheduleView(ScheduleDataView):
+class ScheduleView(ConditionalResponse, ScheduleDataView):
     template_name = 'agenda/schedule.html'
     permission_required = 'agenda.view_schedule'
 
+    def get_etag_parts(self, request):
+        schedule = self.schedule
+        if not schedule or not schedule.version:
+            return None
+        return (
+            schedule.pk,
+            schedule.version,
+            get_content_revision(request.event),
+            getattr(request.event.current_schedule, 'pk', None),
+            request.user.pk,
+            get_language(),
+            # Talks currently taking place are highlighted
+            now().replace(second=0, microsecond=0),
+        )
+
     def get_object(self):
         if self.version == 'wip' and self.request.user.has_perm(
             'orga.view_schedule', self.request.event
@@ -155,13 +217,17 @@ class ScheduleView(ScheduleDataView):
                 max_rooms = max(max_rooms, len(date['rooms']))
                 for room in date['rooms']:
                     for talk in room.get('talks', []):
-                        talk.top = int(
-                            (talk.start.astimezone(timezone) - start).total_seconds()
+                        talk['top'] = int(
+                            (talk['start'].astimezone(timezone) - start).total_seconds()
                             / 60
                             * 2
                         )
-                        talk.height = int(talk.duration * 2)
-                        talk.is_active = talk.start <= now() <= talk.real_end
+                        talk['height'] = int(talk['duration'] * 2)
+                        talk['is_active'] = talk['start'] <= now() <= talk['real_end']
+                        talk['is_personal'] = any(
+                            speaker['id'] == self.request.user.pk
+                            for speaker in talk['submission']['speakers']
+                        )
         result['max_rooms'] = max_rooms
         return result
 
@@ -1,15 +1,20 @@
 from django.http import HttpResponseRedirect
+from django.utils.translation import get_language
 from django.views.generic import TemplateView
 from django_context_decorator import context
 
-from pretalx.common.mixins.views import EventPermissionRequired
+from pretalx.common.mixins.views import ConditionalResponse, EventPermissionRequired
+from pretalx.event.revision import get_content_revision
 from pretalx.submission.models import SubmissionStates
 
 
-class SneakpeekView(EventPermissionRequired, TemplateView):
+class SneakpeekView(ConditionalResponse, EventPermissionRequired, TemplateView):
     template_name = 'agenda/sneakpeek.html'
     permission_required = 'agenda.view_sneak_peek'
 
+    def get_etag_parts(self, request):
+        return (get_content_revision(request.event), request.user.pk, get_language())
+
     @context
     def talks(self):
         return self.request.event.submissions.filter(
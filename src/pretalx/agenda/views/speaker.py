@@ -1,3 +1,4 @@
+from functools import partial
 from urllib.parse import urlparse
 
 import vobject
@@ -8,16 +9,18 @@ from django.http import Http404, HttpResponse
 from django.shortcuts import redirect
 from django.utils.decorators import method_decorator
 from django.utils.functional import cached_property
+from django.utils.translation import get_language
 from django.views.generic import DetailView, TemplateView
 from django_context_decorator import context
 
-from pretalx.common.mixins.views import PermissionRequired
+from pretalx.common.mixins.views import ConditionalResponse, PermissionRequired
+from pretalx.event.revision import get_content_revision
 from pretalx.person.models import SpeakerProfile, User
 from pretalx.submission.models import QuestionTarget
 
 
 @method_decorator(csp_update(IMG_SRC="https://www.gravatar.com"), name='dispatch')
-class SpeakerView(PermissionRequired, TemplateView):
+class SpeakerView(ConditionalResponse, PermissionRequired, TemplateView):
     template_name = 'agenda/speaker.html'
     permission_required = 'agenda.view_speaker'
     slug_field = 'code'
@@ -36,6 +39,14 @@ class SpeakerView(PermissionRequired, TemplateView):
     def get_permission_object(self):
         return self.profile
 
+    def get_etag_parts(self, request):
+        return (
+            get_content_revision(request.event),
+            self.kwargs['code'],
+            request.user.pk,
+            get_language(),
+        )
+
     @context
     def answers(self):
         return self.profile.user.answers.filter(
@@ -56,17 +67,35 @@ class SpeakerRedirect(DetailView):
         raise Http404()
 
 
-class SpeakerTalksIcalView(PermissionRequired, DetailView):
+class SpeakerTalksIcalView(ConditionalResponse, PermissionRequired, DetailView):
     context_object_name = 'profile'
     permission_required = 'agenda.view_speaker'
     slug_field = 'code'
 
+    def get_etag_parts(self, request):
+        schedule = request.event.current_schedule
+        if not schedule:
+            return None
+        return (
+            schedule.pk,
+            get_content_revision(request.event),
+            get_language(),
+            self.kwargs['code'],
+        )
+
+    def get_last_modified(self, request):
+        schedule = request.event.current_schedule
+        return schedule.last_modified if schedule else None
+
     def get_object(self, queryset=None):
         return SpeakerProfile.objects.filter(
             event=self.request.event, user__code__iexact=self.kwargs['code']
         ).first()
 
     def get(self, request, event, *args, **kwargs):
+        return self.conditional_response(request, partial(self.get_ical, request))
+
+    def get_ical(self, request):
         netloc = urlparse(settings.SITE_URL).netloc
         speaker = self.get_object()
         slots = self.request.event.current_schedule.talks.filter(
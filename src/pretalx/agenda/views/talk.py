@@ -1,4 +1,5 @@
 from contextlib import suppress
+from functools import partial
 from urllib.parse import urlparse
 
 import vobject
@@ -8,16 +9,17 @@ from django.db.models import Q
 from django.http import Http404, HttpResponse
 from django.shortcuts import render
 from django.utils.functional import cached_property
-from django.utils.translation import ugettext_lazy as _
+from django.utils.translation import get_language, ugettext_lazy as _
 from django.views.generic import DetailView, FormView, ListView, TemplateView
 from django_context_decorator import context
 
 from pretalx.agenda.signals import register_recording_provider
 from pretalx.cfp.views.event import EventPageMixin
 from pretalx.common.mixins.views import (
-    EventPermissionRequired, Filterable, PermissionRequired,
+    ConditionalResponse, EventPermissionRequired, Filterable, PermissionRequired,
 )
 from pretalx.common.phrases import phrases
+from pretalx.event.revision import get_content_revision
 from pretalx.person.models.profile import SpeakerProfile
 from pretalx.schedule.models import Schedule, TalkSlot
 from pretalx.submission.forms import FeedbackForm
@@ -62,7 +64,7 @@ class SpeakerList(EventPermissionRequired, Filterable, ListView):
         return self.request.GET.get('q')
 
 
-class TalkView(PermissionRequired, TemplateView):
+class TalkView(ConditionalResponse, PermissionRequired, TemplateView):
     model = Submission
     slug_field = 'code'
     template_name = 'agenda/talk.html'
@@ -108,6 +110,16 @@ class TalkView(PermissionRequired, TemplateView):
     def recording_iframe(self):
         return self.recording.get('iframe')
 
+    def get_etag_parts(self, request):
+        return (
+            get_content_revision(request.event),
+            self.kwargs['slug'],
+            request.user.pk,
+            get_language(),
+            self.submission.does_accept_feedback,
+            self.recording.get('iframe'),
+        )
+
     def get(self, request, *args, **kwargs):
         response = super().get(request, *args, **kwargs)
         if self.recording.get('csp_header'):
@@ -177,11 +189,29 @@ class TalkReviewView(TalkView):
         raise Http404()
 
 
-class SingleICalView(EventPageMixin, DetailView):
+class SingleICalView(ConditionalResponse, EventPageMixin, DetailView):
     model = Submission
     slug_field = 'code'
 
+    def get_etag_parts(self, request):
+        schedule = request.event.current_schedule
+        if not schedule:
+            return None
+        return (
+            schedule.pk,
+            get_content_revision(request.event),
+            get_language(),
+            self.kwargs['slug'],
+        )
+
+    def get_last_modified(self, request):
+        schedule = request.event.current_schedule
+        return schedule.last_modified if schedule else None
+
     def get(self, request, event, **kwargs):
+        return self.conditional_response(request, partial(self.get_ical, request))
+
+    def get_ical(self, request):
         talk = (
             self.get_object()
             .slots.filter(schedule=self.request.event.current_schedule, is_visible=True)
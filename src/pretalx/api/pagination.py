@@ -0,0 +1,48 @@
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
+
+
+class KeysetPagination(CursorPagination):
+    """Paginates by primary key: every page is fetched with an indexed
+    ``pk > last_pk`` lookup, so that deep pages are as fast as the first
+    page."""
+    ordering = 'pk'
+    page_size_query_param = 'limit'
+    max_page_size = 1000
+
+
+class ApiPagination(LimitOffsetPagination):
+    """Uses limit/offset pagination by default, and switches to
+    :class:`KeysetPagination` if the ``cursor`` parameter is given. Clients
+    request the first page with an empty ``cursor`` and then follow the
+    ``next`` links."""
+    keyset_class = KeysetPagination
+    keyset = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.keyset_class.cursor_query_param in request.query_params:
+            self.keyset = self.keyset_class()
+            page = self.keyset.paginate_queryset(queryset, request, view=view)
+            self.display_page_controls = self.keyset.display_page_controls
+            return page
+        return self.paginate_by_offset(queryset, request, view=view)
+
+    def paginate_by_offset(self, queryset, request, view=None):
+        return super().paginate_queryset(queryset, request, view=view)
+
+    def get_paginated_response(self, data):
+        if self.keyset:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def to_html(self):
+        if self.keyset:
+            return self.keyset.to_html()
+        return super().to_html()
+
+
+class KeysetOnlyPagination(ApiPagination):
+    """Returns unpaginated lists unless the ``cursor`` parameter is given, for
+    endpoints that have always returned complete lists."""
+
+    def paginate_by_offset(self, queryset, request, view=None):
+        return None
@@ -0,0 +1,36 @@
+from django.db.models import QuerySet
+
+
+class PrefetchSerializerMixin:
+    """Serializers declare the related objects they read in
+    ``select_related`` and ``prefetch_related``, so that viewsets can load
+    them in bulk instead of once per serialized object.
+
+    Plans that depend on the request, like ``Prefetch`` objects filtered by
+    the current event, are added by overriding :meth:`get_prefetch_plan`."""
+    select_related = ()
+    prefetch_related = ()
+
+    @classmethod
+    def get_prefetch_plan(cls, request) -> list:
+        return list(cls.prefetch_related)
+
+    @classmethod
+    def optimize_queryset(cls, queryset, request=None):
+        return queryset.select_related(*cls.select_related).prefetch_related(
+            *cls.get_prefetch_plan(request)
+        )
+
+
+class PrefetchViewSetMixin:
+    """Applies the prefetch plan of the serializer class to the queryset of
+    list and detail requests."""
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        serializer_class = self.get_serializer_class()
+        if isinstance(queryset, QuerySet) and issubclass(
+            serializer_class, PrefetchSerializerMixin
+        ):
+            queryset = serializer_class.optimize_queryset(queryset, self.request)
+        return queryset
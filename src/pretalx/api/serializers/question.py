@@ -1,5 +1,6 @@
 from rest_framework.serializers import ModelSerializer, SlugRelatedField
 
+from pretalx.api.prefetch import PrefetchSerializerMixin
 from pretalx.person.models import User
 from pretalx.submission.models import Answer, AnswerOption, Question, Submission
 
@@ -18,12 +19,15 @@ class QuestionSerializer(ModelSerializer):
         fields = ('id', 'question', 'required', 'target', 'options')
 
 
-class AnswerSerializer(ModelSerializer):
+class AnswerSerializer(PrefetchSerializerMixin, ModelSerializer):
     question = QuestionSerializer(Question.objects.all(), read_only=True)
     submission = SlugRelatedField(queryset=Submission.objects.all(), slug_field='code')
     person = SlugRelatedField(queryset=User.objects.all(), slug_field='code')
     options = AnswerOptionSerializer(many=True)
 
+    select_related = ('question', 'submission', 'person')
+    prefetch_related = ('question__options', 'options')
+
     class Meta:
         model = Answer
         fields = (
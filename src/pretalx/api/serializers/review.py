@@ -1,18 +1,31 @@
+from django.db.models import Prefetch
 from rest_framework.serializers import (
     ModelSerializer, SerializerMethodField, SlugRelatedField,
 )
 
+from pretalx.api.prefetch import PrefetchSerializerMixin
 from pretalx.api.serializers.question import AnswerSerializer
 from pretalx.submission.models import Answer, Review
 
 
-class ReviewSerializer(ModelSerializer):
+class ReviewSerializer(PrefetchSerializerMixin, ModelSerializer):
     submission = SlugRelatedField(slug_field='code', read_only=True)
     user = SlugRelatedField(slug_field='name', read_only=True)
     answers = SerializerMethodField()
 
+    select_related = ('submission', 'user')
+
+    @classmethod
+    def get_prefetch_plan(cls, request):
+        return [
+            Prefetch(
+                'answers',
+                queryset=AnswerSerializer.optimize_queryset(Answer.objects.all()),
+            )
+        ]
+
     def get_answers(self, obj):
-        return AnswerSerializer(Answer.objects.filter(review=obj), many=True).data
+        return AnswerSerializer(obj.answers.all(), many=True).data
 
     class Meta:
         model = Review
@@ -1,10 +1,12 @@
+from django.db.models import Prefetch
 from rest_framework.serializers import (
     CharField, ImageField, ModelSerializer, SerializerMethodField,
 )
 
+from pretalx.api.prefetch import PrefetchSerializerMixin
 from pretalx.api.serializers.question import AnswerSerializer
 from pretalx.person.models import SpeakerProfile, User
-from pretalx.submission.models import Answer
+from pretalx.submission.models import Answer, Submission
 
 
 class SubmitterSerializer(ModelSerializer):
@@ -24,14 +26,30 @@ class SubmitterSerializer(ModelSerializer):
         fields = ('code', 'name', 'biography', 'avatar')
 
 
-class SpeakerSerializer(ModelSerializer):
+class SpeakerSerializer(PrefetchSerializerMixin, ModelSerializer):
     code = CharField(source='user.code')
     name = CharField(source='user.name')
     avatar = ImageField(source='user.avatar')
     submissions = SerializerMethodField()
 
+    select_related = ('user',)
+
+    @classmethod
+    def get_prefetch_plan(cls, request):
+        event = request.event
+        talks = event.current_schedule.talks.all() if event.current_schedule else []
+        return [
+            Prefetch(
+                'user__submissions',
+                queryset=Submission.objects.filter(event=event, slots__in=talks),
+                to_attr='event_talks',
+            )
+        ]
+
     @staticmethod
     def get_submissions(obj):
+        if hasattr(obj.user, 'event_talks'):
+            return [submission.code for submission in obj.user.event_talks]
         talks = (
             obj.event.current_schedule.talks.all() if obj.event.current_schedule else []
         )
@@ -46,12 +64,40 @@ class SpeakerSerializer(ModelSerializer):
 
 class SpeakerOrgaSerializer(SpeakerSerializer):
     email = CharField(source='user.email')
-    answers = AnswerSerializer(Answer.objects.all(), many=True, read_only=True)
+    answers = SerializerMethodField()
+
+    @classmethod
+    def get_prefetch_plan(cls, request):
+        answers = AnswerSerializer.optimize_queryset(
+            Answer.objects.filter(question__event=request.event)
+        )
+        return [
+            Prefetch(
+                'user__submissions',
+                queryset=Submission.objects.filter(event=request.event).prefetch_related(
+                    Prefetch('answers', queryset=answers)
+                ),
+                to_attr='event_submissions',
+            ),
+            Prefetch('user__answers', queryset=answers, to_attr='event_answers'),
+        ]
 
     def get_submissions(self, obj):
+        if hasattr(obj.user, 'event_submissions'):
+            return [submission.code for submission in obj.user.event_submissions]
         return obj.user.submissions.filter(event=obj.event).values_list(
             'code', flat=True
         )
 
+    def get_answers(self, obj):
+        if hasattr(obj.user, 'event_answers'):
+            answers = {answer.pk: answer for answer in obj.user.event_answers}
+            for submission in obj.user.event_submissions:
+                answers.update({answer.pk: answer for answer in submission.answers.all()})
+            answers = [answers[pk] for pk in sorted(answers)]
+        else:
+            answers = obj.answers
+        return AnswerSerializer(answers, many=True).data
+
     class Meta(SpeakerSerializer.Meta):
         fields = SpeakerSerializer.Meta.fields + ('answers', 'email')
@@ -1,12 +1,14 @@
+from django.db.models import Prefetch
 from i18nfield.rest_framework import I18nAwareModelSerializer
 from rest_framework.serializers import (
     ModelSerializer, SerializerMethodField, SlugRelatedField,
 )
 
+from pretalx.api.prefetch import PrefetchSerializerMixin
 from pretalx.api.serializers.question import AnswerSerializer
 from pretalx.api.serializers.speaker import SubmitterSerializer
 from pretalx.schedule.models import Schedule, TalkSlot
-from pretalx.submission.models import Submission, SubmissionStates
+from pretalx.submission.models import Answer, Submission, SubmissionStates
 
 
 class SlotSerializer(I18nAwareModelSerializer):
@@ -17,23 +19,52 @@ class SlotSerializer(I18nAwareModelSerializer):
         fields = ('room', 'start', 'end')
 
 
-class SubmissionSerializer(I18nAwareModelSerializer):
+class SubmissionSerializer(PrefetchSerializerMixin, I18nAwareModelSerializer):
     submission_type = SlugRelatedField(slug_field='name', read_only=True)
     track = SlugRelatedField(slug_field='name', read_only=True)
-    slot = SlotSerializer(TalkSlot.objects.filter(is_visible=True), read_only=True)
+    slot = SerializerMethodField()
     duration = SerializerMethodField()
     speakers = SerializerMethodField()
 
+    select_related = ('event', 'submission_type', 'track')
+
+    @classmethod
+    def get_prefetch_plan(cls, request):
+        event = request.event
+        return [
+            Prefetch(
+                'slots',
+                queryset=TalkSlot.objects.filter(is_visible=True).only('pk', 'submission'),
+                to_attr='visible_slots',
+            ),
+            Prefetch(
+                'slots',
+                queryset=TalkSlot.objects.filter(
+                    schedule=event.current_schedule
+                ).select_related('room').order_by('pk'),
+                to_attr='current_slots',
+            ),
+            'speakers',
+        ]
+
     @staticmethod
     def get_duration(obj):
         return obj.export_duration
 
+    @staticmethod
+    def get_slot(obj):
+        if hasattr(obj, 'current_slots'):
+            slot = next(iter(obj.current_slots), None)
+        else:
+            slot = obj.slot
+        return SlotSerializer(slot).data if slot else None
+
     def get_speakers(self, obj):
         request = self.context.get('request')
-        has_slots = (
-            obj.slots.filter(is_visible=True)
-            and obj.state == SubmissionStates.CONFIRMED
-        )
+        visible_slots = getattr(obj, 'visible_slots', None)
+        if visible_slots is None:
+            visible_slots = obj.slots.filter(is_visible=True)
+        has_slots = visible_slots and obj.state == SubmissionStates.CONFIRMED
         has_permission = request and request.user.has_perm(
             'orga.view_speakers', request.event
         )
@@ -66,6 +97,15 @@ class SubmissionOrgaSerializer(SubmissionSerializer):
     answers = AnswerSerializer(many=True)
     created = SerializerMethodField()
 
+    @classmethod
+    def get_prefetch_plan(cls, request):
+        return super().get_prefetch_plan(request) + [
+            Prefetch(
+                'answers',
+                queryset=AnswerSerializer.optimize_queryset(Answer.objects.all()),
+            )
+        ]
+
     def get_created(self, obj):
         return obj.created.astimezone(obj.event.tz).isoformat()
 
@@ -0,0 +1,50 @@
+from django.http import StreamingHttpResponse
+from i18nfield.rest_framework import I18nJSONRenderer
+from rest_framework.settings import api_settings
+
+
+class NDJSONRenderer(I18nJSONRenderer):
+    """Renders lists as newline-delimited JSON, with one object per line."""
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        items = data if isinstance(data, list) else [data]
+        return b''.join(super(NDJSONRenderer, self).render(item) + b'\n' for item in items)
+
+
+def iterate_in_chunks(queryset, chunk_size):
+    """Yields lists of up to ``chunk_size`` objects of the given queryset,
+    ordered by primary key. Each list is loaded with its own keyset query,
+    so that prefetched relations work and memory use stays flat."""
+    queryset = queryset.order_by('pk')
+    last_pk = None
+    while True:
+        chunk = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        chunk = list(chunk[:chunk_size])
+        if not chunk:
+            return
+        yield chunk
+        last_pk = chunk[-1].pk
+
+
+class StreamingListMixin:
+    """Streams list responses as newline-delimited JSON, without
+    pagination, if they are requested with ``?format=ndjson``."""
+    renderer_classes = tuple(api_settings.DEFAULT_RENDERER_CLASSES) + (NDJSONRenderer,)
+    stream_chunk_size = 500
+
+    def list(self, request, *args, **kwargs):
+        if request.accepted_renderer.format != NDJSONRenderer.format:
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        return StreamingHttpResponse(
+            self.stream_queryset(queryset), content_type=NDJSONRenderer.media_type
+        )
+
+    def stream_queryset(self, queryset):
+        renderer = NDJSONRenderer()
+        for chunk in iterate_in_chunks(queryset, self.stream_chunk_size):
+            yield renderer.render(self.get_serializer(chunk, many=True).data)
@@ -1,19 +1,27 @@
+from django.db.models import Q
 from rest_framework import viewsets
 
+from pretalx.api.pagination import KeysetOnlyPagination
 from pretalx.api.serializers.event import EventSerializer
+from pretalx.api.streaming import StreamingListMixin
 from pretalx.event.models import Event
 
 
-class EventViewSet(viewsets.ReadOnlyModelViewSet):
+class EventViewSet(StreamingListMixin, viewsets.ReadOnlyModelViewSet):
     serializer_class = EventSerializer
     queryset = Event.objects.none()
     lookup_field = 'slug'
     lookup_url_kwarg = 'event'
-    pagination_class = None
+    pagination_class = KeysetOnlyPagination
 
     def get_queryset(self):
-        return [
-            e
-            for e in Event.objects.all()
-            if self.request.user.has_perm('cfp.view_event', e)
-        ]
+        user = self.request.user
+        if user.is_anonymous:
+            return Event.objects.filter(is_public=True)
+        if user.is_administrator:
+            return Event.objects.all()
+        return Event.objects.filter(
+            Q(is_public=True)
+            | Q(pk__in=user.get_events_for_permission(can_change_submissions=True))
+            | Q(pk__in=user.get_events_for_permission(is_reviewer=True))
+        )
@@ -1,11 +1,14 @@
-from django.db import models
 from rest_framework import viewsets
 
+from pretalx.api.prefetch import PrefetchViewSetMixin
 from pretalx.api.serializers.review import ReviewSerializer
+from pretalx.api.streaming import StreamingListMixin
 from pretalx.submission.models import Review
 
 
-class ReviewViewSet(viewsets.ReadOnlyModelViewSet):
+class ReviewViewSet(
+    PrefetchViewSetMixin, StreamingListMixin, viewsets.ReadOnlyModelViewSet
+):
     serializer_class = ReviewSerializer
     queryset = Review.objects.none()
     filterset_fields = ('submission__code',)
@@ -16,17 +19,9 @@ class ReviewViewSet(viewsets.ReadOnlyModelViewSet):
         queryset = Review.objects.filter(submission__event=self.request.event).exclude(
             submission__speakers__in=[self.request.user]
         )
-        limit_tracks = self.request.user.teams.filter(
-            models.Q(all_events=True)
-            | models.Q(
-                models.Q(all_events=False)
-                & models.Q(limit_events__in=[self.request.event])
-            ),
-            limit_tracks__isnull=False,
-        )
-        if limit_tracks.exists():
-            tracks = set()
-            for team in limit_tracks:
-                tracks.update(team.limit_tracks.filter(event=self.request.event))
-            queryset = queryset.filter(track__in=tracks)
+        tracks = self.request.user.get_team_permissions(self.request.event)[
+            'reviewer_tracks'
+        ]
+        if tracks:
+            queryset = queryset.filter(submission__track__in=tracks)
         return queryset
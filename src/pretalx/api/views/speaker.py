@@ -1,10 +1,14 @@
 from rest_framework import viewsets
 
+from pretalx.api.prefetch import PrefetchViewSetMixin
 from pretalx.api.serializers.speaker import SpeakerOrgaSerializer, SpeakerSerializer
+from pretalx.api.streaming import StreamingListMixin
 from pretalx.person.models import SpeakerProfile
 
 
-class SpeakerViewSet(viewsets.ReadOnlyModelViewSet):
+class SpeakerViewSet(
+    PrefetchViewSetMixin, StreamingListMixin, viewsets.ReadOnlyModelViewSet
+):
     serializer_class = SpeakerSerializer
     queryset = SpeakerProfile.objects.none()
     lookup_field = 'user__code__iexact'
@@ -29,4 +33,4 @@ class SpeakerViewSet(viewsets.ReadOnlyModelViewSet):
         return SpeakerProfile.objects.none()
 
     def get_queryset(self):
-        return self.get_base_queryset() or self.queryset
+        return self.get_base_queryset()
@@ -1,14 +1,19 @@
 from rest_framework import viewsets
+from rest_framework.response import Response
 
+from pretalx.api.prefetch import PrefetchViewSetMixin
 from pretalx.api.serializers.submission import (
     ScheduleListSerializer, ScheduleSerializer,
     SubmissionOrgaSerializer, SubmissionSerializer,
 )
+from pretalx.api.streaming import StreamingListMixin
 from pretalx.schedule.models import Schedule
 from pretalx.submission.models import Submission
 
 
-class SubmissionViewSet(viewsets.ReadOnlyModelViewSet):
+class SubmissionViewSet(
+    PrefetchViewSetMixin, StreamingListMixin, viewsets.ReadOnlyModelViewSet
+):
     serializer_class = SubmissionSerializer
     queryset = Submission.objects.none()
     lookup_field = 'code__iexact'
@@ -45,6 +50,15 @@ class ScheduleViewSet(viewsets.ReadOnlyModelViewSet):
             return ScheduleSerializer
         raise Exception('Methods other than GET are not supported on this ressource.')
 
+    def retrieve(self, request, *args, **kwargs):
+        schedule = self.get_object()
+        if schedule.version and not request.user.has_perm(
+            'orga.view_speakers', request.event
+        ):
+            return Response(schedule.get_snapshot('api'))
+        serializer = self.get_serializer(schedule)
+        return Response(serializer.data)
+
     def get_object(self):
         try:
             return super().get_object()
@@ -1,10 +1,17 @@
 import logging
+import re
+import time
 from email.utils import formataddr
+from functools import lru_cache
+from html import escape, unescape
 from smtplib import SMTPResponseException, SMTPSenderRefused
 
+import bleach
 from django.conf import settings
+from django.core.cache import cache
 from django.core.mail import EmailMultiAlternatives, get_connection
 from django.core.mail.backends.smtp import EmailBackend
+from django.template.loader import get_template
 from inlinestyler.utils import inline_css
 
 from pretalx.celery_app import app
@@ -44,15 +51,108 @@ class SendMailException(Exception):
     pass
 
 
-@app.task(bind=True)
-def mail_send_task(
-    self,
+MAIL_BODY_TAGS = bleach.ALLOWED_TAGS + ['p', 'pre']
+MAIL_BODY_PLACEHOLDER = 'pretalx-mail-body-placeholder'
+MAIL_BODY_PROBE = '<div data-mail-probe="x">{}</div>'.format(
+    ''.join(
+        '<ul data-mail-probe="x"><li data-mail-probe="x"></li></ul>'
+        if tag == 'ul' else f'<{tag} data-mail-probe="x"></{tag}>'
+        for tag in MAIL_BODY_TAGS
+        if tag != 'li'
+    )
+)
+
+
+@lru_cache(maxsize=256)
+def get_mail_wrapper(event_name: str, color: str) -> tuple:
+    """Renders the HTML mail wrapper for the given event name and primary
+    color, and inlines its CSS.
+
+    Returns the HTML before and after the mail body, and a dictionary of
+    inline styles per body tag, to be applied with ``render_mail_html``.
+    Inlining the CSS is slow, so the result is cached per event name and
+    color, and each mail only has to style its own body."""
+    html = get_template('mail/mailwrapper.html').render(
+        {
+            'body': MAIL_BODY_PLACEHOLDER + MAIL_BODY_PROBE,
+            'event': {'name': event_name} if event_name else None,
+            'color': color,
+        }
+    )
+    html = inline_css(html)
+    styles = {
+        tag: escape(unescape(style))
+        for tag, _, style in re.findall(
+            r'<(\w+) data-mail-probe="x" style=(["\'])(.*?)\2', html
+        )
+    }
+    html = re.sub(r'<div data-mail-probe="x".*?</div>', '', html, flags=re.DOTALL)
+    prefix, suffix = html.split(MAIL_BODY_PLACEHOLDER)
+    return prefix, suffix, styles
+
+
+def render_mail_html(body: str, event=None) -> str:
+    """Wraps a sanitized HTML mail body in the event's mail wrapper, with all
+    CSS inlined."""
+    prefix, suffix, styles = get_mail_wrapper(
+        str(event.name) if event else None,
+        (event.primary_color if event else '') or '#1c4a3b',
+    )
+    if styles:
+        body = re.sub(
+            r'<({})(?=[\s/>])'.format('|'.join(styles)),
+            lambda match: f'<{match.group(1)} style="{styles[match.group(1)]}"',
+            body,
+        )
+    return prefix + body + suffix
+
+
+def _get_sender_and_backend(event):
+    if event:
+        sender = event.settings.get('mail_from')
+        if sender == 'noreply@example.org' or not sender:
+            sender = event.email
+        backend = event.get_mail_backend()
+        sender = formataddr((str(event.name), sender))
+    else:
+        sender = formataddr(('pretalx', settings.MAIL_FROM))
+        backend = get_connection(fail_silently=False)
+    return sender, backend
+
+
+def wait_for_mail_rate_limit():
+    """Blocks until one more email can be sent within the ``MAIL_RATE_LIMIT``.
+
+    The limit applies to all mail tasks together, not to every task on its
+    own: the emails sent are counted per time window in the cache, which all
+    workers share when a cache server like redis or memcached is configured.
+    """
+    rate = settings.MAIL_RATE_LIMIT
+    if not rate:
+        return
+    window = max(1.0, 1 / rate)
+    capacity = max(1, int(rate * window))
+    while True:
+        current = time.time()
+        index = int(current // window)
+        key = f'mail_rate_limit_{index}'
+        cache.add(key, 0, timeout=int(window) + 60)
+        try:
+            count = cache.incr(key)
+        except ValueError:  # The cache does not keep values, so we cannot count
+            return
+        if count <= capacity:
+            return
+        time.sleep((index + 1) * window - current)
+
+
+def _build_email(
+    sender: str,
     to: str,
     subject: str,
     body: str,
     html: str,
     reply_to: list = None,
-    event: int = None,
     cc: list = None,
     bcc: list = None,
     headers: dict = None,
@@ -60,26 +160,36 @@ def mail_send_task(
     headers = headers or dict()
     if reply_to and isinstance(reply_to, str):
         reply_to = reply_to.split(',')
-    if event:
-        event = Event.objects.filter(id=event).first()
-    if event:
-        sender = event.settings.get('mail_from')
-        if sender == 'noreply@example.org' or not sender:
-            sender = event.email
-        backend = event.get_mail_backend()
-        sender = formataddr((str(event.name), sender))
-    else:
-        sender = formataddr(('pretalx', settings.MAIL_FROM))
-        backend = get_connection(fail_silently=False)
-
     email = EmailMultiAlternatives(
         subject, body, sender, to=to, cc=cc, bcc=bcc, headers=headers, reply_to=reply_to
     )
-
     if html is not None:
-        email.attach_alternative(inline_css(html), 'text/html')
+        email.attach_alternative(html, 'text/html')
+    return email
+
+
+@app.task(bind=True)
+def mail_send_task(
+    self,
+    to: str,
+    subject: str,
+    body: str,
+    html: str,
+    reply_to: list = None,
+    event: int = None,
+    cc: list = None,
+    bcc: list = None,
+    headers: dict = None,
+):
+    if event:
+        event = Event.objects.filter(id=event).first()
+    sender, backend = _get_sender_and_backend(event)
+    email = _build_email(
+        sender, to, subject, body, html, reply_to=reply_to, cc=cc, bcc=bcc, headers=headers
+    )
 
     try:
+        wait_for_mail_rate_limit()
         backend.send_messages([email])
     except SMTPResponseException as exception:
         # Retry on external problems: Connection issues (101, 111), timeouts (421), filled-up mailboxes (422),
@@ -91,3 +201,37 @@ def mail_send_task(
     except Exception:
         logger.exception('Error sending email')
         raise SendMailException('Failed to send an email to {}.'.format(to))
+
+
+@app.task()
+def mail_send_batch_task(messages: list, event: int = None):
+    """Sends a list of emails through one connection.
+
+    Each message is a dictionary of ``mail_send_task`` keyword arguments
+    (without the event). Sending is limited to ``MAIL_RATE_LIMIT`` emails
+    per second across all tasks, see :func:`wait_for_mail_rate_limit`.
+    Emails that cannot be sent are retried individually with
+    ``mail_send_task``."""
+    event_id = event
+    if event:
+        event = Event.objects.filter(id=event).first()
+    sender, backend = _get_sender_and_backend(event)
+
+    try:
+        backend.open()
+    except Exception:
+        logger.exception('Error opening mail connection, retrying individually')
+        for message in messages:
+            mail_send_task.apply_async(kwargs=dict(message, event=event_id))
+        return
+
+    try:
+        for message in messages:
+            wait_for_mail_rate_limit()
+            try:
+                backend.send_messages([_build_email(sender, **message)])
+            except Exception:
+                logger.exception('Error sending email in batch, retrying individually')
+                mail_send_task.apply_async(kwargs=dict(message, event=event_id))
+    finally:
+        backend.close()
@@ -0,0 +1,38 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils.timezone import now
+
+from pretalx.common.models import ActivityLog, ArchivedActivityLog
+from pretalx.event.models import Event
+
+
+class Command(BaseCommand):
+    help = 'Move the log entries of past events to the log archive'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--event', type=str)
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=90,
+            help='Archive the logs of events that ended at least this many days ago. Defaults to 90.',
+        )
+
+    def handle(self, *args, **options):
+        event = options.get('event')
+        if event:
+            events = Event.objects.filter(slug__iexact=event)
+            if not events:
+                self.stdout.write(self.style.ERROR('This event does not exist.'))
+                return
+        else:
+            events = Event.objects.filter(
+                date_to__lt=now().date() - timedelta(days=options['days'])
+            )
+        for event in events:
+            count = ArchivedActivityLog.archive(ActivityLog.objects.filter(event=event))
+            if count:
+                self.stdout.write(
+                    self.style.SUCCESS(f'[{event.slug}] {count} log entries were archived.')
+                )
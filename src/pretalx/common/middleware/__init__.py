@@ -1,9 +1,10 @@
 from .domains import CsrfViewMiddleware, MultiDomainMiddleware, SessionMiddleware
-from .event import EventPermissionMiddleware
+from .event import EventPermissionMiddleware, SettingsScopeMiddleware
 
 __all__ = [
     'CsrfViewMiddleware',
     'EventPermissionMiddleware',
     'MultiDomainMiddleware',
     'SessionMiddleware',
+    'SettingsScopeMiddleware',
 ]
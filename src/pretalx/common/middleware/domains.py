@@ -6,19 +6,49 @@ from django.contrib.sessions.middleware import (
     SessionMiddleware as BaseSessionMiddleware,
 )
 from django.core.exceptions import DisallowedHost
+from django.http import Http404
 from django.http.request import split_domain_port
 from django.middleware.csrf import CsrfViewMiddleware as BaseCsrfMiddleware
-from django.shortcuts import get_object_or_404, redirect
+from django.shortcuts import redirect
 from django.urls import resolve
 from django.utils.cache import patch_vary_headers
 from django.utils.http import http_date
 
 from pretalx.event.models import Event
+from pretalx.event.utils import get_event_by_slug
 
 LOCAL_HOST_NAMES = ('testserver', 'localhost')
 ANY_DOMAIN_ALLOWED = ('robots.txt', 'root.main')
 
 
+def get_resolved_url(request):
+    """Resolves the request path once per request, so that all middlewares
+    can share the result."""
+    if not hasattr(request, '_resolved_url'):
+        request._resolved_url = resolve(request.path_info)
+    return request._resolved_url
+
+
+def get_request_event(request, slug):
+    """Returns the event with the given slug, reusing the event already
+    loaded for this request if possible. Raises ``Http404`` for unknown
+    events.
+
+    Only read-only requests outside of the organiser area use the event
+    cache, as all other requests may save the event."""
+    event = getattr(request, 'event', None)
+    if event and event.slug.lower() == slug.lower():
+        return event
+    cached = (
+        request.method in ('GET', 'HEAD')
+        and 'orga' not in get_resolved_url(request).namespaces
+    )
+    try:
+        return get_event_by_slug(slug, cached=cached)
+    except Event.DoesNotExist:
+        raise Http404()
+
+
 class MultiDomainMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
@@ -45,12 +75,12 @@ class MultiDomainMiddleware:
         request.port = int(port) if port else None
         request.uses_custom_domain = False
 
-        resolved = resolve(request.path)
+        resolved = get_resolved_url(request)
         if resolved.url_name in ANY_DOMAIN_ALLOWED or request.path.startswith('/api/'):
             return
         event_slug = resolved.kwargs.get('event')
         if event_slug:
-            event = get_object_or_404(Event, slug__iexact=event_slug)
+            event = get_request_event(request, event_slug)
             request.event = event
             if event.settings.custom_domain:
                 custom_domain = urlparse(event.settings.custom_domain)
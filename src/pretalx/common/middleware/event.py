@@ -4,13 +4,14 @@ from urllib.parse import quote, urljoin
 import pytz
 from django.conf import settings
 from django.shortcuts import get_object_or_404, redirect, reverse
-from django.urls import resolve
 from django.utils import timezone, translation
 from django.utils.translation.trans_real import (
     get_supported_language_variant, language_code_re, parse_accept_lang_header,
 )
 
-from pretalx.event.models import Event, Organiser, Team
+from pretalx.common.middleware.domains import get_request_event, get_resolved_url
+from pretalx.common.models.settings import settings_scope
+from pretalx.event.models import Event, Organiser
 
 
 class EventPermissionMiddleware:
@@ -43,8 +44,9 @@ class EventPermissionMiddleware:
                     'date_from'
                 )
                 if hasattr(request, 'event'):
-                    request.is_orga = request.event in request.orga_events
-                    request.is_reviewer = request.event.teams.filter(members__in=[request.user], is_reviewer=True).exists()
+                    permissions = request.user.get_team_permissions(request.event)
+                    request.is_orga = permissions['has_teams']
+                    request.is_reviewer = 'is_reviewer' in permissions['permissions']
 
     def _handle_orga_url(self, request, url):
         if request.uses_custom_domain:
@@ -65,7 +67,9 @@ class EventPermissionMiddleware:
         return None
 
     def __call__(self, request):
-        url = resolve(request.path_info)
+        url = get_resolved_url(request)
+        if not request.user.is_anonymous:
+            request.user.start_permission_cache()
 
         organiser_slug = url.kwargs.get('organiser')
         if organiser_slug:
@@ -75,16 +79,15 @@ class EventPermissionMiddleware:
             if hasattr(request, 'organiser') and request.organiser:
                 request.is_orga = False
                 if not request.user.is_anonymous:
-                    has_perms = Team.objects.filter(
-                        organiser=request.organiser,
-                        members__in=[request.user],
-                        can_change_organiser_settings=True,
-                    ).exists()
+                    has_perms = (
+                        'can_change_organiser_settings'
+                        in request.user.get_organiser_permissions(request.organiser)
+                    )
                     request.is_orga = request.user.is_administrator or has_perms
 
         event_slug = url.kwargs.get('event')
         if event_slug:
-            request.event = get_object_or_404(Event.objects.prefetch_related('schedules', 'submissions'), slug__iexact=event_slug)
+            request.event = get_request_event(request, event_slug)
 
         self._set_orga_events(request)
         self._select_locale(request)
@@ -173,3 +176,15 @@ class EventPermissionMiddleware:
                 if value and value in supported:
                     return value
         return None
+
+
+class SettingsScopeMiddleware:
+    """Handles every request in a settings scope, so that the settings of
+    each event are loaded only once per request."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with settings_scope():
+            return self.get_response(request)
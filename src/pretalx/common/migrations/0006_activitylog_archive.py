@@ -0,0 +1,60 @@
+# Generated by Django 2.2.28 on 2026-10-16 23:30
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0021_auto_20190429_0750'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('common', '0005_auto_20180202_1116'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedActivityLog',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False)),
+                ('object_id', models.PositiveIntegerField()),
+                ('timestamp', models.DateTimeField()),
+                ('action_type', models.CharField(max_length=200)),
+                ('data', models.TextField(blank=True, null=True)),
+                ('is_orga_action', models.BooleanField(default=False)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['event', 'timestamp'], name='common_acti_event_i_7d45b0_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['content_type', 'object_id'], name='common_acti_content_dba591_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['event', 'action_type', 'timestamp'], name='common_acti_event_i_118b2c_idx'),
+        ),
+        migrations.AddField(
+            model_name='archivedactivitylog',
+            name='content_type',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='contenttypes.ContentType'),
+        ),
+        migrations.AddField(
+            model_name='archivedactivitylog',
+            name='event',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='archived_log_entries', to='event.Event'),
+        ),
+        migrations.AddField(
+            model_name='archivedactivitylog',
+            name='person',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='archived_log_entries', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='archivedactivitylog',
+            index=models.Index(fields=['content_type', 'object_id'], name='common_arch_content_bd4e1f_idx'),
+        ),
+    ]
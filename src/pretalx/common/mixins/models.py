@@ -1,15 +1,71 @@
 import json
+import threading
+from contextlib import contextmanager
 
 from django.contrib.contenttypes.models import ContentType
 from i18nfield.utils import I18nJSONEncoder
 
 SENSITIVE_KEYS = ['password', 'secret', 'api_key']
+_log_buffer = threading.local()
+
+
+def bulk_log_actions(entries):
+    """Saves the given :class:`~pretalx.common.models.log.ActivityLog`
+    entries, as built by :meth:`LogMixin.build_log_entry`, with a single
+    query. Within a :func:`log_buffer` block, they are added to the buffer
+    instead."""
+    from pretalx.common.models import ActivityLog
+
+    entries = [entry for entry in entries if entry is not None]
+    buffer = getattr(_log_buffer, 'entries', None)
+    if buffer is not None:
+        buffer.extend(entries)
+    elif entries:
+        ActivityLog.objects.bulk_create(entries)
+
+
+@contextmanager
+def log_buffer():
+    """Collects all log entries written within this block, and saves them
+    with a single query when the block is left. Nested blocks write to the
+    outermost buffer. If the block raises an exception, the collected entries
+    are discarded, just like a surrounding transaction would discard them.
+
+    Use this around bulk operations, preferably inside their transaction::
+
+        with transaction.atomic(), log_buffer():
+            for submission in submissions:
+                submission.accept(person=user)
+    """
+    if getattr(_log_buffer, 'entries', None) is not None:
+        yield
+        return
+    _log_buffer.entries = []
+    try:
+        yield
+        entries = _log_buffer.entries
+    finally:
+        _log_buffer.entries = None
+    bulk_log_actions(entries)
 
 
 class LogMixin:
     def log_action(self, action, data=None, person=None, orga=False):
-        if not self.pk:
+        entry = self.build_log_entry(action, data=data, person=person, orga=orga)
+        if entry is None:
             return
+        buffer = getattr(_log_buffer, 'entries', None)
+        if buffer is not None:
+            buffer.append(entry)
+        else:
+            entry.save()
+
+    def build_log_entry(self, action, data=None, person=None, orga=False):
+        """Returns an unsaved log entry for this object (or ``None`` if this
+        object has not been saved yet), to be saved with
+        :func:`bulk_log_actions`."""
+        if not self.pk:
+            return None
 
         from pretalx.common.models import ActivityLog
 
@@ -22,7 +78,7 @@ class LogMixin:
         elif data:
             raise TypeError('Logged data should always be a dictionary.')
 
-        ActivityLog.objects.create(
+        return ActivityLog(
             event=getattr(self, 'event', None),
             person=person,
             content_object=self,
@@ -38,3 +94,13 @@ class LogMixin:
             content_type=ContentType.objects.get_for_model(type(self)),
             object_id=self.pk,
         ).select_related('event', 'person')
+
+    def log_history(self):
+        """Returns all log entries of this object, including archived
+        entries, for display."""
+        from pretalx.common.models import ActivityLog
+
+        return ActivityLog.history(
+            content_type=ContentType.objects.get_for_model(type(self)),
+            object_id=self.pk,
+        )
@@ -1,5 +1,7 @@
+import hashlib
 import urllib
 from contextlib import suppress
+from functools import partial
 from importlib import import_module
 from urllib.parse import quote
 
@@ -11,7 +13,9 @@ from django.db.models.functions import Lower
 from django.forms import ValidationError
 from django.http import Http404
 from django.shortcuts import redirect
+from django.utils.cache import get_conditional_response
 from django.utils.functional import cached_property
+from django.utils.http import http_date, quote_etag
 from django.utils.translation import ugettext_lazy as _
 from django_context_decorator import context
 from formtools.wizard.forms import ManagementForm
@@ -208,6 +212,45 @@ class EventPermissionRequired(PermissionRequired):
         return self.request.event
 
 
+class ConditionalResponse:
+    """Answers conditional GET requests (``If-None-Match`` and
+    ``If-Modified-Since``) with a 304 response before the actual response is
+    built. Views provide the parts their ETag is built from and their
+    modification time; either may be ``None``."""
+
+    def get_etag_parts(self, request):
+        return None
+
+    def get_etag(self, request):
+        parts = self.get_etag_parts(request)
+        if not parts:
+            return None
+        return hashlib.sha1('-'.join(str(part) for part in parts).encode()).hexdigest()
+
+    def get_last_modified(self, request):
+        return None
+
+    def conditional_response(self, request, get_response):
+        etag = self.get_etag(request)
+        last_modified = self.get_last_modified(request)
+        last_modified = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(
+            request, etag=quote_etag(etag) if etag else None, last_modified=last_modified
+        )
+        if response is None:
+            response = get_response()
+        if etag and not response.has_header('ETag'):
+            response['ETag'] = quote_etag(etag)
+        if last_modified and not response.has_header('Last-Modified'):
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def get(self, request, *args, **kwargs):
+        return self.conditional_response(
+            request, partial(super().get, request, *args, **kwargs)
+        )
+
+
 class SensibleBackWizardMixin():
 
     def post(self, *args, **kwargs):
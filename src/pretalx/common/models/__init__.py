@@ -1,4 +1,4 @@
-from .log import ActivityLog
+from .log import ActivityLog, ArchivedActivityLog
 from .settings import GlobalSettings
 
-__all__ = ['ActivityLog', 'GlobalSettings']
+__all__ = ['ActivityLog', 'ArchivedActivityLog', 'GlobalSettings']
@@ -1,6 +1,6 @@
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
-from django.db import models
+from django.db import models, transaction
 from django.utils.translation import ugettext_lazy as _
 
 from pretalx.mail.models import MailTemplate, QueuedMail
@@ -118,6 +118,11 @@ class ActivityLog(models.Model):
 
     class Meta:
         ordering = ('-timestamp',)
+        indexes = [
+            models.Index(fields=['event', 'timestamp']),
+            models.Index(fields=['content_type', 'object_id']),
+            models.Index(fields=['event', 'action_type', 'timestamp']),
+        ]
 
     def __str__(self):
         """Custom __str__ to help with debugging."""
@@ -125,6 +130,19 @@ class ActivityLog(models.Model):
         person = getattr(self.person, 'name', 'None')
         return f'ActivityLog(event={event}, person={person}, content_object={self.content_object}, action_type={self.action_type})'
 
+    @classmethod
+    def history(cls, **filters):
+        """Returns all log entries matching the given filters, including
+        those that have been moved to the :class:`ArchivedActivityLog`, newest
+        first. The result can be sliced and iterated, but not filtered any
+        further."""
+        return (
+            cls.objects.filter(**filters)
+            .order_by()
+            .union(ArchivedActivityLog.objects.filter(**filters).order_by(), all=True)
+            .order_by('-timestamp')
+        )
+
     def display(self):
         response = LOG_NAMES.get(self.action_type)
         if response is None:
@@ -160,3 +178,51 @@ class ActivityLog(models.Model):
         if isinstance(self.content_object, (MailTemplate, QueuedMail)):
             return self.content_object.urls.base
         return ''
+
+
+class ArchivedActivityLog(models.Model):
+    """Log entries of past events are moved to this table by the
+    ``archive_logs`` command, to keep the :class:`ActivityLog` table small.
+
+    The columns match those of the :class:`ActivityLog`, so that both tables
+    can be read together with :meth:`ActivityLog.history`."""
+    event = models.ForeignKey(
+        to='event.Event',
+        on_delete=models.CASCADE,
+        related_name='archived_log_entries',
+        null=True,
+        blank=True,
+    )
+    person = models.ForeignKey(
+        to='person.User',
+        on_delete=models.PROTECT,
+        related_name='archived_log_entries',
+        null=True,
+        blank=True,
+    )
+    content_type = models.ForeignKey(to=ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveIntegerField()
+    timestamp = models.DateTimeField()
+    action_type = models.CharField(max_length=200)
+    data = models.TextField(null=True, blank=True)
+    is_orga_action = models.BooleanField(default=False)
+
+    class Meta:
+        indexes = [models.Index(fields=['content_type', 'object_id'])]
+
+    @classmethod
+    def archive(cls, queryset, batch_size=1000) -> int:
+        """Moves the given :class:`ActivityLog` entries to the archive, in
+        batches of ``batch_size`` entries, and returns their number."""
+        fields = [field.attname for field in ActivityLog._meta.concrete_fields]
+        count = 0
+        while True:
+            with transaction.atomic():
+                entries = list(queryset.order_by('pk').values(*fields)[:batch_size])
+                if not entries:
+                    return count
+                cls.objects.bulk_create([cls(**entry) for entry in entries])
+                ActivityLog.objects.filter(
+                    pk__in=[entry['id'] for entry in entries]
+                ).delete()
+            count += len(entries)
@@ -1,11 +1,197 @@
 import json
+import sys
+import threading
 import uuid
+from collections import Counter
+from contextlib import contextmanager
 
+from django.core.cache import cache
+from django.core.files import File
+from django.db import models, transaction
 from django.utils.translation import ugettext_noop
 from hierarkey.models import GlobalSettingsBase, Hierarkey
+from hierarkey.proxy import HierarkeyProxy
 from i18nfield.strings import LazyI18nString
 
-hierarkey = Hierarkey(attribute_name='settings')
+SETTINGS_CACHE_TIMEOUT = 30 * 60
+UNCACHED_SETTING_TYPES = (File, dict, list, models.Model)
+# Counts where settings were loaded from ('scope', 'cache' or 'database')
+settings_loads = Counter()
+_settings_scope = threading.local()
+
+
+def get_settings_version_key(cache_namespace, pk):
+    return f'hierarkey_{cache_namespace}_{pk}_version'
+
+
+def get_settings_version(cache_namespace, pk):
+    key = get_settings_version_key(cache_namespace, pk)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, SETTINGS_CACHE_TIMEOUT)
+        version = cache.get(key)
+    return version
+
+
+def clear_settings_cache(cache_namespace, pk):
+    """Invalidates the cached settings of the given object by dropping their
+    version. Until the change is committed, other processes may still read
+    and cache the old settings under a new version, so the version is
+    dropped once more after the commit."""
+    key = get_settings_version_key(cache_namespace, pk)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+@contextmanager
+def settings_scope():
+    """Within this block, the settings of each object are loaded only once
+    and shared between all settings proxies of that object. Nested blocks
+    share the outermost scope.
+
+    Requests are handled in a settings scope by the ``SettingsScopeMiddleware``."""
+    if getattr(_settings_scope, 'store', None) is not None:
+        yield
+        return
+    _settings_scope.store = {}
+    try:
+        yield
+    finally:
+        _settings_scope.store = None
+
+
+class CachedHierarkeyProxy(HierarkeyProxy):
+    """Loads all settings of an object with a single query and shares them
+    with all other proxies of the same object within the current
+    :func:`settings_scope`. Across scopes, they are kept in the cache backend
+    under a version that changes whenever a setting is changed.
+
+    Settings values are unserialized only once per scope, so that reading a
+    setting is a dictionary lookup."""
+
+    @classmethod
+    def _new(cls, obj, hierarkey, cache_namespace, parent=None, type=None):
+        proxy = cls()
+        proxy._obj = obj
+        proxy._h = hierarkey
+        proxy._cache_namespace = cache_namespace
+        proxy._parent = parent
+        proxy._cached_obj = None
+        proxy._write_cached_obj = None
+        proxy._values = None
+        proxy._type = type
+        return proxy
+
+    def _load(self):
+        store = getattr(_settings_scope, 'store', None)
+        store_key = (self._cache_namespace, self._obj.pk)
+        if store is not None and store_key in store:
+            settings_loads['scope'] += 1
+            return store[store_key]
+        version = get_settings_version(self._cache_namespace, self._obj.pk)
+        cache_key = f'hierarkey_{self._cache_namespace}_{self._obj.pk}_{version}'
+        raw = cache.get(cache_key) if version else None
+        if raw is None:
+            settings_loads['database'] += 1
+            raw = {setting.key: setting.value for setting in self._objects.all()}
+            if version:
+                cache.set(cache_key, raw, SETTINGS_CACHE_TIMEOUT)
+        else:
+            settings_loads['cache'] += 1
+        entry = (raw, {})
+        if store is not None:
+            store[store_key] = entry
+        return entry
+
+    def _cache(self):
+        if self._cached_obj is None:
+            self._cached_obj, self._values = self._load()
+        return self._cached_obj
+
+    def _flush_external_cache(self):
+        clear_settings_cache(self._cache_namespace, self._obj.pk)
+
+    def flush(self):
+        store = getattr(_settings_scope, 'store', None)
+        if store is not None:
+            store.pop((self._cache_namespace, self._obj.pk), None)
+        self._values = None
+        super().flush()
+
+    def get(self, key, default=None, as_type=None, binary_file=False):
+        if default is not None or binary_file:
+            return super().get(key, default=default, as_type=as_type, binary_file=binary_file)
+        self._cache()
+        value_key = (key, as_type)
+        if value_key not in self._values:
+            value = super().get(key, as_type=as_type)
+            if isinstance(value, UNCACHED_SETTING_TYPES):
+                # Files are opened on access, and mutable values may be changed by the caller
+                return value
+            self._values[value_key] = value
+        return self._values[value_key]
+
+    def set(self, key, value):
+        super().set(key, value)
+        self._values.clear()
+
+    def delete(self, key):
+        super().delete(key)
+        self._values.clear()
+
+
+class CachedHierarkey(Hierarkey):
+    """Attaches :class:`CachedHierarkeyProxy` instead of the default settings
+    proxy. Objects always use the global settings as their parent."""
+
+    def set_global(self, cache_namespace=None):
+        attach = super().set_global(cache_namespace)
+
+        def wrapper(wrapped_class):
+            return self._use_cached_proxy(
+                attach(wrapped_class), cache_namespace, is_global=True
+            )
+
+        return wrapper
+
+    def add(self, cache_namespace=None):
+        attach = super().add(cache_namespace)
+
+        def wrapper(model):
+            return self._use_cached_proxy(attach(model), cache_namespace)
+
+        return wrapper
+
+    def _use_cached_proxy(self, model, cache_namespace, is_global=False):
+        hierarkey = self
+        cache_namespace = cache_namespace or f'{model.__name__}_{self.attribute_name}'
+        attribute_name = f'_hierarkey_proxy_{cache_namespace}_{self.attribute_name}'
+        kv_model = getattr(
+            sys.modules[model.__module__],
+            f'{model.__name__}_{self.attribute_name.title()}Store',
+        )
+
+        def get_proxy(instance):
+            proxy = getattr(instance, attribute_name, None)
+            if proxy is None:
+                parent = None
+                if not is_global and hierarkey.global_class:
+                    parent = hierarkey.global_class()
+                proxy = CachedHierarkeyProxy._new(
+                    instance,
+                    type=kv_model,
+                    hierarkey=hierarkey,
+                    parent=parent,
+                    cache_namespace=cache_namespace,
+                )
+                setattr(instance, attribute_name, proxy)
+            return proxy
+
+        setattr(model, self.attribute_name, property(get_proxy))
+        return model
+
+
+hierarkey = CachedHierarkey(attribute_name='settings')
 
 
 @hierarkey.set_global()
@@ -97,6 +97,14 @@ CONFIG = {
             'default': 'False',
             'env': os.getenv('PRETALX_MAIL_SSL'),
         },
+        'batch_size': {
+            'default': '100',
+            'env': os.getenv('PRETALX_MAIL_BATCH_SIZE'),
+        },
+        'rate_limit': {
+            'default': '0',
+            'env': os.getenv('PRETALX_MAIL_RATE_LIMIT'),
+        },
     },
     'redis': {
         'location': {
@@ -117,6 +125,10 @@ CONFIG = {
             'default': '',
             'env': os.getenv('PRETALX_CELERY_BACKEND'),
         },
+        'htmlexport_processes': {
+            'default': '1',
+            'env': os.getenv('PRETALX_CELERY_HTMLEXPORT_PROCESSES'),
+        },
     },
     'logging': {
         'email': {
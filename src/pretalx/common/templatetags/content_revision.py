@@ -0,0 +1,12 @@
+from django import template
+
+from pretalx.event.revision import get_content_revision
+
+register = template.Library()
+
+
+@register.simple_tag
+def content_revision(event):
+    """Returns the content revision of the event, to be used as part of the
+    ``{% cache %}`` key of fragments that only show public event content."""
+    return get_content_revision(event)
@@ -1,22 +1,33 @@
 from contextlib import suppress
-from urllib.parse import urljoin, urlparse
+from string import Formatter
+from types import SimpleNamespace
+from urllib.parse import urljoin, urlparse, urlunparse
 
 from django.conf import settings
 from django.urls import resolve, reverse
 from urlman import Urls
 
+# Whether the URLs of a urlman URL name, like (Submission.urls, 'public'),
+# belong to the agenda namespace. URL patterns do not change at runtime.
+_agenda_urls = {}
+
+
+def is_agenda_url(url, key=None) -> bool:
+    if key is not None and key in _agenda_urls:
+        return _agenda_urls[key]
+    result = False
+    with suppress(Exception):
+        result = 'agenda' in resolve(url).namespaces
+    if key is not None:
+        _agenda_urls[key] = result
+    return result
+
 
 def get_base_url(event=None, url=None):
     if url and url.startswith('/orga'):
         return settings.SITE_URL
     if event:
-        if event.settings.html_export_url and url:
-            with suppress(Exception):
-                resolved = resolve(url)
-                if 'agenda' in resolved.namespaces:
-                    return event.settings.html_export_url
-        if event.settings.custom_domain:
-            return event.settings.custom_domain
+        return get_url_context(event).get_base_url(url)
     return settings.SITE_URL
 
 
@@ -25,11 +36,143 @@ def build_absolute_uri(urlname, event=None, args=None, kwargs=None):
     return urljoin(url, reverse(urlname, args=args, kwargs=kwargs))
 
 
+def get_url_context(event):
+    """Returns the :class:`EventUrlContext` of the event, which is kept on
+    the event as long as its domain settings do not change."""
+    context = getattr(event, '_url_context', None)
+    if context is None or not context.is_current():
+        context = EventUrlContext(event)
+        event._url_context = context
+    return context
+
+
+class EventUrlContext:
+    """Builds absolute URLs for an event, computing its base URLs only once.
+
+    When many URLs of the same kind are needed, like the public URL of every
+    talk in a schedule export, use :meth:`url_template`."""
+
+    def __init__(self, event):
+        self.event = event
+        self.custom_domain = event.settings.custom_domain
+        self.html_export_url = event.settings.html_export_url
+        self._base_parts = {}
+        self._templates = {}
+
+    def is_current(self) -> bool:
+        return (
+            self.custom_domain == self.event.settings.custom_domain
+            and self.html_export_url == self.event.settings.html_export_url
+        )
+
+    def get_base_url(self, url=None, key=None):
+        if url and url.startswith('/orga'):
+            return settings.SITE_URL
+        if self.html_export_url and url and is_agenda_url(url, key):
+            return self.html_export_url
+        return self.custom_domain or settings.SITE_URL
+
+    def get_base_parts(self, url=None, key=None):
+        """Returns the scheme and network location of the base URL."""
+        base_url = self.get_base_url(url, key)
+        if base_url not in self._base_parts:
+            parsed = urlparse(base_url)
+            self._base_parts[base_url] = (parsed.scheme, parsed.netloc)
+        return self._base_parts[base_url]
+
+    def full(self, url, key=None) -> str:
+        scheme, netloc = self.get_base_parts(url, key)
+        if scheme and netloc and url.startswith('/'):
+            return f'{scheme}://{netloc}{url}'
+        return urlunparse((scheme, netloc, url, '', '', ''))
+
+    def url_template(self, model, name):
+        """Returns a :class:`UrlTemplate` for the URL ``name`` of the
+        ``urls`` of the given model, for objects belonging to this event."""
+        urls = model.urls
+        key = (urls.__class__, name)
+        if key not in self._templates:
+            self._templates[key] = UrlTemplate(self, urls, name)
+        return self._templates[key]
+
+
+def _escape(value) -> str:
+    return str(value).replace('{', '{{').replace('}', '}}')
+
+
+class UrlTemplate:
+    """Formats one URL of many objects of an event.
+
+    The urlman template is flattened once, and all parts of it that depend
+    only on the event (like ``{self.event.urls.base}``) are filled in right
+    away, so that formatting the URL of an object is a single
+    ``str.format`` call. Templates that cannot be flattened, or that do not
+    produce the same URL as urlman for the first object, are formatted by
+    urlman instead."""
+
+    def __init__(self, context, urls, name):
+        self.context = context
+        self.name = name
+        self.key = (urls.__class__, name)
+        self.template = self._flatten(urls.urls, name)
+        self.checked = False
+
+    def _flatten(self, patterns, name):
+        template = patterns[name]
+        if callable(template):
+            return None
+        parts = []
+        event = SimpleNamespace(event=self.context.event)
+        for literal, field, format_spec, conversion in Formatter().parse(template):
+            parts.append(_escape(literal))
+            if field is None:
+                continue
+            if format_spec or conversion:
+                return None
+            if field in patterns:
+                nested = self._flatten(patterns, field)
+                if nested is None:
+                    return None
+                parts.append(nested)
+            elif field.startswith('self.event.'):
+                value = Formatter().get_field(field, [], {'self': event})[0]
+                parts.append(_escape(value() if callable(value) else value))
+            elif field.startswith('self.'):
+                parts.append('{' + field + '}')
+            else:
+                return None
+        return ''.join(parts)
+
+    def path(self, obj) -> str:
+        if self.template is not None:
+            path = self.template.format(self=obj)
+            if self.checked:
+                return path
+            if path == getattr(obj.urls, self.name):
+                self.checked = True
+                return path
+            self.template = None
+        return str(getattr(obj.urls, self.name))
+
+    def full(self, obj) -> str:
+        return self.context.full(self.path(obj), self.key)
+
+
+def get_base_parts(event, url):
+    if not event:
+        parsed = urlparse(get_base_url(None, url))
+        return parsed.scheme, parsed.netloc
+    return get_url_context(event).get_base_parts(url, getattr(url, 'key', None))
+
+
 class EventUrls(Urls):
+    def get_url(self, attr):
+        url = super().get_url(attr)
+        url.key = (self.__class__, attr)
+        return url
+
     def get_hostname(self, url):
-        url = get_base_url(self.instance.event, url)
-        return urlparse(url).netloc
+        return get_base_parts(self.instance.event, url)[1]
 
     def get_scheme(self, url):
-        url = get_base_url(self.instance.event, url)
-        return urlparse(url).scheme
+        return get_base_parts(self.instance.event, url)[0]
@@ -5,7 +5,7 @@ class EventConfig(AppConfig):
     name = 'pretalx.event'
 
     def ready(self):
-        from . import services  # noqa
+        from . import revision, services  # noqa
 
 
 default_app_config = 'pretalx.event.EventConfig'
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.28 on 2026-10-17 00:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0021_auto_20190429_0750'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='content_revision',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
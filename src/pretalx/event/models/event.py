@@ -89,6 +89,10 @@ class Event(LogMixin, models.Model):
         continue to be displayed.
     :param plugins: A list of active plugins as a comma-separated string.
         Please use the ``plugin_list`` property for interaction.
+    :param content_revision: Grows with every change to the public content
+        of the event. Please use
+        :func:`~pretalx.event.revision.get_content_revision` to read it.
+        ``save()`` never writes it, so that outdated instances cannot lower it.
     """
     name = I18nCharField(max_length=200, verbose_name=_('Name'))
     slug = models.SlugField(
@@ -220,6 +224,7 @@ class Event(LogMixin, models.Model):
         blank=True,
     )
     plugins = models.TextField(null=True, blank=True, verbose_name=_('Plugins'))
+    content_revision = models.PositiveIntegerField(default=0, editable=False)
 
     template_names = [
         f'{t}_template' for t in ('accept', 'ack', 'reject', 'update', 'question')
@@ -284,6 +289,7 @@ class Event(LogMixin, models.Model):
         schedule_export_trigger = '{schedule_export}trigger'
         schedule_export_download = '{schedule_export}download'
         release_schedule = '{schedule}release'
+        release_schedule_status = '{schedule}release/status'
         reset_schedule = '{schedule}reset'
         toggle_schedule = '{schedule}toggle'
         reviews = '{base}reviews/'
@@ -329,12 +335,37 @@ class Event(LogMixin, models.Model):
         return get_base_url(self) + self.orga_urls.schedule_export_download
 
     def save(self, *args, **kwargs):
+        from pretalx.event.utils import clear_event_cache
+
         was_created = not bool(self.pk)
+        if not was_created:
+            # The content revision is only ever increased in the database, see
+            # pretalx.event.revision, and must not be overwritten with an
+            # outdated value.
+            update_fields = kwargs.get('update_fields')
+            kwargs['update_fields'] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name != 'content_revision'
+                and (
+                    update_fields is None
+                    or field.name in update_fields
+                    or field.attname in update_fields
+                )
+            ]
         super().save(*args, **kwargs)
+        clear_event_cache(self)
 
         if was_created:
             self.build_initial_data()
 
+    def delete(self, *args, **kwargs):
+        from pretalx.event.utils import clear_event_cache
+
+        clear_event_cache(self)
+        return super().delete(*args, **kwargs)
+
     @property
     def plugin_list(self) -> list:
         """Provides a list of active plugins as strings, and is also an attribute setter."""
@@ -501,6 +532,7 @@ class Event(LogMixin, models.Model):
             s.object = self
             s.pk = None
             s.save()
+        self.settings.flush()
         self.build_initial_data()  # make sure we get a functioning event
 
     @cached_property
@@ -679,15 +711,20 @@ class Event(LogMixin, models.Model):
         is only named once."""
         return daterange(self.date_from, self.date_to)
 
-    def release_schedule(self, name: str, user=None, notify_speakers: bool=False):
+    def release_schedule(
+        self, name: str, user=None, notify_speakers: bool=False, background: bool=False
+    ):
         """Releases a new :class:`~pretalx.schedule.models.schedule.Schedule` by finalizing the current WIP schedule.
 
         :param name: The new version name
         :param user: The :class:`~pretalx.person.models.user.User` executing the release
         :param notify_speakers: Generate emails for all speakers with changed slots.
+        :param background: Generate the emails and exports in background tasks.
         :type user: :class:`~pretalx.person.models.user.User`
         """
-        self.wip_schedule.freeze(name=name, user=user, notify_speakers=notify_speakers)
+        self.wip_schedule.freeze(
+            name=name, user=user, notify_speakers=notify_speakers, background=background
+        )
 
     def send_orga_mail(self, text, stats=False):
         from django.utils.translation import override
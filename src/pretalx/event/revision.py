@@ -0,0 +1,133 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from pretalx.event.models import Event
+from pretalx.event.models.event import Event_SettingsStore
+from pretalx.person.models import SpeakerProfile, User
+from pretalx.schedule.models import Room, Schedule, TalkSlot
+from pretalx.submission.models import (
+    Answer, Question, Submission, SubmissionType, Track,
+)
+
+REVISION_CACHE_TIMEOUT = 60 * 60
+PRIVATE_USER_FIELDS = {'last_login', 'password', 'pw_reset_token', 'pw_reset_time'}
+
+
+def get_revision_key(event_id):
+    return f'event_content_revision_{event_id}'
+
+
+def get_content_revision(event) -> int:
+    """Returns the content revision of the event, which grows with every
+    change to its submissions, schedules, speakers, rooms, questions, tracks
+    or settings. Anything built only from this content can be cached with
+    the revision as part of the cache key or ETag.
+
+    Changes made with ``QuerySet.update()`` send no signals, so code doing
+    so has to call :func:`bump_content_revision` itself."""
+    key = get_revision_key(event.pk)
+    revision = cache.get(key)
+    if revision is None:
+        revision = (
+            Event.objects.filter(pk=event.pk)
+            .values_list('content_revision', flat=True)
+            .first()
+        ) or 0
+        cache.add(key, revision, REVISION_CACHE_TIMEOUT)
+    return revision
+
+
+def get_revision_cache_key(event, *parts) -> str:
+    """Builds a cache key from the given parts that changes with the
+    content revision of the event."""
+    return '_'.join(
+        str(part) for part in ('event', event.pk, get_content_revision(event), *parts)
+    )
+
+
+def bump_content_revision(event_id):
+    """Increases the content revision of the event. The cached revision is
+    removed both immediately and after the current transaction, so that no
+    other process keeps the previous revision around."""
+    if not event_id:
+        return
+    Event.objects.filter(pk=event_id).update(content_revision=F('content_revision') + 1)
+    key = get_revision_key(event_id)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+@receiver(post_save, sender=Event, dispatch_uid='revision_event_saved')
+def event_saved(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or set(update_fields) - {'content_revision'}:
+        bump_content_revision(instance.pk)
+
+
+@receiver(post_save, sender=Submission, dispatch_uid='revision_submission_saved')
+@receiver(post_save, sender=Schedule, dispatch_uid='revision_schedule_saved')
+@receiver(post_save, sender=SpeakerProfile, dispatch_uid='revision_profile_saved')
+@receiver(post_save, sender=Room, dispatch_uid='revision_room_saved')
+@receiver(post_save, sender=Question, dispatch_uid='revision_question_saved')
+@receiver(post_save, sender=Track, dispatch_uid='revision_track_saved')
+@receiver(post_save, sender=SubmissionType, dispatch_uid='revision_type_saved')
+@receiver(post_delete, sender=Submission, dispatch_uid='revision_submission_deleted')
+@receiver(post_delete, sender=Schedule, dispatch_uid='revision_schedule_deleted')
+@receiver(post_delete, sender=SpeakerProfile, dispatch_uid='revision_profile_deleted')
+@receiver(post_delete, sender=Room, dispatch_uid='revision_room_deleted')
+@receiver(post_delete, sender=Question, dispatch_uid='revision_question_deleted')
+@receiver(post_delete, sender=Track, dispatch_uid='revision_track_deleted')
+@receiver(post_delete, sender=SubmissionType, dispatch_uid='revision_type_deleted')
+def event_content_changed(sender, instance, **kwargs):
+    bump_content_revision(instance.event_id)
+
+
+@receiver(
+    m2m_changed,
+    sender=Submission.speakers.through,
+    dispatch_uid='revision_submission_speakers_changed',
+)
+def submission_speakers_changed(sender, instance, action, reverse, **kwargs):
+    if action.startswith('post_') and not reverse:
+        bump_content_revision(instance.event_id)
+
+
+@receiver(post_save, sender=TalkSlot, dispatch_uid='revision_slot_saved')
+def slot_saved(sender, instance, **kwargs):
+    bump_content_revision(instance.schedule.event_id)
+
+
+@receiver(post_delete, sender=TalkSlot, dispatch_uid='revision_slot_deleted')
+def slot_deleted(sender, instance, **kwargs):
+    # The schedule may already be gone when its slots are deleted with it, in
+    # which case its own post_delete receiver bumps the revision.
+    event_id = (
+        Schedule.objects.filter(pk=instance.schedule_id)
+        .values_list('event_id', flat=True)
+        .first()
+    )
+    bump_content_revision(event_id)
+
+
+@receiver(post_save, sender=User, dispatch_uid='revision_user_saved')
+def user_saved(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and set(update_fields) <= PRIVATE_USER_FIELDS:
+        return
+    for event_id in instance.profiles.values_list('event_id', flat=True):
+        bump_content_revision(event_id)
+
+
+@receiver(post_save, sender=Answer, dispatch_uid='revision_answer_saved')
+@receiver(post_delete, sender=Answer, dispatch_uid='revision_answer_deleted')
+def answer_changed(sender, instance, **kwargs):
+    bump_content_revision(instance.question.event_id)
+
+
+@receiver(post_save, sender=Event_SettingsStore, dispatch_uid='revision_settings_saved')
+@receiver(
+    post_delete, sender=Event_SettingsStore, dispatch_uid='revision_settings_deleted'
+)
+def settings_changed(sender, instance, **kwargs):
+    bump_content_revision(instance.object_id)
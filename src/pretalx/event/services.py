@@ -1,11 +1,17 @@
 from datetime import timedelta
 
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_save, pre_delete
 from django.dispatch import receiver
 from django.utils.timezone import now
 
 from pretalx.celery_app import app
+from pretalx.common.models import ActivityLog
 from pretalx.common.signals import periodic_task
-from pretalx.event.models import Event
+from pretalx.event.models import Event, Team
+from pretalx.person.models import User
+from pretalx.submission.models import Track
 
 
 @app.task()
@@ -21,10 +27,9 @@ def task_periodic_event_services(event_slug):
 
     event.build_initial_data()  # Make sure the required mail templates are there
     if not event.settings.sent_mail_event_created:
-        if (
-            timedelta(0)
-            <= (_now - event.log_entries.last().timestamp)
-            <= timedelta(days=1)
+        first_log = ActivityLog.history(event=event).order_by('timestamp').first()
+        if first_log and timedelta(0) <= (_now - first_log.timestamp) <= timedelta(
+            days=1
         ):
             event.send_orga_mail(event.settings.mail_text_event_created)
             event.settings.sent_mail_event_created = True
@@ -53,3 +58,62 @@ def periodic_event_services(sender, **kwargs):
     for event in Event.objects.all():
         task_periodic_event_services.apply_async(args=(event.slug,))
         event.update_review_phase()
+
+
+def clear_permission_matrix(user_ids):
+    """Removes the cached permission matrix of the given users. As teams may
+    be changed in a transaction that other requests cannot see yet, the cache
+    is cleared again once the transaction is committed."""
+    keys = [User.get_permission_matrix_key(user_id) for user_id in set(user_ids)]
+    if not keys:
+        return
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def _team_member_ids(teams):
+    return Team.members.through.objects.filter(team__in=teams).values_list(
+        'user_id', flat=True
+    )
+
+
+@receiver(post_save, sender=Team, dispatch_uid='permissions_team_saved')
+@receiver(pre_delete, sender=Team, dispatch_uid='permissions_team_deleted')
+def team_changed(sender, instance, **kwargs):
+    clear_permission_matrix(_team_member_ids([instance]))
+
+
+@receiver(post_save, sender=Event, dispatch_uid='permissions_event_created')
+def event_created(sender, instance, created, **kwargs):
+    if created:
+        clear_permission_matrix(_team_member_ids(instance.teams))
+
+
+@receiver(m2m_changed, sender=Team.members.through, dispatch_uid='permissions_team_members_changed')
+def team_members_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse:
+        clear_permission_matrix([instance.pk])
+    elif action == 'pre_clear':
+        clear_permission_matrix(_team_member_ids([instance]))
+    elif action in ('post_add', 'post_remove'):
+        clear_permission_matrix(pk_set)
+
+
+@receiver(pre_delete, sender=Track, dispatch_uid='permissions_track_deleted')
+def track_deleted(sender, instance, **kwargs):
+    # The track limits of teams are removed with the track, without m2m signal
+    clear_permission_matrix(_team_member_ids(Team.objects.filter(limit_tracks=instance)))
+
+
+@receiver(m2m_changed, sender=Team.limit_events.through, dispatch_uid='permissions_team_events_changed')
+@receiver(m2m_changed, sender=Team.limit_tracks.through, dispatch_uid='permissions_team_tracks_changed')
+def team_limits_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        teams = [instance]
+    elif action == 'pre_clear':
+        field = 'limit_events' if sender is Team.limit_events.through else 'limit_tracks'
+        teams = Team.objects.filter(**{field: instance})
+    else:
+        teams = pk_set or []
+    if action in ('pre_clear', 'post_add', 'post_remove'):
+        clear_permission_matrix(_team_member_ids(teams))
@@ -1,4 +1,12 @@
-from pretalx.event.models import Organiser, Team
+import copy
+import time
+
+from django.db import transaction
+
+from pretalx.event.models import Event, Organiser, Team
+
+EVENT_CACHE_TIMEOUT = 30
+_event_cache = {}
 
 
 def create_organiser_with_user(*, name, slug, user):
@@ -13,3 +21,51 @@ def create_organiser_with_user(*, name, slug, user):
     )
     team.members.add(user)
     return organiser, team
+
+
+def get_event_by_slug(slug, cached=True):
+    """Returns the event with the given (case insensitive) slug, or raises
+    ``Event.DoesNotExist``.
+
+    Events are kept in a per-process cache for ``EVENT_CACHE_TIMEOUT``
+    seconds, which is cleared whenever an event is saved or deleted in this
+    process. Every call returns a fresh
+    :class:`~pretalx.event.models.event.Event` instance, so that cached
+    properties never leak between requests.
+
+    Cached events may be outdated if they were changed in another process, so
+    code that may save the event has to pass ``cached=False``, which loads
+    the event from the database (and refreshes the cache)."""
+    key = slug.lower()
+    entry = _event_cache.get(key)
+    if cached and entry and entry[0] > time.monotonic():
+        field_names, values = entry[2:]
+        return Event.from_db('default', field_names, copy.deepcopy(values))
+    event = Event.objects.get(slug__iexact=slug)
+    field_names = [field.attname for field in Event._meta.concrete_fields]
+    _event_cache[key] = (
+        time.monotonic() + EVENT_CACHE_TIMEOUT,
+        event.pk,
+        field_names,
+        copy.deepcopy([getattr(event, name) for name in field_names]),
+    )
+    return event
+
+
+def clear_event_cache(event=None):
+    """Removes the given event (or all events) from the event cache.
+
+    As an event may be changed in a transaction that other requests cannot
+    see yet, its cache entry is removed again once the transaction is
+    committed."""
+    if event is None:
+        _event_cache.clear()
+        return
+
+    def clear():
+        for key, entry in list(_event_cache.items()):
+            if key == event.slug.lower() or entry[1] == event.pk:
+                _event_cache.pop(key, None)
+
+    clear()
+    transaction.on_commit(clear)
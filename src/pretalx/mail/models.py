@@ -1,15 +1,17 @@
+from collections import defaultdict
 from copy import deepcopy
 
 import bleach
 import markdown
+from django.conf import settings
 from django.db import models, transaction
-from django.template.loader import get_template
 from django.utils.timezone import now
 from django.utils.translation import override, ugettext_lazy as _
 from i18nfield.fields import I18nCharField, I18nTextField
 
-from pretalx.common.mail import SendMailException
+from pretalx.common.mail import MAIL_BODY_TAGS, SendMailException, render_mail_html
 from pretalx.common.mixins import LogMixin
+from pretalx.common.mixins.models import bulk_log_actions
 from pretalx.common.urls import EventUrls
 
 
@@ -184,16 +186,9 @@ class QueuedMail(LogMixin, models.Model):
     @classmethod
     def make_html(cls, text, event=None):
         body_md = bleach.linkify(
-            bleach.clean(
-                markdown.markdown(text), tags=bleach.ALLOWED_TAGS + ['p', 'pre']
-            )
+            bleach.clean(markdown.markdown(text), tags=MAIL_BODY_TAGS)
         )
-        html_context = {
-            'body': body_md,
-            'event': event,
-            'color': (event.primary_color if event else '') or '#1c4a3b',
-        }
-        return get_template('mail/mailwrapper.html').render(html_context)
+        return render_mail_html(body_md, event=event)
 
     @classmethod
     def make_text(cls, text, event=None):
@@ -213,6 +208,26 @@ class QueuedMail(LogMixin, models.Model):
             prefix = f'[{prefix}]'
         return f'{prefix} {text}'
 
+    def _get_message(self) -> dict:
+        """Returns the keyword arguments for
+        :func:`~pretalx.common.mail.mail_send_task`, without the event."""
+        has_event = getattr(self, 'event', None)
+        text = self.make_text(self.text, event=has_event)
+        body_html = self.make_html(text, event=has_event)
+
+        to = (self.to or '').split(',')
+        if self.id:
+            to += [user.email for user in self.to_users.all()]
+        return {
+            'to': to,
+            'subject': self.make_subject(self.subject, event=has_event),
+            'body': text,
+            'html': body_html,
+            'reply_to': (self.reply_to or '').split(',') or ([self.event.email] if has_event else None),
+            'cc': (self.cc or '').split(','),
+            'bcc': (self.bcc or '').split(','),
+        }
+
     @transaction.atomic
     def send(self, requestor=None, orga: bool=True):
         """Sends an email.
@@ -223,26 +238,11 @@ class QueuedMail(LogMixin, models.Model):
         if self.sent:
             raise Exception(_('This mail has been sent already. It cannot be sent again.'))
 
-        has_event = getattr(self, 'event', None)
-        text = self.make_text(self.text, event=has_event)
-        body_html = self.make_html(text)
-
         from pretalx.common.mail import mail_send_task
 
-        to = (self.to or '').split(',')
-        if self.id:
-            to += [user.email for user in self.to_users.all()]
+        has_event = getattr(self, 'event', None)
         mail_send_task.apply_async(
-            kwargs={
-                'to': to,
-                'subject': self.make_subject(self.subject, event=has_event),
-                'body': text,
-                'html': body_html,
-                'reply_to': (self.reply_to or '').split(',') or ([self.event.email] if has_event else None),
-                'event': self.event.pk if has_event else None,
-                'cc': (self.cc or '').split(','),
-                'bcc': (self.bcc or '').split(','),
-            }
+            kwargs=dict(self._get_message(), event=self.event.pk if has_event else None)
         )
 
         self.sent = now()
@@ -253,6 +253,54 @@ class QueuedMail(LogMixin, models.Model):
             )
             self.save()
 
+    @classmethod
+    @transaction.atomic
+    def send_many(cls, mails, requestor=None, orga: bool=True) -> int:
+        """Sends many saved, unsent emails at once.
+
+        The emails are grouped by event and handed to
+        :func:`~pretalx.common.mail.mail_send_batch_task` in batches of
+        ``MAIL_BATCH_SIZE``, so that each batch is sent through one
+        connection. All emails are then marked as sent and logged in bulk.
+
+        :param mails: A queryset of :class:`~pretalx.mail.models.QueuedMail` objects.
+        :param requestor: The user issuing the command. Used for logging.
+        :type requestor: :class:`~pretalx.person.models.user.User`
+        :param orga: Was this email sent as by a privileged user?
+        :returns: The number of emails sent.
+        """
+        from pretalx.common.mail import mail_send_batch_task
+
+        mails = list(
+            mails.filter(sent__isnull=True)
+            .select_related('event')
+            .prefetch_related('to_users')
+        )
+        messages = defaultdict(list)
+        for mail in mails:
+            messages[mail.event_id].append(mail._get_message())
+        batch_size = settings.MAIL_BATCH_SIZE
+        for event_id, event_messages in messages.items():
+            for offset in range(0, len(event_messages), batch_size):
+                mail_send_batch_task.apply_async(
+                    kwargs={
+                        'messages': event_messages[offset:offset + batch_size],
+                        'event': event_id,
+                    }
+                )
+
+        cls.objects.filter(pk__in=[mail.pk for mail in mails]).update(sent=now())
+        bulk_log_actions(
+            mail.build_log_entry(
+                'pretalx.mail.sent',
+                data={'to_users': [(user.pk, user.email) for user in mail.to_users.all()]},
+                person=requestor,
+                orga=orga,
+            )
+            for mail in mails
+        )
+        return len(mails)
+
     def copy_to_draft(self):
         """Copies an already sent email to a new object and adds it to the outbox."""
         new_mail = deepcopy(self)
@@ -17,7 +17,7 @@ def can_change_event_settings(user, obj):
     event = getattr(obj, 'event', None)
     if not user or user.is_anonymous or not obj or not event:
         return False
-    return user.is_administrator or event.teams.filter(members__in=[user], can_change_event_settings=True).exists()
+    return user.is_administrator or 'can_change_event_settings' in user.get_team_permissions(event)['permissions']
 
 
 @rules.predicate
@@ -27,7 +27,7 @@ def can_change_organiser_settings(user, obj):
         obj = event.organiser
     return (
         user.is_administrator
-        or user.teams.filter(organiser=obj, can_change_organiser_settings=True).exists()
+        or 'can_change_organiser_settings' in user.get_organiser_permissions(obj)
     )
 
 
@@ -35,13 +35,19 @@ def can_change_organiser_settings(user, obj):
 def can_change_any_organiser_settings(user, obj):
     return not user.is_anonymous and (
         user.is_administrator
-        or user.teams.filter(can_change_organiser_settings=True).exists()
+        or any(
+            'can_change_organiser_settings' in permissions
+            for permissions in user.get_permission_matrix()['organisers'].values()
+        )
     )
 
 
 @rules.predicate
 def can_create_events(user, obj):
-    return user.is_administrator or user.teams.filter(can_create_events=True).exists()
+    return user.is_administrator or any(
+        'can_create_events' in permissions
+        for permissions in user.get_permission_matrix()['organisers'].values()
+    )
 
 
 @rules.predicate
@@ -51,11 +57,11 @@ def can_change_teams(user, obj):
     if isinstance(obj, Team):
         obj = obj.organiser
     if isinstance(obj, Organiser):
-        return user.teams.filter(organiser=obj, can_change_teams=True).exists()
+        return 'can_change_teams' in user.get_organiser_permissions(obj)
     event = getattr(obj, 'event', None)
     if not user or user.is_anonymous or not obj or not event:
         return False
-    return user.is_administrator or event.teams.filter(members__in=[user], can_change_teams=True).exists()
+    return user.is_administrator or 'can_change_teams' in user.get_team_permissions(event)['permissions']
 
 
 @rules.predicate
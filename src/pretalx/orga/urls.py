@@ -136,6 +136,7 @@ urlpatterns = [
         url('^schedule/export/trigger$', schedule.ScheduleExportTriggerView.as_view(), name='schedule.export.trigger'),
         url('^schedule/export/download$', schedule.ScheduleExportDownloadView.as_view(), name='schedule.export.download'),
         url('^schedule/release$', schedule.ScheduleReleaseView.as_view(), name='schedule.release'),
+        url('^schedule/release/status$', schedule.ScheduleReleaseStatusView.as_view(), name='schedule.release.status'),
         url(r'^schedule/quick/(?P<code>\w+)/$', schedule.QuickScheduleView.as_view(), name='schedule.quick'),
         url('^schedule/reset$', schedule.ScheduleResetView.as_view(), name='schedule.reset'),
         url('^schedule/toggle$', schedule.ScheduleToggleView.as_view(), name='schedule.toggle'),
@@ -89,10 +89,7 @@ class OutboxSend(EventPermissionRequired, TemplateView):
         return qs
 
     def post(self, request, *args, **kwargs):
-        qs = self.queryset
-        count = qs.count()
-        for mail in qs:
-            mail.send(requestor=self.request.user)
+        count = QueuedMail.send_many(self.queryset, requestor=self.request.user)
         messages.success(
             request, _('{count} mails have been sent.').format(count=count)
         )
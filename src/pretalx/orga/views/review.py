@@ -1,12 +1,13 @@
 from django.contrib import messages
 from django.db import transaction
-from django.db.models import Count, Exists, OuterRef, Q
+from django.db.models import Avg, Exists, F, OuterRef, Subquery
 from django.shortcuts import get_object_or_404, redirect
 from django.utils.functional import cached_property
 from django.utils.translation import ugettext_lazy as _
 from django.views.generic import ListView, TemplateView
 from django_context_decorator import context
 
+from pretalx.common.mixins.models import log_buffer
 from pretalx.common.mixins.views import (
     EventPermissionRequired, Filterable, PermissionRequired,
 )
@@ -14,12 +15,15 @@ from pretalx.common.phrases import phrases
 from pretalx.common.views import CreateOrUpdateView
 from pretalx.orga.forms import ReviewForm
 from pretalx.submission.forms import QuestionsForm, SubmissionFilterForm
-from pretalx.submission.models import Review, Submission, SubmissionStates
+from pretalx.submission.models import Review, SubmissionStates
+
+# The number of submissions the review form lets the browser prefetch.
+UPCOMING_SUBMISSIONS = 3
 
 
 class ReviewDashboard(EventPermissionRequired, Filterable, ListView):
     template_name = 'orga/review/dashboard.html'
-    paginate_by = None
+    paginate_by = 100
     context_object_name = 'submissions'
     permission_required = 'orga.view_review_dashboard'
     default_filters = (
@@ -50,99 +54,99 @@ class ReviewDashboard(EventPermissionRequired, Filterable, ListView):
                 SubmissionStates.CONFIRMED,
             ]
         )
-        limit_tracks = self.request.user.teams.filter(
-            Q(all_events=True)
-            | Q(
-                Q(all_events=False)
-                & Q(limit_events__in=[self.request.event])
-            ),
-            limit_tracks__isnull=False,
-        )
-        if limit_tracks:
-            tracks = set()
-            for team in limit_tracks:
-                tracks.update(team.limit_tracks.filter(event=self.request.event))
+        tracks = self.request.user.get_team_permissions(self.request.event)['reviewer_tracks']
+        if tracks:
             queryset = queryset.filter(track__in=tracks)
-        queryset = self.filter_queryset(queryset).annotate(review_count=Count('reviews'))
+        queryset = self.filter_queryset(queryset)
 
         can_see_all_reviews = self.request.user.has_perm('orga.view_all_reviews', self.request.event)
         overridden_reviews = Review.objects.filter(
             override_vote__isnull=False, submission_id=OuterRef('pk')
         )
-        if not can_see_all_reviews:
+        if can_see_all_reviews:
+            current_score = F('median_score')
+            average_score = Subquery(
+                Review.objects.filter(submission_id=OuterRef('pk'))
+                .values('submission_id')
+                .annotate(average=Avg('score'))
+                .values('average')
+            )
+        else:
             overridden_reviews = overridden_reviews.filter(user=self.request.user)
+            current_score = Subquery(
+                Review.objects.filter(
+                    submission_id=OuterRef('pk'), user=self.request.user
+                ).values('score')[:1]
+            )
+            # Reviewers only see their own score, so there is nothing to average
+            average_score = current_score
 
         queryset = (
-            queryset.annotate(has_override=Exists(overridden_reviews))
+            queryset.annotate(
+                has_override=Exists(overridden_reviews),
+                current_score=current_score,
+                average_score=average_score,
+            )
             .select_related('track', 'submission_type')
-            .prefetch_related('speakers', 'reviews', 'reviews__user')
+            .prefetch_related('speakers')
+            .distinct()
         )
-
-        for submission in queryset:
-            if can_see_all_reviews:
-                submission.current_score = submission.median_score
-            else:
-                reviews = [review for review in submission.reviews.all() if review.user == self.request.user]
-                submission.current_score = None
-                if reviews:
-                    submission.current_score = reviews[0].score
-
         return self.sort_queryset(queryset)
 
     def sort_queryset(self, queryset):
         order_prevalence = {
             'default': ('state', 'current_score', 'code'),
             'score': ('current_score', 'state', 'code'),
+            'average': ('average_score', 'state', 'code'),
             'count': ('review_count', 'code')
         }
         ordering = self.request.GET.get('sort', 'default')
-        reverse = True
+        descending = True
         if ordering.startswith('-'):
-            reverse = False
+            descending = False
             ordering = ordering[1:]
 
         order = order_prevalence.get(ordering, order_prevalence['default'])
-
-        def get_order_tuple(obj):
-            return tuple(
-                getattr(obj, key)
-                if not (key == 'current_score' and not obj.current_score)
-                else 100 * -int(reverse)
-                for key in order
-            )
-
-        return sorted(
-            queryset,
-            key=get_order_tuple,
-            reverse=reverse,
-        )
+        return queryset.order_by(*[
+            F(key).desc(nulls_last=True) if descending else F(key).asc(nulls_first=True)
+            for key in order
+        ])
 
     def get_context_data(self, **kwargs):
         result = super().get_context_data(**kwargs)
-        missing_reviews = Review.find_missing_reviews(
+        next_submissions = Review.find_next_submissions(
             self.request.event, self.request.user
         )
-        result['missing_reviews'] = missing_reviews
-        result['next_submission'] = missing_reviews.first()
+        if next_submissions:
+            result['next_submission'] = next_submissions[0]
+            result['missing_reviews'] = Review.find_missing_reviews(
+                self.request.event, self.request.user
+            ).count()
         return result
 
     @transaction.atomic
     def post(self, request, *args, **kwargs):
         total = {'accept': 0, 'reject': 0, 'error': 0}
-        for key, value in request.POST.items():
-            if not key.startswith('s-') or value not in ['accept', 'reject']:
-                continue
-            pk = key.strip('s-')
-            try:
-                submission = request.event.submissions.filter(state=SubmissionStates.SUBMITTED).get(pk=pk)
-            except Submission.DoesNotExist:
-                total['error'] += 1
-                continue
-            if not request.user.has_perm('submission.' + value + '_submission', submission):
-                total['error'] += 1
-                continue
-            getattr(submission, value)(person=request.user)
-            total[value] += 1
+        actions = {
+            key.strip('s-'): value
+            for key, value in request.POST.items()
+            if key.startswith('s-') and value in ['accept', 'reject']
+        }
+        submissions = request.event.submissions.filter(
+            state=SubmissionStates.SUBMITTED
+        ).in_bulk([int(pk) for pk in actions if pk.isdigit()])
+        with log_buffer():
+            for pk, value in actions.items():
+                submission = submissions.get(int(pk)) if pk.isdigit() else None
+                if not submission:
+                    total['error'] += 1
+                    continue
+                submission.event = request.event
+                if not request.user.has_perm('submission.' + value + '_submission', submission):
+                    total['error'] += 1
+                    continue
+                getattr(submission, value)(person=request.user)
+                total[value] += 1
         if not total['accept'] and not total['reject'] and not total['error']:
             messages.success(request, _('There was nothing to do.'))
         elif total['accept'] or total['reject']:
@@ -228,11 +232,19 @@ class ReviewSubmission(PermissionRequired, CreateOrUpdateView):
             readonly=self.read_only,
         )
 
+    @context
+    @cached_property
+    def upcoming_submissions(self):
+        return Review.find_next_submissions(
+            self.request.event,
+            self.request.user,
+            count=UPCOMING_SUBMISSIONS,
+            ignore=[self.submission],
+        )
+
     @context
     def skip_for_now(self):
-        return Review.find_missing_reviews(
-            self.request.event, self.request.user, ignore=[self.submission]
-        ).first()
+        return self.upcoming_submissions[0] if self.upcoming_submissions else None
 
     def get_context_data(self, **kwargs):
         result = super().get_context_data(**kwargs)
@@ -279,12 +291,12 @@ class ReviewSubmission(PermissionRequired, CreateOrUpdateView):
 
     def get_success_url(self) -> str:
         if self.request.POST.get('show_next', '0').strip() == '1':
-            next_submission = Review.find_missing_reviews(
+            next_submissions = Review.find_next_submissions(
                 self.request.event, self.request.user
-            ).first()
-            if next_submission:
+            )
+            if next_submissions:
                 messages.success(self.request, phrases.orga.another_review)
-                return next_submission.orga_urls.reviews
+                return next_submissions[0].orga_urls.reviews
             messages.success(
                 self.request, _('Nice, you have no submissions left to review!')
             )
@@ -6,6 +6,7 @@ from datetime import timedelta
 
 import dateutil.parser
 from csp.decorators import csp_update
+from django.conf import settings
 from django.contrib import messages
 from django.db import transaction
 from django.db.models.deletion import ProtectedError
@@ -29,8 +30,10 @@ from pretalx.common.mixins.views import (
 from pretalx.common.signals import register_data_exporters
 from pretalx.common.views import CreateOrUpdateView
 from pretalx.orga.forms.schedule import ScheduleImportForm, ScheduleReleaseForm
+from pretalx.schedule.conflicts import get_talk_warnings
 from pretalx.schedule.forms import QuickScheduleForm, RoomForm
-from pretalx.schedule.models import Availability, Room
+from pretalx.schedule.models import Room
+from pretalx.schedule.models.availability import IntervalSet
 from pretalx.schedule.utils import guess_schedule_version
 
 
@@ -115,7 +118,7 @@ class ScheduleReleaseView(EventPermissionRequired, FormView):
 
     @context
     def notifications(self):
-        return len(self.request.event.wip_schedule.notifications)
+        return len(self.request.event.wip_schedule.speakers_concerned)
 
     @context
     def suggested_version(self):
@@ -132,11 +135,21 @@ class ScheduleReleaseView(EventPermissionRequired, FormView):
             form.cleaned_data['version'],
             user=self.request.user,
             notify_speakers=form.cleaned_data['notify_speakers'],
+            background=settings.HAS_CELERY,
         )
         messages.success(self.request, _('Nice, your schedule has been released!'))
         return redirect(self.request.event.orga_urls.schedule)
 
 
+class ScheduleReleaseStatusView(EventPermissionRequired, View):
+    permission_required = 'orga.view_schedule'
+
+    def get(self, request, event):
+        schedule = self.request.event.current_schedule
+        status = schedule.release_status if schedule else None
+        return JsonResponse(status or {'state': None})
+
+
 class ScheduleResetView(EventPermissionRequired, View):
     permission_required = 'orga.edit_schedule'
 
@@ -180,7 +193,7 @@ class ScheduleResendMailsView(EventPermissionRequired, View):
             messages.success(
                 self.request,
                 _('{count} emails have been saved to the outbox – you can make individual changes there or just send them all.').format(
-                    count=len(self.request.event.current_schedule.notifications)
+                    count=len(self.request.event.current_schedule.speakers_concerned)
                 )
             )
         else:
@@ -188,7 +201,7 @@ class ScheduleResendMailsView(EventPermissionRequired, View):
         return redirect(self.request.event.orga_urls.schedule)
 
 
-def serialize_slot(slot):
+def serialize_slot(slot, warnings=None):
     return {
         'id': slot.pk,
         'title': str(slot.submission.title),
@@ -209,7 +222,7 @@ def serialize_slot(slot):
         'start': slot.start.isoformat() if slot.start else None,
         'end': slot.end.isoformat() if slot.end else None,
         'url': slot.submission.orga_urls.base,
-        'warnings': slot.warnings,
+        'warnings': slot.warnings if warnings is None else warnings,
     }
 
 
@@ -231,14 +244,15 @@ class TalkList(EventPermissionRequired, View):
 
         if not schedule:
             return JsonResponse(result)
+        talks = list(
+            schedule.talks.all()
+            .select_related('submission', 'submission__event', 'room', 'submission__submission_type', 'submission__track')
+            .prefetch_related('submission__speakers')
+        )
+        warnings = get_talk_warnings(schedule, talks=talks)
         result['results'] = [
-            serialize_slot(slot)
-            for slot
-            in (
-                schedule.talks.all()
-                .select_related('submission', 'submission__event', 'room', 'submission__submission_type', 'submission__track')
-                .prefetch_related('submission__speakers')
-            )
+            serialize_slot(slot, warnings=warnings.get(slot.pk, []))
+            for slot in talks
         ]
         return JsonResponse(result, encoder=I18nJSONEncoder)
 
@@ -306,12 +320,12 @@ class RoomTalkAvailabilities(EventPermissionRequired, View):
         room = request.event.rooms.filter(pk=roomid).first()
         if not (talk and room):
             return JsonResponse({'results': []})
-        if talk.submission.availabilities:
-            availabilitysets = [
-                room.availabilities.all(),
-                talk.submission.availabilities,
-            ]
-            availabilities = Availability.intersection(*availabilitysets)
+        speaker_availabilities = talk.submission.availability_set
+        if speaker_availabilities:
+            availabilities = (
+                IntervalSet.from_availabilities(room.availabilities.all())
+                & speaker_availabilities
+            ).to_availabilities()
         else:
             availabilities = room.availabilities.all()
         return JsonResponse(
@@ -22,7 +22,6 @@ from django.views.generic import ListView, TemplateView, View
 from pretalx.common.mixins.views import (
     ActionFromUrl, EventPermissionRequired, Filterable, PermissionRequired, Sortable,
 )
-from pretalx.common.models import ActivityLog
 from pretalx.common.urls import build_absolute_uri
 from pretalx.common.views import CreateOrUpdateView, context
 from pretalx.mail.models import QueuedMail
@@ -33,6 +32,7 @@ from pretalx.submission.forms import QuestionsForm, ResourceForm, SubmissionFilt
 from pretalx.submission.models import (
     Resource, Submission, SubmissionError, SubmissionStates,
 )
+from pretalx.submission.stats import get_submission_stats
 
 
 def create_user_as_orga(email, submission=None, name=None):
@@ -421,6 +421,7 @@ class SubmissionList(EventPermissionRequired, Sortable, Filterable, ListView):
         qs = (
             self.request.event.submissions(manager='all_objects')
             .select_related('submission_type')
+            .prefetch_related('speakers')
             .order_by('-id')
             .all()
         )
@@ -498,14 +499,11 @@ class SubmissionStats(PermissionRequired, TemplateView):
     def get_permission_object(self):
         return self.request.event
 
-    @context
-    def submission_timeline_data(self):
-        data = Counter(
-            timestamp.date()
-            for timestamp in ActivityLog.objects.filter(
-                event=self.request.event, action_type='pretalx.submission.create'
-            ).values_list('timestamp', flat=True)
-        )
+    @cached_property
+    def stats(self):
+        return get_submission_stats(self.request.event)
+
+    def _timeline_data(self, data):
         dates = data.keys()
         if len(dates) > 1:
             date_range = rrule.rrule(
@@ -513,71 +511,65 @@ class SubmissionStats(PermissionRequired, TemplateView):
                 count=(max(dates) - min(dates)).days + 1,
                 dtstart=min(dates),
             )
-            if len(data) > 1:
-                return json.dumps(
-                    [
-                        {"x": date.isoformat(), "y": data.get(date.date(), 0)}
-                        for date in date_range
-                    ]
-                )
+            return json.dumps(
+                [
+                    {"x": date.isoformat(), "y": data.get(date.date(), 0)}
+                    for date in date_range
+                ]
+            )
         return ''
 
+    def _pie_data(self, data, labels):
+        counter = Counter()
+        for key, value in data.items():
+            counter[str(labels.get(key))] += value
+        return json.dumps(sorted(list({'label': label, 'value': value} for label, value in counter.items()), key=itemgetter('label')))
+
+    @cached_property
+    def state_labels(self):
+        return dict(SubmissionStates.get_choices())
+
+    @cached_property
+    def type_labels(self):
+        return self.request.event.submission_types.in_bulk()
+
+    @cached_property
+    def track_labels(self):
+        return self.request.event.tracks.in_bulk()
+
+    @context
+    def submission_timeline_data(self):
+        return self._timeline_data(self.stats['submissions']['timeline'])
+
     @context
     @cached_property
     def submission_state_data(self):
-        counter = Counter(submission.get_state_display() for submission in self.request.event.submissions(manager='all_objects').all())
-        return json.dumps(sorted(list({'label': label, 'value': value} for label, value in counter.items()), key=itemgetter('label')))
+        return self._pie_data(self.stats['submissions']['state'], self.state_labels)
 
     @context
     def submission_type_data(self):
-        counter = Counter(str(submission.submission_type) for submission in self.request.event.submissions(manager='all_objects').all())
-        return json.dumps(sorted(list({'label': label, 'value': value} for label, value in counter.items()), key=itemgetter('label')))
+        return self._pie_data(self.stats['submissions']['type'], self.type_labels)
 
     @context
     def submission_track_data(self):
         if self.request.event.settings.use_tracks:
-            counter = Counter(str(submission.track) for submission in self.request.event.submissions(manager='all_objects').all())
-            return json.dumps(sorted(list({'label': label, 'value': value} for label, value in counter.items()), key=itemgetter('label')))
+            return self._pie_data(self.stats['submissions']['track'], self.track_labels)
         return ''
 
     @context
     def talk_timeline_data(self):
-        data = Counter(
-            log.timestamp.date()
-            for log in ActivityLog.objects.filter(
-                event=self.request.event, action_type='pretalx.submission.create',
-            )
-            if getattr(log.content_object, 'state', None) in [SubmissionStates.ACCEPTED, SubmissionStates.CONFIRMED]
-        )
-        dates = data.keys()
-        if len(dates) > 1:
-            date_range = rrule.rrule(
-                rrule.DAILY,
-                count=(max(dates) - min(dates)).days + 1,
-                dtstart=min(dates),
-            )
-            if len(data) > 1:
-                return json.dumps(
-                    [
-                        {"x": date.isoformat(), "y": data.get(date.date(), 0)}
-                        for date in date_range
-                    ]
-                )
-        return ''
+        return self._timeline_data(self.stats['talks']['timeline'])
 
     @context
     def talk_state_data(self):
-        counter = Counter(submission.get_state_display() for submission in self.request.event.submissions.filter(state__in=[SubmissionStates.ACCEPTED, SubmissionStates.CONFIRMED]))
-        return json.dumps(sorted(list({'label': label, 'value': value} for label, value in counter.items()), key=itemgetter('label')))
+        return self._pie_data(self.stats['talks']['state'], self.state_labels)
 
     @context
     def talk_type_data(self):
-        counter = Counter(str(submission.submission_type) for submission in self.request.event.submissions.filter(state__in=[SubmissionStates.ACCEPTED, SubmissionStates.CONFIRMED]))
-        return json.dumps(sorted(list({'label': label, 'value': value} for label, value in counter.items()), key=itemgetter('label')))
+        return self._pie_data(self.stats['talks']['type'], self.type_labels)
 
     @context
     def talk_track_data(self):
         if self.request.event.settings.use_tracks:
-            counter = Counter(str(submission.track) for submission in self.request.event.submissions.filter(state__in=[SubmissionStates.ACCEPTED, SubmissionStates.CONFIRMED]))
-            return json.dumps(sorted(list({'label': label, 'value': value} for label, value in counter.items()), key=itemgetter('label')))
+            return self._pie_data(self.stats['talks']['track'], self.track_labels)
         return ''
@@ -75,5 +75,6 @@ class SpeakerProfile(LogMixin, models.Model):
             event=self.event, speakers__in=[self.user]
         )
         return Answer.objects.filter(
-            models.Q(submission__in=submissions) | models.Q(person=self.user)
+            models.Q(submission__in=submissions) | models.Q(person=self.user),
+            question__event=self.event,
         )
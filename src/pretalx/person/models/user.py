@@ -1,5 +1,6 @@
 import json
 import random
+from collections import defaultdict
 from hashlib import md5
 
 import pytz
@@ -8,8 +9,8 @@ from django.contrib.auth.models import (
     AbstractBaseUser, BaseUserManager, PermissionsMixin,
 )
 from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
 from django.db import models, transaction
-from django.db.models import Q
 from django.utils.crypto import get_random_string
 from django.utils.functional import cached_property
 from django.utils.timezone import now
@@ -71,6 +72,7 @@ class User(PermissionsMixin, AbstractBaseUser):
     EMAIL_FIELD = 'email'
     USERNAME_FIELD = 'email'
     CODE_CHARSET = list('ABCDEFGHJKLMNPQRSTUVWXYZ3789')
+    PERMISSION_CACHE_TIMEOUT = 60 * 60
 
     objects = UserManager()
 
@@ -161,19 +163,21 @@ class User(PermissionsMixin, AbstractBaseUser):
         )
 
     def logged_actions(self):
-        """Returns all log entries that were made about this user."""
+        """Returns all log entries that were made about this user, including
+        archived entries."""
         from pretalx.common.models import ActivityLog
 
-        return ActivityLog.objects.filter(
+        return ActivityLog.history(
             content_type=ContentType.objects.get_for_model(type(self)),
             object_id=self.pk,
         )
 
     def own_actions(self):
-        """Returns all log entries that were made by this user."""
+        """Returns all log entries that were made by this user, including
+        archived entries."""
         from pretalx.common.models import ActivityLog
 
-        return ActivityLog.objects.filter(person=self)
+        return ActivityLog.history(person=self)
 
     def deactivate(self):
         """Delete the user by unsetting all of their information."""
@@ -217,14 +221,7 @@ class User(PermissionsMixin, AbstractBaseUser):
         if self.is_administrator:
             return Event.objects.all()
 
-        return Event.objects.filter(
-            Q(
-                organiser_id__in=self.teams.filter(all_events=True).values_list(
-                    'organiser', flat=True
-                )
-            )
-            | Q(id__in=self.teams.values_list('limit_events__id', flat=True))
-        )
+        return Event.objects.filter(pk__in=list(self.get_permission_matrix()['events']))
 
     def get_events_for_permission(self, **kwargs):
         """Returns a queryset of events for which this user as all of the given permissions.
@@ -235,16 +232,14 @@ class User(PermissionsMixin, AbstractBaseUser):
         if self.is_administrator:
             return Event.objects.all()
 
-        orga_teams = self.teams.filter(**kwargs)
-        absolute = orga_teams.filter(all_events=True).values_list(
-            'organiser', flat=True
-        )
-        relative = orga_teams.filter(all_events=False).values_list(
-            'limit_events', flat=True
-        )
+        required = {key for key, value in kwargs.items() if value}
         return Event.objects.filter(
-            models.Q(organiser__in=absolute) | models.Q(pk__in=relative)
-        ).distinct()
+            pk__in=[
+                event_id
+                for event_id, permissions in self.get_permission_matrix()['events'].items()
+                if required <= permissions['permissions']
+            ]
+        )
 
     def get_permissions_for_event(self, event) -> set:
         """Returns a set of all permission a user has for the given event.
@@ -259,10 +254,163 @@ class User(PermissionsMixin, AbstractBaseUser):
                 'can_change_submissions',
                 'is_reviewer',
             }
-        teams = event.teams.filter(members__in=[self])
-        if not teams:
+        return set(self.get_team_permissions(event)['permissions'])
+
+    def _get_permission_cache(self, key, func):
+        """Returns the cached value for ``key`` if a permission cache was
+        started with :meth:`start_permission_cache`, and calls ``func``
+        otherwise."""
+        cache = getattr(self, '_permission_cache', None)
+        if cache is None:
+            return func()
+        if key not in cache:
+            cache[key] = func()
+        return cache[key]
+
+    def start_permission_cache(self):
+        """Caches the permission data of this user from now on. Call this at
+        the start of a request, so that permission checks of the same
+        request share their database queries."""
+        self._permission_cache = {}
+
+    @staticmethod
+    def get_permission_matrix_key(user_id) -> str:
+        return f'user_permissions_{user_id}'
+
+    def _build_permission_matrix(self) -> dict:
+        from pretalx.event.models import Event, Team
+
+        fields = [
+            field.name
+            for field in Team._meta.fields
+            if field.name.startswith(('can_', 'is_'))
+        ]
+        teams = {}
+        for row in self.teams.values_list(
+            'pk',
+            'organiser_id',
+            'all_events',
+            'limit_tracks',
+            'limit_tracks__event_id',
+            *fields,
+        ):
+            pk, organiser, all_events, track, track_event = row[:5]
+            team = teams.setdefault(
+                pk,
+                {
+                    'organiser': organiser,
+                    'all_events': all_events,
+                    'permissions': {
+                        key for key, value in zip(fields, row[5:]) if value
+                    },
+                    'tracks': defaultdict(set),  # Track ids per event id
+                },
+            )
+            if track:
+                team['tracks'][track_event].add(track)
+
+        event_teams = defaultdict(list)
+        if any(not team['all_events'] for team in teams.values()):
+            for team_id, event_id, organiser in Team.limit_events.through.objects.filter(
+                team__in=[pk for pk, team in teams.items() if not team['all_events']]
+            ).values_list('team_id', 'event_id', 'event__organiser_id'):
+                if teams[team_id]['organiser'] == organiser:
+                    event_teams[event_id].append(teams[team_id])
+        organisers = {team['organiser'] for team in teams.values() if team['all_events']}
+        if organisers:
+            for event_id, organiser in Event.objects.filter(
+                organiser__in=organisers
+            ).values_list('pk', 'organiser_id'):
+                event_teams[event_id] += [
+                    team
+                    for team in teams.values()
+                    if team['all_events'] and team['organiser'] == organiser
+                ]
+
+        events = {}
+        for event_id, event_team_list in event_teams.items():
+            permissions = set().union(*[team['permissions'] for team in event_team_list])
+            reviewer_teams = [
+                team for team in event_team_list if 'is_reviewer' in team['permissions']
+            ]
+            # Track limits only apply to the events the tracks belong to
+            if any(not team['tracks'].get(event_id) for team in reviewer_teams):
+                reviewer_tracks = None
+            else:
+                reviewer_tracks = set().union(
+                    *[team['tracks'][event_id] for team in reviewer_teams]
+                )
+            events[event_id] = {
+                'permissions': permissions,
+                'reviewer_tracks': reviewer_tracks,
+            }
+        organiser_permissions = defaultdict(set)
+        for team in teams.values():
+            organiser_permissions[team['organiser']] |= team['permissions']
+        return {'events': events, 'organisers': dict(organiser_permissions)}
+
+    def get_permission_matrix(self) -> dict:
+        """Returns all permissions this user has through their teams.
+
+        The result is a dictionary with the permissions per event id in
+        ``events``, each containing the set of team ``permissions`` and the
+        ids of the tracks the user may review (``reviewer_tracks``, which is
+        ``None`` if they may review all tracks). ``organisers`` maps organiser
+        ids to the set of permissions the user has in any of the organiser's
+        teams. Administrator permissions are not included.
+
+        The matrix is kept in the cache until the user's teams change."""
+
+        def load():
+            key = self.get_permission_matrix_key(self.pk)
+            matrix = cache.get(key)
+            if matrix is None:
+                matrix = self._build_permission_matrix()
+                cache.set(key, matrix, self.PERMISSION_CACHE_TIMEOUT)
+            return matrix
+
+        return self._get_permission_cache('matrix', load)
+
+    def get_team_permissions(self, event) -> dict:
+        """Returns the permissions this user has for the given event through
+        their teams.
+
+        The result is a dictionary containing whether the user is on any team
+        with access to the event (``has_teams``), the set of team
+        ``permissions``, and the ids of the tracks the user may review
+        (``reviewer_tracks``, which is ``None`` if they may review all tracks).
+        Administrator permissions are not included.
+
+        :type event: :class:`~pretalx.event.models.event.Event`"""
+        permissions = self.get_permission_matrix()['events'].get(event.pk)
+        if not permissions:
+            return {'has_teams': False, 'permissions': set(), 'reviewer_tracks': set()}
+        return dict(has_teams=True, **permissions)
+
+    def get_organiser_permissions(self, organiser) -> set:
+        """Returns the set of permissions this user has in any team of the
+        given organiser. Administrator permissions are not included.
+
+        :type organiser: :class:`~pretalx.event.models.organiser.Organiser`"""
+        if not organiser:
             return set()
-        return set().union(*[team.permission_set for team in teams])
+        return self.get_permission_matrix()['organisers'].get(organiser.pk, set())
+
+    def get_speaker_submissions(self, event) -> dict:
+        """Returns a dictionary mapping the ids of all submissions (including
+        deleted ones) this user is a speaker of in the given event to their
+        state.
+
+        :type event: :class:`~pretalx.event.models.event.Event`"""
+        from pretalx.submission.models import Submission
+
+        def load():
+            return dict(
+                Submission.all_objects.filter(event=event, speakers__in=[self])
+                .values_list('pk', 'state')
+            )
+
+        return self._get_permission_cache(('submissions', event.pk), load)
 
     def remaining_override_votes(self, event) -> int:
         """Returns the amount of override votes a user may still give in reviews in the given event.
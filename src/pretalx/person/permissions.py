@@ -7,7 +7,7 @@ from pretalx.submission.models.submission import SubmissionStates
 def can_change_submissions(user, obj):
     if not user or user.is_anonymous or not obj or not hasattr(obj, 'event'):
         return False
-    return user.is_administrator or obj.event.teams.filter(members__in=[user], can_change_submissions=True).exists()
+    return user.is_administrator or 'can_change_submissions' in user.get_team_permissions(obj.event)['permissions']
 
 
 @rules.predicate
@@ -15,7 +15,7 @@ def is_reviewer(user, obj):
     event = getattr(obj, 'event', None)
     if not user or user.is_anonymous or not obj or not event:
         return False
-    return event.teams.filter(members__in=[user], is_reviewer=True).exists()
+    return 'is_reviewer' in user.get_team_permissions(event)['permissions']
 
 
 @rules.predicate
@@ -25,15 +25,15 @@ def is_administrator(user, obj):
 
 @rules.predicate
 def person_can_view_information(user, obj):
-    event = obj.event
-    submissions = event.submissions.filter(speakers__in=[user])
+    if not user or user.is_anonymous:
+        return False
+    states = set(user.get_speaker_submissions(obj.event).values())
+    states.discard(SubmissionStates.DELETED)
     if obj.include_submitters:
-        return submissions.exists()
+        return bool(states)
     if obj.exclude_unconfirmed:
-        return submissions.filter(state=SubmissionStates.CONFIRMED).exists()
-    return submissions.filter(
-        state__in=[SubmissionStates.CONFIRMED, SubmissionStates.ACCEPTED]
-    ).exists()
+        return SubmissionStates.CONFIRMED in states
+    return bool(states & {SubmissionStates.CONFIRMED, SubmissionStates.ACCEPTED})
 
 
 rules.add_perm('person.is_administrator', is_administrator)
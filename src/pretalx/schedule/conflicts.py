@@ -0,0 +1,173 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db.models.functions import Coalesce
+from django.utils.translation import ugettext_lazy as _
+
+from pretalx.schedule.models.availability import IntervalSet
+from pretalx.submission.models import SubmissionStates
+
+IGNORED_STATES = (
+    SubmissionStates.REJECTED,
+    SubmissionStates.CANCELED,
+    SubmissionStates.WITHDRAWN,
+    SubmissionStates.DELETED,
+)
+
+
+def _find_overlaps(slots):
+    """Takes a list of ``(start, end, pk)`` tuples and returns the set of
+    pks of all slots that overlap with at least one other slot."""
+    result = set()
+    slots = sorted(slots)
+    for index, (start, end, pk) in enumerate(slots):
+        for other_start, _other_end, other_pk in slots[index + 1:]:
+            if other_start >= end:
+                break
+            result.add(pk)
+            result.add(other_pk)
+    return result
+
+
+def get_talk_warnings(schedule, talks=None) -> dict:
+    """Computes the warnings of all given talks (or all talks in the given
+    schedule) at once.
+
+    Room and speaker availabilities, speaker assignments, and the times of
+    all other talks in the schedule are loaded in a fixed number of queries,
+    regardless of the number of talks.
+
+    Returns a dictionary mapping
+    :class:`~pretalx.schedule.models.slot.TalkSlot` primary keys to a list of
+    warnings. Warnings are dictionaries with a ``type`` (``room``,
+    ``room_overlap``, ``speaker`` or ``speaker_overlap``) and a ``message``
+    fit for public display. Speaker warnings additionally contain the
+    ``speaker`` in question.
+    """
+    from pretalx.person.models import User
+    from pretalx.submission.models import Submission
+
+    event = schedule.event
+    if talks is None:
+        talks = schedule.talks.filter(start__isnull=False).select_related(
+            'submission', 'submission__submission_type'
+        )
+    talks = [talk for talk in talks if talk.start]
+    result = {talk.pk: [] for talk in talks}
+    if not talks:
+        return result
+
+    scheduled = schedule.talks.filter(start__isnull=False).exclude(
+        submission__state__in=IGNORED_STATES
+    ).values_list(
+        'pk', 'room_id', 'start', 'end', 'submission_id',
+        Coalesce('submission__duration', 'submission__submission_type__default_duration'),
+    )
+    talk_times = {talk.pk: (talk.start, talk.real_end) for talk in talks}
+    slot_times = {}
+    slot_rooms = {}
+    submission_slots = defaultdict(list)
+    for pk, room_id, start, end, submission_id, duration in scheduled:
+        slot_times[pk] = (start, end or start + timedelta(minutes=duration))
+        slot_rooms[pk] = room_id
+        submission_slots[submission_id].append(pk)
+    slot_times.update(talk_times)
+    slot_rooms.update({talk.pk: talk.room_id for talk in talks})
+
+    room_slots = defaultdict(list)
+    for pk, room_id in slot_rooms.items():
+        if room_id:
+            room_slots[room_id].append(slot_times[pk] + (pk,))
+
+    speakers = defaultdict(list)
+    speaker_slots = defaultdict(list)
+    for talk in talks:
+        if talk.pk not in submission_slots[talk.submission_id]:
+            submission_slots[talk.submission_id].append(talk.pk)
+    for submission_id, user_id in Submission.speakers.through.objects.filter(
+        submission__in=list(submission_slots)
+    ).values_list('submission_id', 'user_id'):
+        speakers[submission_id].append(user_id)
+        for pk in submission_slots[submission_id]:
+            speaker_slots[user_id].append(slot_times[pk] + (pk,))
+    talk_rooms = {talk.room_id for talk in talks if talk.room_id}
+    talk_speakers = {
+        user_id for talk in talks for user_id in speakers[talk.submission_id]
+    }
+
+    room_availabilities = defaultdict(list)
+    for room_id, start, end in event.availabilities.filter(
+        room__in=talk_rooms
+    ).values_list('room_id', 'start', 'end'):
+        room_availabilities[room_id].append((start, end))
+    room_availabilities = {
+        key: IntervalSet(value) for key, value in room_availabilities.items()
+    }
+    speaker_availabilities = defaultdict(list)
+    for user_id, start, end in event.availabilities.filter(
+        person__user__in=talk_speakers
+    ).values_list('person__user_id', 'start', 'end'):
+        speaker_availabilities[user_id].append((start, end))
+    speaker_availabilities = {
+        key: IntervalSet(value) for key, value in speaker_availabilities.items()
+    }
+
+    room_overlaps = set()
+    for room_id in talk_rooms:
+        room_overlaps |= _find_overlaps(room_slots[room_id])
+    speaker_overlaps = {
+        user_id: _find_overlaps(speaker_slots[user_id]) for user_id in talk_speakers
+    }
+    users = User.objects.in_bulk(talk_speakers)
+
+    for talk in talks:
+        warnings = result[talk.pk]
+        start, end = slot_times[talk.pk]
+        if talk.room_id:
+            if not room_availabilities.get(talk.room_id, IntervalSet()).contains(
+                start, end
+            ):
+                warnings.append(
+                    {
+                        'type': 'room',
+                        'message': _(
+                            'The room is not available at the scheduled time.'
+                        ),
+                    }
+                )
+            if talk.pk in room_overlaps:
+                warnings.append(
+                    {
+                        'type': 'room_overlap',
+                        'message': _(
+                            'Another talk is scheduled in the same room at the same time.'
+                        ),
+                    }
+                )
+        for user_id in speakers[talk.submission_id]:
+            speaker = {
+                'name': users[user_id].get_display_name(),
+                'id': user_id,
+            }
+            availability = speaker_availabilities.get(user_id)
+            if availability and not availability.contains(start, end):
+                warnings.append(
+                    {
+                        'type': 'speaker',
+                        'speaker': speaker,
+                        'message': _(
+                            'A speaker is not available at the scheduled time.'
+                        ),
+                    }
+                )
+            if talk.pk in speaker_overlaps[user_id]:
+                warnings.append(
+                    {
+                        'type': 'speaker_overlap',
+                        'speaker': speaker,
+                        'message': _(
+                            'A speaker is giving another talk at the scheduled time.'
+                        ),
+                    }
+                )
+    return result
@@ -1,19 +1,31 @@
+import hashlib
 import json
+from collections import defaultdict
 from datetime import datetime, timedelta
 from urllib.parse import urlparse
 
 import pytz
 import vobject
+from django.db import models
 from django.template.loader import get_template
 from django.utils.functional import cached_property
+from django.utils.translation import get_language, override
 from i18nfield.utils import I18nJSONEncoder
 
 from pretalx import __version__
 from pretalx.common.exporter import BaseExporter
-from pretalx.common.urls import get_base_url
+from pretalx.common.urls import get_base_url, get_url_context
+from pretalx.schedule.models.slot import add_ical_talk
 
 
 class ScheduleData(BaseExporter):
+    """Base class for all exporters working on a schedule.
+
+    All talks, speakers and profiles of the schedule are loaded in a fixed
+    number of queries and made available as plain data in :attr:`data`,
+    and exporters should render from there instead of querying the
+    schedule again."""
+
     def __init__(self, event, schedule=None):
         super().__init__(event)
         self.schedule = schedule
@@ -24,10 +36,96 @@ class ScheduleData(BaseExporter):
             return []
         return {'base_url': self.event.urls.schedule.full()}
 
+    @cached_property
+    def last_modified(self):
+        """The time of the last change to the exported data, if known."""
+        if not self.schedule or getattr(self, 'is_orga', False):
+            return None
+        return self.schedule.last_modified
+
+    @cached_property
+    def fingerprint(self):
+        """A cheap identifier of the exported content, suitable as ETag.
+
+        It is built from the schedule, its version and the content revision
+        of the event, so that the exported data can be identified without
+        rendering it. Exports of unreleased schedules and exports including
+        answers have no fingerprint."""
+        from pretalx.event.revision import get_content_revision
+
+        if (
+            not self.schedule
+            or not self.schedule.version
+            or getattr(self, 'is_orga', False)
+        ):
+            return None
+        value = '-'.join(
+            str(part)
+            for part in (
+                self.identifier,
+                self.schedule.pk,
+                self.schedule.version,
+                get_content_revision(self.event),
+                get_language(),
+            )
+        )
+        return hashlib.sha1(value.encode()).hexdigest()
+
     @cached_property
     def data(self):
         if not self.schedule:
             return []
+        return self.schedule.get_snapshot('data')
+
+    @cached_property
+    def answers(self):
+        """The answers belonging to the talks and speakers in :attr:`data`,
+        grouped by submission ID (``answers['submissions']``) and by speaker
+        ID (``answers['speakers']``).
+
+        Answers are not part of the cached snapshot, as they may contain
+        private data and may change after the schedule release. They are
+        loaded on first access, in two queries regardless of the size of
+        the schedule."""
+        from pretalx.submission.models import Answer
+
+        submission_ids = set()
+        speaker_ids = set()
+        for day in self.data:
+            for room in day['rooms']:
+                for talk in room['talks']:
+                    submission_ids.add(talk['submission']['id'])
+                    speaker_ids.update(
+                        speaker['id'] for speaker in talk['submission']['speakers']
+                    )
+        answers = (
+            Answer.objects.filter(question__event=self.event)
+            .filter(
+                models.Q(submission_id__in=submission_ids)
+                | models.Q(person_id__in=speaker_ids)
+            )
+            .prefetch_related('options')
+        )
+        result = {'submissions': defaultdict(list), 'speakers': defaultdict(list)}
+        for answer in answers:
+            answer_data = {
+                'question': answer.question_id,
+                'answer': answer.answer,
+                'options': [option.answer for option in answer.options.all()],
+            }
+            if answer.submission_id:
+                result['submissions'][answer.submission_id].append(answer_data)
+            if answer.person_id:
+                result['speakers'][answer.person_id].append(answer_data)
+        return result
+
+    def build_data(self) -> list:
+        """Walks the visible talks of the schedule once and returns them as
+        plain data, grouped by day and room.
+
+        The result does not reference any database objects, so that the
+        snapshots of released schedules can be stored in the cache."""
+        from pretalx.person.models import SpeakerProfile
 
         event = self.event
         schedule = self.schedule
@@ -35,10 +133,24 @@ class ScheduleData(BaseExporter):
 
         talks = (
             schedule.talks.filter(is_visible=True)
-            .select_related('submission', 'submission__event', 'submission__submission_type', 'submission__track', 'room')
+            .select_related('submission', 'submission__submission_type', 'submission__track', 'room')
             .prefetch_related('submission__speakers')
             .order_by('start')
         )
+        talks = [talk for talk in talks if talk.start and talk.room]
+        for talk in talks:
+            # Share the event (and its settings cache) between all talks
+            talk.submission.event = event
+        biographies = dict(
+            SpeakerProfile.objects.filter(
+                event=event,
+                user__in={
+                    speaker.pk
+                    for talk in talks
+                    for speaker in talk.submission.speakers.all()
+                },
+            ).values_list('user_id', 'biography')
+        )
         data = {
             current_date.date(): {
                 'index': index + 1,
@@ -57,23 +169,22 @@ class ScheduleData(BaseExporter):
         }
 
         for talk in talks:
-            if not talk.start or not talk.room:
-                continue
             talk_date = talk.start.astimezone(tz).date()
             if talk.start.astimezone(tz).hour < 3 and talk_date != event.date_from:
                 talk_date -= timedelta(days=1)
             day_data = data.get(talk_date)
             if not day_data:
                 continue
+            talk_data = serialize_talk(talk, biographies)
             if str(talk.room.name) not in day_data['rooms']:
                 day_data['rooms'][str(talk.room.name)] = {
                     'id': talk.room.id,
-                    'name': talk.room.name,
+                    'name': str(talk.room.name),
                     'position': talk.room.position,
-                    'talks': [talk],
+                    'talks': [talk_data],
                 }
             else:
-                day_data['rooms'][str(talk.room.name)]['talks'].append(talk)
+                day_data['rooms'][str(talk.room.name)]['talks'].append(talk_data)
             if not day_data['first_start'] or talk.start < day_data['first_start']:
                 day_data['first_start'] = talk.start
             if not day_data['last_end'] or talk.real_end > day_data['last_end']:
@@ -83,7 +194,60 @@ class ScheduleData(BaseExporter):
             d['rooms'] = sorted(
                 d['rooms'].values(), key=lambda room: room['position'] if room['position'] is not None else room['id']
             )
-        return data.values()
+        return list(data.values())
+
+
+def serialize_talk(talk, biographies=None) -> dict:
+    """Returns the plain data of a :class:`~pretalx.schedule.models.slot.TalkSlot`
+    as used in schedule snapshots, exporters and the schedule page."""
+    submission = talk.submission
+    biographies = biographies or dict()
+    speakers = submission.speakers.all()
+    url_context = get_url_context(submission.event)
+    public_url = url_context.url_template(submission.__class__, 'public')
+    image_url = url_context.url_template(submission.__class__, 'image')
+    return {
+        'id': talk.pk,
+        'start': talk.start,
+        'end': talk.end,
+        'real_end': talk.real_end,
+        'duration': talk.duration,
+        'export_duration': talk.export_duration,
+        'pentabarf_export_duration': talk.pentabarf_export_duration,
+        'submission': {
+            'id': submission.pk,
+            'code': submission.code,
+            'uuid': str(submission.uuid),
+            'integer_uuid': submission.integer_uuid,
+            'frab_slug': submission.frab_slug,
+            'title': submission.title,
+            'abstract': submission.abstract,
+            'description': submission.description,
+            'track': {
+                'name': str(submission.track.name),
+                'color': submission.track.color,
+            } if submission.track else None,
+            'submission_type': {'name': str(submission.submission_type.name)},
+            'content_locale': submission.content_locale,
+            'do_not_record': submission.do_not_record,
+            'is_deleted': submission.is_deleted,
+            'urls': {
+                'public': public_url.path(submission),
+                'public_full': public_url.full(submission),
+                'image': image_url.path(submission),
+            },
+            'display_speaker_names': submission.display_speaker_names,
+            'speakers': [
+                {
+                    'id': speaker.pk,
+                    'code': speaker.code,
+                    'name': speaker.get_display_name(),
+                    'biography': biographies.get(speaker.pk) or '',
+                }
+                for speaker in speakers
+            ],
+        },
+    }
 
 
 class FrabXmlExporter(ScheduleData):
@@ -94,16 +258,34 @@ class FrabXmlExporter(ScheduleData):
     icon = 'fa-code'
 
     def render(self, **kwargs):
+        file_name, file_type, chunks = self.render_stream(**kwargs)
+        return file_name, file_type, ''.join(chunks)
+
+    def render_stream(self, **kwargs):
         context = {
-            'data': self.data,
+            'data': [],
             'metadata': self.metadata,
             'schedule': self.schedule,
             'event': self.event,
             'version': __version__,
             'base_url': get_base_url(self.event),
         }
-        content = get_template('agenda/schedule.xml').render(context=context)
-        return f'{self.event.slug}-schedule.xml', 'text/xml', content
+        # The document frame is rendered without any days, which are then
+        # rendered one by one in between.
+        document = get_template('agenda/schedule.xml').render(context=context)
+        head, tail = document.rsplit('</schedule>', 1)
+        day_template = get_template('agenda/schedule_day.xml')
+        data = self.data
+        language = get_language()
+
+        def chunks():
+            with override(language):
+                yield head
+                for day in data:
+                    yield day_template.render(context={**context, 'day': day})
+                yield '</schedule>' + tail
+
+        return f'{self.event.slug}-schedule.xml', 'text/xml', chunks()
 
 
 class FrabXCalExporter(ScheduleData):
@@ -126,10 +308,18 @@ class FrabJsonExporter(ScheduleData):
     icon = '{ }'
 
     def render(self, **kwargs):
+        file_name, file_type, chunks = self.render_stream(**kwargs)
+        return file_name, file_type, ''.join(chunks)
+
+    def render_stream(self, **kwargs):
         tz = pytz.timezone(self.event.timezone)
-        schedule = self.schedule
+        if getattr(self, 'is_orga', False):
+            submission_answers = self.answers['submissions']
+            speaker_answers = self.answers['speakers']
+        else:
+            submission_answers, speaker_answers = dict(), dict()
         content = {
-            'version': schedule.version,
+            'version': self.schedule.version,
             'base_url': self.metadata['base_url'],
             'conference': {
                 'acronym': self.event.slug,
@@ -138,121 +328,102 @@ class FrabJsonExporter(ScheduleData):
                 'end': self.event.date_to.strftime('%Y-%m-%d'),
                 'daysCount': self.event.duration,
                 'timeslot_duration': '00:05',
-                'days': [
-                    {
-                        'index': day['index'],
-                        'date': day['start'].strftime('%Y-%m-%d'),
-                        'day_start': day['start'].astimezone(tz).isoformat(),
-                        'day_end': day['end'].astimezone(tz).isoformat(),
-                        'rooms': {
-                            str(room['name']): [
-                                {
-                                    'id': talk.submission.id,
-                                    'guid': talk.submission.uuid,
-                                    'logo': talk.submission.urls.image,
-                                    'date': talk.start.astimezone(tz).isoformat(),
-                                    'start': talk.start.astimezone(tz).strftime(
-                                        '%H:%M'
-                                    ),
-                                    'duration': talk.export_duration,
-                                    'room': str(room['name']),
-                                    'slug': talk.submission.code,
-                                    'url': talk.submission.urls.public.full(),
-                                    'title': talk.submission.title,
-                                    'subtitle': '',
-                                    'track': str(talk.submission.track.name)
-                                    if talk.submission.track
-                                    else None,
-                                    'type': str(talk.submission.submission_type.name),
-                                    'language': talk.submission.content_locale,
-                                    'abstract': talk.submission.abstract,
-                                    'description': talk.submission.description,
-                                    'recording_license': '',
-                                    'do_not_record': talk.submission.do_not_record,
-                                    'persons': [
-                                        {
-                                            'id': person.id,
-                                            'code': person.code,
-                                            'public_name': person.get_display_name(),
-                                            'biography': getattr(
-                                                person.profiles.filter(
-                                                    event=self.event
-                                                ).first(),
-                                                'biography',
-                                                '',
-                                            ),
-                                            'answers': [
-                                                {
-                                                    'question': answer.question.id,
-                                                    'answer': answer.answer,
-                                                    'options': [
-                                                        option.answer
-                                                        for option in answer.options.all()
-                                                    ],
-                                                }
-                                                for answer in person.answers.all()
-                                            ]
-                                            if getattr(self, 'is_orga', False)
-                                            else [],
-                                        }
-                                        for person in talk.submission.speakers.all()
-                                    ],
-                                    'links': [],
-                                    'attachments': [],
-                                    'answers': [
-                                        {
-                                            'question': answer.question.id,
-                                            'answer': answer.answer,
-                                            'options': [
-                                                option.answer
-                                                for option in answer.options.all()
-                                            ],
-                                        }
-                                        for answer in talk.submission.answers.all()
-                                    ]
-                                    if getattr(self, 'is_orga', False)
-                                    else [],
-                                }
-                                for talk in room['talks']
-                            ]
-                            for room in day['rooms']
-                        },
-                    }
-                    for day in self.data
-                ],
             },
         }
-        return (
-            f'{self.event.slug}.json'.format(self.event.slug),
-            'application/json',
-            json.dumps({'schedule': content}, cls=I18nJSONEncoder),
-        )
+        # The document frame ends with the three closing braces of the
+        # conference, schedule and root objects. The days are inserted
+        # right before them, one by one.
+        document = json.dumps({'schedule': content}, cls=I18nJSONEncoder)
+        head, tail = document[:-3], document[-3:]
+        data = self.data
+        language = get_language()
+
+        def serialize_day(day):
+            return {
+                'index': day['index'],
+                'date': day['start'].strftime('%Y-%m-%d'),
+                'day_start': day['start'].astimezone(tz).isoformat(),
+                'day_end': day['end'].astimezone(tz).isoformat(),
+                'rooms': {
+                    room['name']: [
+                        {
+                            'id': talk['submission']['id'],
+                            'guid': talk['submission']['uuid'],
+                            'logo': talk['submission']['urls']['image'],
+                            'date': talk['start'].astimezone(tz).isoformat(),
+                            'start': talk['start'].astimezone(tz).strftime('%H:%M'),
+                            'duration': talk['export_duration'],
+                            'room': room['name'],
+                            'slug': talk['submission']['code'],
+                            'url': talk['submission']['urls']['public_full'],
+                            'title': talk['submission']['title'],
+                            'subtitle': '',
+                            'track': talk['submission']['track']['name']
+                            if talk['submission']['track']
+                            else None,
+                            'type': talk['submission']['submission_type']['name'],
+                            'language': talk['submission']['content_locale'],
+                            'abstract': talk['submission']['abstract'],
+                            'description': talk['submission']['description'],
+                            'recording_license': '',
+                            'do_not_record': talk['submission']['do_not_record'],
+                            'persons': [
+                                {
+                                    'id': person['id'],
+                                    'code': person['code'],
+                                    'public_name': person['name'],
+                                    'biography': person['biography'],
+                                    'answers': speaker_answers.get(person['id'], []),
+                                }
+                                for person in talk['submission']['speakers']
+                            ],
+                            'links': [],
+                            'attachments': [],
+                            'answers': submission_answers.get(
+                                talk['submission']['id'], []
+                            ),
+                        }
+                        for talk in room['talks']
+                    ]
+                    for room in day['rooms']
+                },
+            }
+
+        def chunks():
+            with override(language):
+                yield head + ', "days": ['
+                for index, day in enumerate(data):
+                    yield (', ' if index else '') + json.dumps(
+                        serialize_day(day), cls=I18nJSONEncoder
+                    )
+                yield ']' + tail
+
+        return f'{self.event.slug}.json', 'application/json', chunks()
 
 
-class ICalExporter(BaseExporter):
+class ICalExporter(ScheduleData):
     identifier = 'schedule.ics'
     verbose_name = 'iCal'
     public = True
     show_qrcode = True
     icon = 'fa-calendar'
 
-    def __init__(self, event, schedule=None):
-        super().__init__(event)
-        self.schedule = schedule
-
     def render(self, **kwargs):
-        netloc = urlparse(get_base_url(self.event)).netloc
+        netloc = get_url_context(self.event).get_base_parts()[1]
         cal = vobject.iCalendar()
         cal.add('prodid').value = '-//pretalx//{}//'.format(netloc)
         creation_time = datetime.now(pytz.utc)
 
-        talks = (
-            self.schedule.talks.filter(is_visible=True)
-            .prefetch_related('submission__speakers')
-            .select_related('submission', 'room', 'submission__event')
-            .order_by('start')
-        )
-        for talk in talks:
-            talk.build_ical(cal, creation_time=creation_time, netloc=netloc)
+        for day in self.data:
+            for room in day['rooms']:
+                for talk in room['talks']:
+                    add_ical_talk(
+                        cal,
+                        self.event,
+                        talk,
+                        room['name'],
+                        creation_time=creation_time,
+                        netloc=netloc,
+                    )
 
         return f'{self.event.slug}.ics', 'text/calendar', cal.serialize()
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.28 on 2026-10-16 20:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedule', '0012_auto_20190303_2358'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='talkslot',
+            name='updated',
+            field=models.DateTimeField(auto_now=True, null=True),
+        ),
+    ]
@@ -1,5 +1,6 @@
+import bisect
 import datetime
-from typing import List
+from typing import Iterable, List, Tuple
 
 from django.db import models
 from django.utils.functional import cached_property
@@ -9,6 +10,87 @@ from pretalx.common.mixins import LogMixin
 zerotime = datetime.time(0, 0)
 
 
+class IntervalSet:
+    """A normalised set of ``(start, end)`` intervals.
+
+    The intervals are kept sorted, and overlapping or adjacent intervals are
+    merged on creation, so that union and intersection of two sets can be
+    computed in a single sweep over both. Intervals with ``start >= end`` are
+    dropped, as they do not cover any time.
+    """
+
+    __slots__ = ('intervals',)
+
+    def __init__(self, intervals: Iterable[Tuple] = ()):
+        result = []
+        for start, end in sorted(
+            (start, end) for start, end in intervals if start < end
+        ):
+            if result and start <= result[-1][1]:
+                if end > result[-1][1]:
+                    result[-1] = (result[-1][0], end)
+            else:
+                result.append((start, end))
+        self.intervals = result
+
+    @classmethod
+    def from_availabilities(cls, availabilities: Iterable['Availability']) -> 'IntervalSet':
+        return cls((availability.start, availability.end) for availability in availabilities)
+
+    def to_availabilities(self) -> List['Availability']:
+        return [Availability(start=start, end=end) for start, end in self.intervals]
+
+    def __iter__(self):
+        return iter(self.intervals)
+
+    def __len__(self) -> int:
+        return len(self.intervals)
+
+    def __bool__(self) -> bool:
+        return bool(self.intervals)
+
+    def __eq__(self, other: 'IntervalSet') -> bool:
+        return isinstance(other, IntervalSet) and self.intervals == other.intervals
+
+    def __repr__(self) -> str:
+        return f'IntervalSet({self.intervals})'
+
+    def __or__(self, other: 'IntervalSet') -> 'IntervalSet':
+        """The union of both sets: ``set1 | set2``."""
+        return IntervalSet(self.intervals + other.intervals)
+
+    def __and__(self, other: 'IntervalSet') -> 'IntervalSet':
+        """The intersection of both sets: ``set1 & set2``."""
+        result = []
+        ours, theirs = self.intervals, other.intervals
+        i = j = 0
+        while i < len(ours) and j < len(theirs):
+            start = max(ours[i][0], theirs[j][0])
+            end = min(ours[i][1], theirs[j][1])
+            if start < end:
+                result.append((start, end))
+            # Continue with the interval that ends later, as it may still
+            # overlap with the next interval of the other set.
+            if ours[i][1] < theirs[j][1]:
+                i += 1
+            else:
+                j += 1
+        intersection = IntervalSet()
+        intersection.intervals = result
+        return intersection
+
+    def contains(self, start, end) -> bool:
+        """Tests if the given interval is completely covered by this set."""
+        index = bisect.bisect_right(self.intervals, (start, end)) - 1
+        # The covering interval is either the last one starting before or
+        # at the same time as the given interval, or the one starting at
+        # exactly the same time and ending later.
+        for candidate in self.intervals[max(index, 0):index + 2]:
+            if candidate[0] <= start and candidate[1] >= end:
+                return True
+        return False
+
+
 class Availability(LogMixin, models.Model):
     """The Availability class models when people or rooms are available for :class:`~pretalx.schedule.models.slot.TalkSlot` objects.
 
@@ -128,55 +210,16 @@ class Availability(LogMixin, models.Model):
     @classmethod
     def union(cls, availabilities: List['Availability']) -> List['Availability']:
         """ Return the minimal list of Availability objects which are covered by at least one given Availability """
-        if not availabilities:
-            return []
-
-        availabilities = sorted(availabilities, key=lambda a: a.start)
-        result = [availabilities[0]]
-        availabilities = availabilities[1:]
-
-        for avail in availabilities:
-            if avail.overlaps(result[-1], False):
-                result[-1] = result[-1].merge_with(avail)
-            else:
-                result.append(avail)
-
-        return result
-
-    @classmethod
-    def _pair_intersection(
-        cls,
-        availabilities_a: List['Availability'],
-        availabilities_b: List['Availability'],
-    ) -> List['Availability']:
-        """ return the list of Availabilities, which are covered by each of the given sets """
-        result = []
-
-        # yay for O(b*a) time! I am sure there is some fancy trick to make this faster,
-        # but we're dealing with less than 100 items in total, sooo.. ¯\_(ツ)_/¯
-        for a in availabilities_a:
-            for b in availabilities_b:
-                if a.overlaps(b, True):
-                    result.append(a.intersect_with(b))
-
-        return result
+        return IntervalSet.from_availabilities(availabilities).to_availabilities()
 
     @classmethod
     def intersection(
         cls, *availabilitysets: List['Availability']
     ) -> List['Availability']:
         """ Return the list of Availabilities which are covered by all of the given sets """
-
-        # get rid of any overlaps and unmerged ranges in each set
-        availabilitysets = [cls.union(avialset) for avialset in availabilitysets]
-        # bail out for obvious cases (there are no sets given, one of the sets is empty)
         if not availabilitysets:
             return []
-        if not all(availabilitysets):
-            return []
-        # start with the very first set ...
-        result = availabilitysets[0]
+        result = IntervalSet.from_availabilities(availabilitysets[0])
         for availset in availabilitysets[1:]:
-            # ... subtract each of the other sets
-            result = cls._pair_intersection(result, availset)
-        return result
+            result &= IntervalSet.from_availabilities(availset)
+        return result.to_availabilities()
@@ -3,19 +3,25 @@ from contextlib import suppress
 from urllib.parse import quote
 
 import pytz
-from django.db import models, transaction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, models, transaction
 from django.template.loader import get_template
 from django.utils.functional import cached_property
 from django.utils.timezone import now, override as tzoverride
-from django.utils.translation import override, ugettext_lazy as _
+from django.utils.translation import get_language, override, ugettext_lazy as _
 
 from pretalx.agenda.tasks import export_schedule_html
 from pretalx.common.mixins import LogMixin
 from pretalx.common.urls import EventUrls
 from pretalx.mail.context import template_context_from_event
-from pretalx.person.models import User
 from pretalx.submission.models import SubmissionStates
 
+SNAPSHOT_PARTS = ('data', 'api')
+SNAPSHOT_TIMEOUT = 60 * 60
+NOTIFICATION_BATCH_SIZE = 100
+RELEASE_STATUS_TIMEOUT = 60 * 60 * 24
+
 
 class Schedule(LogMixin, models.Model):
     """
@@ -41,7 +47,9 @@ class Schedule(LogMixin, models.Model):
         public = '{self.event.urls.schedule}v/{self.url_version}/'
 
     @transaction.atomic
-    def freeze(self, name: str, user=None, notify_speakers: bool=True):
+    def freeze(
+        self, name: str, user=None, notify_speakers: bool=True, background: bool=False
+    ):
         """Releases the current WIP schedule as a fixed schedule version.
 
         :param name: The new schedule name. May not be in use in this event,
@@ -50,10 +58,12 @@ class Schedule(LogMixin, models.Model):
             the freeze.
         :param notify_speakers: Should notification emails for speakers with
             changed slots be generated?
+        :param background: Generate the notifications, the cached snapshots
+            and the HTML export in a chain of background tasks once the release
+            has been committed, instead of during this call. Their progress is
+            reported in ``release_status``.
         :rtype: Schedule
         """
-        from pretalx.schedule.models import TalkSlot
-
         if name in ['wip', 'latest']:
             raise Exception(f'Cannot use reserved name "{name}" for schedule version.')
         if self.version:
@@ -80,52 +90,156 @@ class Schedule(LogMixin, models.Model):
             start__isnull=False, submission__state=SubmissionStates.CONFIRMED
         ).update(is_visible=False)
 
-        talks = []
-        for talk in self.talks.select_related('submission', 'room').all():
-            talks.append(talk.copy_to_schedule(wip_schedule, save=False))
-        TalkSlot.objects.bulk_create(talks)
+        self.talks.all().copy_to_schedule(wip_schedule)
 
-        if notify_speakers:
-            self.notify_speakers()
+        export_html = self.event.settings.export_html_on_schedule_release
+        if background:
+            self.set_release_status('pending')
+            transaction.on_commit(
+                lambda: self.start_release_tasks(
+                    notify_speakers=notify_speakers, export_html=export_html
+                )
+            )
+        else:
+            if notify_speakers:
+                self.notify_speakers()
+            if settings.REAL_CACHE_USED:
+                transaction.on_commit(self.store_snapshots)
 
         with suppress(AttributeError):
             del wip_schedule.event.wip_schedule
         with suppress(AttributeError):
             del wip_schedule.event.current_schedule
 
-        if self.event.settings.export_html_on_schedule_release:
+        if export_html and not background:
             export_schedule_html.apply_async(kwargs={'event_id': self.event.id})
 
         return self, wip_schedule
 
+    def start_release_tasks(self, notify_speakers: bool=True, export_html: bool=False):
+        """Starts the background task chain of a schedule release."""
+        from celery import chain
+        from pretalx.schedule.tasks import (
+            task_fail_release, task_finish_release, task_notify_speakers,
+            task_store_snapshots,
+        )
+
+        tasks = []
+        if settings.REAL_CACHE_USED:
+            tasks.append(task_store_snapshots.si(schedule_id=self.pk))
+        if notify_speakers:
+            tasks.append(task_notify_speakers.si(schedule_id=self.pk))
+        if export_html:
+            tasks.append(export_schedule_html.si(event_id=self.event.pk))
+        tasks.append(task_finish_release.si(schedule_id=self.pk))
+        chain(*tasks).on_error(task_fail_release.si(schedule_id=self.pk)).apply_async()
+
+    def _get_release_status_key(self) -> str:
+        return f'schedule_release_status_{self.pk}'
+
+    @property
+    def release_status(self):
+        """The status of the background tasks of this schedule's release.
+
+        A dictionary with the ``state`` (``pending``, ``running``, ``done``
+        or ``failed``), and the number of notifications ``done`` out of their
+        ``total``, or ``None`` if no background tasks were run."""
+        return cache.get(self._get_release_status_key())
+
+    def set_release_status(self, state: str, done: int=0, total: int=0):
+        cache.set(
+            self._get_release_status_key(),
+            {'state': state, 'done': done, 'total': total},
+            RELEASE_STATUS_TIMEOUT,
+        )
+
     @transaction.atomic
     def unfreeze(self, user=None):
         """Resets the current WIP schedule to an older schedule version."""
-        from pretalx.schedule.models import TalkSlot
-
         if not self.version:
             raise Exception('Cannot unfreeze schedule version: not released yet.')
 
-        # collect all talks, which have been added since this schedule (#72)
-        submission_ids = self.talks.all().values_list('submission_id', flat=True)
-        talks = self.event.wip_schedule.talks.exclude(
-            submission_id__in=submission_ids
-        ).union(self.talks.all())
-
+        old_wip_schedule = self.event.wip_schedule
         wip_schedule = Schedule.objects.create(event=self.event)
-        new_talks = []
-        for talk in talks:
-            new_talks.append(talk.copy_to_schedule(wip_schedule, save=False))
-        TalkSlot.objects.bulk_create(new_talks)
+        # keep all talks which have been added since this schedule (#72)
+        old_wip_schedule.talks.exclude(
+            submission_id__in=self.talks.all().values('submission_id')
+        ).copy_to_schedule(wip_schedule)
+        self.talks.all().copy_to_schedule(wip_schedule)
 
-        self.event.wip_schedule.talks.all().delete()
-        self.event.wip_schedule.delete()
+        old_wip_schedule.talks.all().delete()
+        old_wip_schedule.delete()
 
         with suppress(AttributeError):
             del wip_schedule.event.wip_schedule
 
         return self, wip_schedule
 
+    def _get_snapshot_cache_key(self, part: str, locale: str=None) -> str:
+        from pretalx.event.revision import get_revision_cache_key
+
+        return get_revision_cache_key(
+            self.event, 'schedule_snapshot', self.pk, locale or get_language(), part
+        )
+
+    def build_snapshot(self, part: str):
+        """Builds the plain data of the given snapshot part.
+
+        ``data`` contains the day/room/talk structure used by the schedule
+        page and the frab exporters, ``api`` contains the API representation
+        of this schedule."""
+        if part == 'data':
+            from pretalx.schedule.exporters import ScheduleData
+
+            return ScheduleData(event=self.event, schedule=self).build_data()
+        if part == 'api':
+            from pretalx.api.serializers.submission import ScheduleSerializer
+
+            return ScheduleSerializer(self).data
+        raise Exception(f'Unknown schedule snapshot part "{part}".')
+
+    def get_snapshot(self, part: str='data'):
+        """Returns a snapshot of this schedule in the current locale.
+
+        Released schedules do not change, so their snapshots are built once
+        and then served from the cache. Snapshots of the WIP schedule are
+        built on every call."""
+        if not self.version:
+            return self.build_snapshot(part)
+        key = self._get_snapshot_cache_key(part)
+        snapshot = cache.get(key)
+        if snapshot is None:
+            snapshot = self.build_snapshot(part)
+            cache.set(key, snapshot, SNAPSHOT_TIMEOUT)
+        return snapshot
+
+    def store_snapshots(self):
+        """Builds and caches all snapshots of this schedule for all event locales."""
+        for locale in self.event.locales:
+            with override(locale):
+                for part in SNAPSHOT_PARTS:
+                    cache.set(
+                        self._get_snapshot_cache_key(part, locale),
+                        self.build_snapshot(part),
+                        SNAPSHOT_TIMEOUT,
+                    )
+
+    @cached_property
+    def last_modified(self):
+        """Returns the time of the latest change to this schedule, its talks,
+        or their submissions, or ``None`` for unreleased schedules."""
+        if not self.version:
+            return None
+        result = self.talks.aggregate(
+            slot=models.Max('updated'), submission=models.Max('submission__updated')
+        )
+        values = [
+            value
+            for value in (self.published, result['slot'], result['submission'])
+            if value
+        ]
+        return max(values) if values else None
+
     @cached_property
     def scheduled_talks(self):
         """Returns all :class:`~pretalx.schedule.models.slot.TalkSlot` objects that have been scheduled."""
@@ -152,39 +266,61 @@ class Schedule(LogMixin, models.Model):
             queryset = queryset.filter(published__lt=self.published)
         return queryset.order_by('-published').first()
 
-    def _handle_submission_move(self, submission_pk, old_slots, new_slots):
-        new = []
-        canceled = []
-        moved = []
-        all_old_slots = list(old_slots.filter(submission__pk=submission_pk))
-        all_new_slots = list(new_slots.filter(submission__pk=submission_pk))
-        old_slots = [slot for slot in all_old_slots if not any(slot.is_same_slot(other_slot) for other_slot in all_new_slots)]
-        new_slots = [slot for slot in all_new_slots if not any(slot.is_same_slot(other_slot) for other_slot in all_old_slots)]
-        diff = len(old_slots) - len(new_slots)
-        if diff > 0:
-            canceled = old_slots[:diff]
-            old_slots = old_slots[diff:]
-        elif diff < 0:
-            diff = -diff
-            new = new_slots[:diff]
-            new_slots = new_slots[diff:]
-        for move in zip(old_slots, new_slots):
-            old_slot = move[0]
-            new_slot = move[1]
-            moved.append({
-                'submission': new_slot.submission,
-                'old_start': old_slot.start.astimezone(self.tz),
-                'new_start': new_slot.start.astimezone(self.tz),
-                'old_room': old_slot.room.name,
-                'new_room': new_slot.room.name,
-                'new_info': new_slot.room.speaker_info,
-            })
-        return new, canceled, moved
-
     @cached_property
     def tz(self):
         return pytz.timezone(self.event.timezone)
 
+    def _get_slot_diff(self, previous_schedule) -> dict:
+        """Compares the scheduled talks of this schedule and the given one.
+
+        Returns a dictionary with ``new_talks`` and ``canceled_talks`` lists
+        of :class:`~pretalx.schedule.models.slot.TalkSlot` primary keys, and a
+        ``moved_talks`` list of ``(old_pk, new_pk)`` tuples. Both schedules
+        are loaded in one query each, and compared per submission."""
+        old_slots = defaultdict(list)
+        new_slots = defaultdict(list)
+        for schedule, slots in ((previous_schedule, old_slots), (self, new_slots)):
+            for pk, submission_id, room_id, start in schedule.scheduled_talks.order_by(
+                'pk'
+            ).values_list('pk', 'submission_id', 'room_id', 'start'):
+                slots[submission_id].append((pk, room_id, start))
+
+        result = {'new_talks': [], 'canceled_talks': [], 'moved_talks': []}
+        for submission_id in sorted(old_slots.keys() | new_slots.keys()):
+            old = old_slots.get(submission_id, [])
+            new = new_slots.get(submission_id, [])
+            old_positions = {(room_id, start) for _, room_id, start in old}
+            new_positions = {(room_id, start) for _, room_id, start in new}
+            old = [pk for pk, room_id, start in old if (room_id, start) not in new_positions]
+            new = [pk for pk, room_id, start in new if (room_id, start) not in old_positions]
+            diff = len(old) - len(new)
+            if diff > 0:
+                result['canceled_talks'] += old[:diff]
+                old = old[diff:]
+            elif diff < 0:
+                result['new_talks'] += new[:-diff]
+                new = new[-diff:]
+            result['moved_talks'] += list(zip(old, new))
+        return result
+
+    def get_slot_diff(self, previous_schedule) -> dict:
+        """Returns the result of ``_get_slot_diff``. The slots of released
+        schedules do not change, so the diff between two released schedules
+        is cached until the content of the event changes, as the diff leaves
+        out deleted submissions."""
+        from pretalx.event.revision import get_revision_cache_key
+
+        if not self.version or not previous_schedule.version:
+            return self._get_slot_diff(previous_schedule)
+        key = get_revision_cache_key(
+            self.event, 'schedule_changes', previous_schedule.pk, self.pk
+        )
+        diff = cache.get(key)
+        if diff is None:
+            diff = self._get_slot_diff(previous_schedule)
+            cache.set(key, diff, SNAPSHOT_TIMEOUT)
+        return diff
+
     @cached_property
     def changes(self) -> dict:
         """Returns a dictionary of changes when compared to the previous version.
@@ -192,6 +328,8 @@ class Schedule(LogMixin, models.Model):
         The ``action`` field is either ``create`` or ``update``. If it's an
         update, the ``count`` integer, and the ``new_talks``,
         ``canceled_talks`` and ``moved_talks`` lists are also present."""
+        from pretalx.schedule.models import TalkSlot
+
         result = {
             'count': 0,
             'action': 'update',
@@ -203,40 +341,27 @@ class Schedule(LogMixin, models.Model):
             result['action'] = 'create'
             return result
 
-        old_slots = self.previous_schedule.scheduled_talks
-        new_slots = self.scheduled_talks
-        old_slot_set = set(old_slots.values_list('submission', 'room', 'start', named=True))
-        new_slot_set = set(new_slots.values_list('submission', 'room', 'start', named=True))
-        old_submissions = set(old_slots.values_list('submission__id', flat=True))
-        new_submissions = set(new_slots.values_list('submission__id', flat=True))
-        handled_submissions = set()
-
-        moved_or_missing = old_slot_set - new_slot_set
-        moved_or_new = new_slot_set - old_slot_set
-
-        for entry in moved_or_missing:
-            if entry.submission in handled_submissions:
-                continue
-            if entry.submission not in new_submissions:
-                result['canceled_talks'] += list(old_slots.filter(submission__pk=entry.submission))
-            else:
-                new, canceled, moved = self._handle_submission_move(entry.submission, old_slots, new_slots)
-                result['new_talks'] += new
-                result['canceled_talks'] += canceled
-                result['moved_talks'] += moved
-            handled_submissions.add(entry.submission)
-        for entry in moved_or_new:
-            if entry.submission in handled_submissions:
-                continue
-            if entry.submission not in old_submissions:
-                result['new_talks'] += list(new_slots.filter(submission__pk=entry.submission))
-            else:
-                new, canceled, moved = self._handle_submission_move(entry.submission, old_slots, new_slots)
-                result['new_talks'] += new
-                result['canceled_talks'] += canceled
-                result['moved_talks'] += moved
-            handled_submissions.add(entry.submission)
-
+        diff = self.get_slot_diff(self.previous_schedule)
+        slots = TalkSlot.objects.filter(
+            pk__in=diff['new_talks']
+            + diff['canceled_talks']
+            + [pk for move in diff['moved_talks'] for pk in move]
+        ).select_related(
+            'submission', 'submission__event', 'room'
+        ).prefetch_related('submission__speakers').in_bulk()
+        result['new_talks'] = [slots[pk] for pk in diff['new_talks']]
+        result['canceled_talks'] = [slots[pk] for pk in diff['canceled_talks']]
+        for old_pk, new_pk in diff['moved_talks']:
+            old_slot = slots[old_pk]
+            new_slot = slots[new_pk]
+            result['moved_talks'].append({
+                'submission': new_slot.submission,
+                'old_start': old_slot.start.astimezone(self.tz),
+                'new_start': new_slot.start.astimezone(self.tz),
+                'old_room': old_slot.room.name,
+                'new_room': new_slot.room.name,
+                'new_info': new_slot.room.speaker_info,
+            })
         result['count'] = (
             len(result['new_talks'])
             + len(result['canceled_talks'])
@@ -248,26 +373,37 @@ class Schedule(LogMixin, models.Model):
     def warnings(self) -> dict:
         """A dictionary of warnings to be acknowledged pre-release.
 
-        ``talk_warnings`` contains a list of talk-related warnings.
+        ``talk_warnings`` contains the list of talks with warnings (see
+        :func:`~pretalx.schedule.conflicts.get_talk_warnings`),
         ``unscheduled`` is the list of talks without a scheduled slot,
         ``unconfirmed`` is the list of submissions that will not be visible due
         to their unconfirmed status, and ``no_track`` are submissions without a
         track in a conference that uses tracks.
         """
+        from pretalx.schedule.conflicts import get_talk_warnings
+
         warnings = {
             'talk_warnings': [],
             'unscheduled': [],
             'unconfirmed': [],
             'no_track': [],
         }
-        for talk in self.talks.all():
+        talks = list(
+            self.talks.all().select_related(
+                'submission', 'submission__submission_type', 'submission__track'
+            )
+        )
+        talk_warnings = get_talk_warnings(self, talks=talks)
+        use_tracks = self.event.settings.use_tracks
+        for talk in talks:
             if not talk.start:
                 warnings['unscheduled'].append(talk)
-            elif talk.warnings:
+            elif talk_warnings[talk.pk]:
+                talk.warnings = talk_warnings[talk.pk]
                 warnings['talk_warnings'].append(talk)
             if talk.submission.state != SubmissionStates.CONFIRMED:
                 warnings['unconfirmed'].append(talk)
-            if talk.submission.event.settings.use_tracks and not talk.submission.track:
+            if use_tracks and not talk.submission.track:
                 warnings['no_track'].append(talk)
         return warnings
 
@@ -278,19 +414,18 @@ class Schedule(LogMixin, models.Model):
         Each speaker is assigned a dictionary with ``create`` and ``update``
         fields, each containing a list of submissions.
         """
+        speakers = defaultdict(lambda: {'create': [], 'update': []})
         if self.changes['action'] == 'create':
-            return {
-                speaker: {
-                    'create': self.talks.filter(submission__speakers=speaker),
-                    'update': [],
-                }
-                for speaker in User.objects.filter(submissions__slots__schedule=self)
-            }
+            for talk in self.talks.select_related('submission', 'room').prefetch_related(
+                'submission__speakers'
+            ):
+                for speaker in talk.submission.speakers.all():
+                    speakers[speaker]['create'].append(talk)
+            return speakers
 
         if self.changes['count'] == len(self.changes['canceled_talks']):
             return []
 
-        speakers = defaultdict(lambda: {'create': [], 'update': []})
         for new_talk in self.changes['new_talks']:
             for speaker in new_talk.submission.speakers.all():
                 speakers[speaker]['create'].append(new_talk)
@@ -299,28 +434,57 @@ class Schedule(LogMixin, models.Model):
                 speakers[speaker]['update'].append(moved_talk)
         return speakers
 
-    @cached_property
-    def notifications(self):
-        """A list of unsaved :class:`~pretalx.mail.models.QueuedMail` objects to be sent on schedule release."""
+    def _build_notifications(self, speakers) -> list:
+        template = get_template('schedule/speaker_notification.txt')
+        mail_template = self.event.update_template
+        event_context = template_context_from_event(self.event)
         mails = []
-        for speaker in self.speakers_concerned:
+        for speaker in speakers:
             with override(speaker.locale), tzoverride(self.tz):
-                notifications = get_template(
-                    'schedule/speaker_notification.txt'
-                ).render({'speaker': speaker, **self.speakers_concerned[speaker]})
-            context = template_context_from_event(self.event)
-            context['notifications'] = notifications
+                notifications = template.render(
+                    {'speaker': speaker, **self.speakers_concerned[speaker]}
+                )
+            context = dict(event_context, notifications=notifications)
             mails.append(
-                self.event.update_template.to_mail(
+                mail_template.to_mail(
                     user=speaker, event=self.event, context=context, commit=False
                 )
             )
         return mails
 
-    def notify_speakers(self):
-        """Save the ``notifications`` :class:`~pretalx.mail.models.QueuedMail` objects to the outbox."""
-        for notification in self.notifications:
-            notification.save()
+    @cached_property
+    def notifications(self):
+        """A list of unsaved :class:`~pretalx.mail.models.QueuedMail` objects to be sent on schedule release."""
+        return self._build_notifications(self.speakers_concerned)
+
+    def notify_speakers(self, progress=None):
+        """Save the ``notifications`` :class:`~pretalx.mail.models.QueuedMail` objects to the outbox.
+
+        The mails are built and saved in batches of ``NOTIFICATION_BATCH_SIZE``.
+
+        :param progress: Called with the number of saved mails and the total
+            number of mails after each batch.
+        """
+        from pretalx.mail.models import QueuedMail
+
+        speakers = list(self.speakers_concerned)
+        total = len(speakers)
+        for offset in range(0, total, NOTIFICATION_BATCH_SIZE):
+            batch = speakers[offset:offset + NOTIFICATION_BATCH_SIZE]
+            mails = self._build_notifications(batch)
+            if connection.features.can_return_ids_from_bulk_insert:
+                QueuedMail.objects.bulk_create(mails)
+            else:
+                for mail in mails:
+                    mail.save()
+            QueuedMail.to_users.through.objects.bulk_create(
+                [
+                    QueuedMail.to_users.through(queuedmail_id=mail.pk, user_id=speaker.pk)
+                    for mail, speaker in zip(mails, batch)
+                ]
+            )
+            if progress:
+                progress(offset + len(batch), total)
 
     @cached_property
     def url_version(self):
@@ -1,13 +1,72 @@
 from datetime import datetime, timedelta
-from urllib.parse import urlparse
 
 import pytz
-from django.db import models
+from django.core.exceptions import EmptyResultSet
+from django.db import connections, models
 from django.utils.functional import cached_property
-from django.utils.translation import ugettext_lazy as _
+from django.utils.timezone import now
 
 from pretalx.common.mixins import LogMixin
-from pretalx.common.urls import get_base_url
+from pretalx.common.urls import get_url_context
+
+INSERT_SELECT_VENDORS = ('postgresql', 'sqlite', 'mysql')
+COPY_BATCH_SIZE = 1000
+
+
+class TalkSlotQuerySet(models.QuerySet):
+    def copy_to_schedule(self, schedule) -> int:
+        """Copies all slots of this queryset to the given
+        :class:`~pretalx.schedule.models.schedule.Schedule` and returns the
+        number of new slots.
+
+        The copy is a single ``INSERT ... SELECT`` statement, so no slot is
+        loaded into Python. Database backends that are not known to support
+        it fall back to streaming the slot values into batched inserts."""
+        fields = [
+            field
+            for field in self.model._meta.concrete_fields
+            if field.name not in ('id', 'schedule', 'updated')
+        ]
+        queryset = self.order_by().values_list(*[field.attname for field in fields])
+        connection = connections[self.db]
+        if connection.vendor not in INSERT_SELECT_VENDORS:
+            return self._copy_in_batches(queryset, fields, schedule)
+
+        queryset = queryset.annotate(
+            copy_schedule=models.Value(schedule.pk, output_field=models.IntegerField()),
+            copy_updated=models.Value(now(), output_field=models.DateTimeField()),
+        ).values_list(*[field.attname for field in fields], 'copy_schedule', 'copy_updated')
+        try:
+            sql, params = queryset.query.get_compiler(using=self.db).as_sql()
+        except EmptyResultSet:
+            return 0
+        columns = [field.column for field in fields] + [
+            self.model._meta.get_field('schedule').column,
+            self.model._meta.get_field('updated').column,
+        ]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'INSERT INTO {table} ({columns}) {select}'.format(
+                    table=connection.ops.quote_name(self.model._meta.db_table),
+                    columns=', '.join(connection.ops.quote_name(c) for c in columns),
+                    select=sql,
+                ),
+                params,
+            )
+            return cursor.rowcount
+
+    def _copy_in_batches(self, queryset, fields, schedule) -> int:
+        names = [field.attname for field in fields]
+        count = 0
+        batch = []
+        for row in queryset.iterator(chunk_size=COPY_BATCH_SIZE):
+            batch.append(self.model(schedule=schedule, **dict(zip(names, row))))
+            if len(batch) >= COPY_BATCH_SIZE:
+                count += len(self.model.objects.using(self.db).bulk_create(batch))
+                batch = []
+        if batch:
+            count += len(self.model.objects.using(self.db).bulk_create(batch))
+        return count
 
 
 class TalkSlot(LogMixin, models.Model):
@@ -33,6 +92,9 @@ class TalkSlot(LogMixin, models.Model):
     is_visible = models.BooleanField(default=False)
     start = models.DateTimeField(null=True)
     end = models.DateTimeField(null=True)
+    updated = models.DateTimeField(null=True, auto_now=True)
+
+    objects = TalkSlotQuerySet.as_manager()
 
     def __str__(self):
         """Help when debugging."""
@@ -83,46 +145,17 @@ class TalkSlot(LogMixin, models.Model):
     def warnings(self) -> list:
         """A list of warnings that apply to this slot.
 
-        Warnings are dictionaries with a ``type`` (``room`` or ``speaker``, for
-        now) and a ``message`` fit for public display.  This property only
-        shows availability based warnings.
+        Warnings are dictionaries with a ``type`` (``room``,
+        ``room_overlap``, ``speaker`` or ``speaker_overlap``) and a
+        ``message`` fit for public display. To compute the warnings of many
+        slots, use :func:`~pretalx.schedule.conflicts.get_talk_warnings`
+        instead.
         """
+        from pretalx.schedule.conflicts import get_talk_warnings
+
         if not self.start:
             return []
-        warnings = []
-        availability = self.as_availability
-        if self.room:
-            if not any(
-                room_availability.contains(availability)
-                for room_availability in self.room.availabilities.all()
-            ):
-                warnings.append(
-                    {
-                        'type': 'room',
-                        'message': _(
-                            'The room is not available at the scheduled time.'
-                        ),
-                    }
-                )
-        for speaker in self.submission.speakers.all():
-            profile = speaker.event_profile(event=self.submission.event)
-            if profile.availabilities.exists() and not any(
-                speaker_availability.contains(availability)
-                for speaker_availability in profile.availabilities.all()
-            ):
-                warnings.append(
-                    {
-                        'type': 'speaker',
-                        'speaker': {
-                            'name': speaker.get_display_name(),
-                            'id': speaker.pk,
-                        },
-                        'message': _(
-                            'A speaker is not available at the scheduled time.'
-                        ),
-                    }
-                )
-        return warnings
+        return get_talk_warnings(self.schedule, talks=[self])[self.pk]
 
     def copy_to_schedule(self, new_schedule, save=True):
         """Create a new slot for the given :class:`~pretalx.schedule.models.schedule.Schedule` with all other fields identical to this one."""
@@ -142,21 +175,55 @@ class TalkSlot(LogMixin, models.Model):
     def build_ical(self, calendar, creation_time=None, netloc=None):
         if not self.start or not self.end or not self.room:
             return
-        creation_time = creation_time or datetime.now(pytz.utc)
-        netloc = netloc or urlparse(get_base_url(self.event)).netloc
-        tz = pytz.timezone(self.submission.event.timezone)
-
-        vevent = calendar.add('vevent')
-        vevent.add(
-            'summary'
-        ).value = f'{self.submission.title} - {self.submission.display_speaker_names}'
-        vevent.add('dtstamp').value = creation_time
-        vevent.add('location').value = str(self.room.name)
-        vevent.add('uid').value = 'pretalx-{}-{}@{}'.format(
-            self.submission.event.slug, self.submission.code, netloc
+        url_context = get_url_context(self.event)
+        talk = {
+            'start': self.start,
+            'end': self.end,
+            'submission': {
+                'code': self.submission.code,
+                'title': self.submission.title,
+                'display_speaker_names': self.submission.display_speaker_names,
+                'abstract': self.submission.abstract,
+                'urls': {
+                    'public_full': url_context.url_template(
+                        self.submission.__class__, 'public'
+                    ).full(self.submission)
+                },
+            },
+        }
+        add_ical_talk(
+            calendar,
+            self.event,
+            talk,
+            self.room.name,
+            creation_time=creation_time,
+            netloc=netloc or url_context.get_base_parts()[1],
         )
 
-        vevent.add('dtstart').value = self.start.astimezone(tz)
-        vevent.add('dtend').value = self.end.astimezone(tz)
-        vevent.add('description').value = self.submission.abstract or ""
-        vevent.add('url').value = self.submission.urls.public.full()
+
+def add_ical_talk(calendar, event, talk, room_name, creation_time=None, netloc=None):
+    """Adds a talk to the iCal ``calendar``. ``talk`` is a talk in the
+    format of the schedule snapshots, see
+    :class:`~pretalx.schedule.exporters.ScheduleData`, and only needs the
+    ``start`` and ``end`` of the talk, and the ``code``, ``title``,
+    ``display_speaker_names``, ``abstract`` and public URL of its
+    submission."""
+    creation_time = creation_time or datetime.now(pytz.utc)
+    netloc = netloc or get_url_context(event).get_base_parts()[1]
+    tz = pytz.timezone(event.timezone)
+    submission = talk['submission']
+
+    vevent = calendar.add('vevent')
+    vevent.add(
+        'summary'
+    ).value = f'{submission["title"]} - {submission["display_speaker_names"]}'
+    vevent.add('dtstamp').value = creation_time
+    vevent.add('location').value = str(room_name)
+    vevent.add('uid').value = 'pretalx-{}-{}@{}'.format(
+        event.slug, submission['code'], netloc
+    )
+
+    vevent.add('dtstart').value = talk['start'].astimezone(tz)
+    vevent.add('dtend').value = talk['end'].astimezone(tz)
+    vevent.add('description').value = submission['abstract'] or ''
+    vevent.add('url').value = submission['urls']['public_full']
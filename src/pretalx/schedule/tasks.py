@@ -0,0 +1,51 @@
+import logging
+
+from pretalx.celery_app import app
+from pretalx.schedule.models import Schedule
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _get_schedule(schedule_id: int, task_name: str):
+    schedule = Schedule.objects.select_related('event').filter(pk=schedule_id).first()
+    if not schedule:
+        LOGGER.error(f'In {task_name}: Could not find Schedule ID {schedule_id}')
+    return schedule
+
+
+@app.task()
+def task_store_snapshots(*, schedule_id: int):
+    schedule = _get_schedule(schedule_id, 'task_store_snapshots')
+    if schedule:
+        schedule.store_snapshots()
+
+
+@app.task()
+def task_notify_speakers(*, schedule_id: int):
+    schedule = _get_schedule(schedule_id, 'task_notify_speakers')
+    if not schedule:
+        return
+    schedule.set_release_status('running')
+    schedule.notify_speakers(
+        progress=lambda done, total: schedule.set_release_status('running', done, total)
+    )
+
+
+@app.task()
+def task_finish_release(*, schedule_id: int):
+    schedule = _get_schedule(schedule_id, 'task_finish_release')
+    if schedule:
+        status = schedule.release_status or {}
+        schedule.set_release_status(
+            'done', status.get('done', 0), status.get('total', 0)
+        )
+
+
+@app.task()
+def task_fail_release(*, schedule_id: int):
+    schedule = _get_schedule(schedule_id, 'task_fail_release')
+    if schedule:
+        status = schedule.release_status or {}
+        schedule.set_release_status(
+            'failed', status.get('done', 0), status.get('total', 0)
+        )
@@ -227,6 +227,8 @@ if ADMINS:
 
 ## EMAIL SETTINGS
 MAIL_FROM = SERVER_EMAIL = DEFAULT_FROM_EMAIL = config.get('mail', 'from')
+MAIL_BATCH_SIZE = config.getint('mail', 'batch_size')
+MAIL_RATE_LIMIT = config.getfloat('mail', 'rate_limit')
 if DEBUG:
     EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 else:
@@ -284,6 +286,7 @@ if HAS_CELERY:
     CELERY_RESULT_BACKEND = config.get('celery', 'backend')
 else:
     CELERY_TASK_ALWAYS_EAGER = True
+HTMLEXPORT_PROCESSES = config.getint('celery', 'htmlexport_processes', fallback=1)
 MESSAGE_STORAGE = 'django.contrib.messages.storage.session.SessionStorage'
 MESSAGE_TAGS = {
     messages.INFO: 'info',
@@ -333,6 +336,7 @@ MIDDLEWARE = [
     'pretalx.common.middleware.SessionMiddleware',  # Add session handling
     'django.contrib.auth.middleware.AuthenticationMiddleware',  # Uses sessions
     'pretalx.common.auth.AuthenticationTokenMiddleware',  # Make auth tokens work
+    'pretalx.common.middleware.SettingsScopeMiddleware',  # Load event settings only once per request
     'pretalx.common.middleware.MultiDomainMiddleware',  # Check which host is used and if it is valid
     'pretalx.common.middleware.EventPermissionMiddleware',  # Sets locales, request.event, available events, etc.
     'pretalx.common.middleware.CsrfViewMiddleware',  # Protect against CSRF attacks before forms/data are processed
@@ -447,7 +451,7 @@ REST_FRAMEWORK = {
         'rest_framework.filters.SearchFilter',
         'django_filters.rest_framework.DjangoFilterBackend',
     ),
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
+    'DEFAULT_PAGINATION_CLASS': 'pretalx.api.pagination.ApiPagination',
     'PAGE_SIZE': 25,
     'SEARCH_PARAM': 'q',
     'ORDERING_PARAM': 'o',
@@ -0,0 +1,20 @@
+const releaseStatus = document.getElementById('release-status')
+
+const checkReleaseStatus = () => {
+  window.fetch(releaseStatus.dataset.url, {credentials: 'include'})
+    .then(response => response.json())
+    .then(status => {
+      if (status.state !== 'pending' && status.state !== 'running') {
+        window.location.reload()
+        return
+      }
+      if (status.total) {
+        document.getElementById('release-progress').textContent = `(${status.done} / ${status.total})`
+      }
+      window.setTimeout(checkReleaseStatus, 2000)
+    })
+}
+
+if (releaseStatus) {
+  window.setTimeout(checkReleaseStatus, 2000)
+}
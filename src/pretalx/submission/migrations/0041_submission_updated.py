@@ -0,0 +1,18 @@
+# Generated by Django 2.2.28 on 2026-10-16 20:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('submission', '0040_submission_created_data'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='submission',
+            name='updated',
+            field=models.DateTimeField(auto_now=True, null=True),
+        ),
+    ]
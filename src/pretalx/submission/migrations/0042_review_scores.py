@@ -0,0 +1,41 @@
+# Generated by Django 2.2.28 on 2026-10-16 23:09
+
+import statistics
+from collections import defaultdict
+
+from django.db import migrations, models
+
+
+def fill_review_scores(apps, schema_editor):
+    Review = apps.get_model('submission', 'Review')
+    Submission = apps.get_model('submission', 'Submission')
+    reviews = defaultdict(list)
+    for submission_id, score in Review.objects.all().values_list('submission_id', 'score'):
+        reviews[submission_id].append(score)
+    for submission_id, scores in reviews.items():
+        scores = [score for score in scores if score is not None]
+        Submission.objects.filter(pk=submission_id).update(
+            review_count=len(reviews[submission_id]),
+            median_score=statistics.median(scores) if scores else None,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('submission', '0041_submission_updated'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='submission',
+            name='median_score',
+            field=models.FloatField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='submission',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_review_scores, migrations.RunPython.noop),
+    ]
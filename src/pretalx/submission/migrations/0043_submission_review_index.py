@@ -0,0 +1,17 @@
+# Generated by Django 2.2.28 on 2026-10-16 23:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('submission', '0042_review_scores'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(fields=['event', 'state', 'review_count', 'code'], name='submission__event_i_d17294_idx'),
+        ),
+    ]
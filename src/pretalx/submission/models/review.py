@@ -1,10 +1,28 @@
+import random
+
 from django.db import models
+from django.db.models import Case, IntegerField, Value, When
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
 from django.utils.functional import cached_property
 from django.utils.translation import ugettext_lazy as _
 
 from pretalx.common.urls import EventUrls
 
 
+def review_pivot(user) -> str:
+    """Returns the submission code at which the given reviewer starts
+    reviewing.
+
+    Submission codes are random, so ordering submissions by code, starting
+    at a pivot that is different for every reviewer and wrapping around,
+    gives every reviewer a different order, that does not change between
+    requests, and that an index on the code can walk."""
+    from pretalx.submission.models import Submission
+
+    return ''.join(random.Random(user.pk).choices(Submission.CODE_CHARSET, k=6))
+
+
 class Review(models.Model):
     """Reviews model the opinion of reviewers of a :class:`~pretalx.submission.models.submission.Submission`.
 
@@ -32,6 +50,10 @@ class Review(models.Model):
     def __str__(self):
         return f'Review(event={self.submission.event.slug}, submission={self.submission.title}, user={self.user.get_display_name}, score={self.score})'
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.submission.update_review_scores()
+
     @classmethod
     def find_missing_reviews(cls, event, user, ignore=None):
         """
@@ -41,36 +63,79 @@ class Review(models.Model):
 
         Excludes submissions this user has submitted, and takes track
         :class:`~pretalx.event.models.organiser.Team` permissions into account.
-        The result is ordered by review count.
+        The result is ordered by review count, and then by submission code,
+        starting at the :func:`review_pivot` of this user.
 
         :type event: :class:`~pretalx.event.models.event.Event`
         :type user: :class:`~pretalx.person.models.user.User`
         :rtype: Queryset of :class:`~pretalx.submission.models.submission.Submission` objects
         """
+        pivot = review_pivot(user)
+        return cls._missing_reviews(event, user, ignore=ignore).order_by(
+            'review_count',
+            Case(
+                When(code__gte=pivot, then=Value(0)),
+                default=Value(1),
+                output_field=IntegerField(),
+            ),
+            'code',
+        )
+
+    @classmethod
+    def _missing_reviews(cls, event, user, ignore=None):
         from pretalx.submission.models import SubmissionStates
 
         queryset = (
             event.submissions.filter(state=SubmissionStates.SUBMITTED)
             .exclude(reviews__user=user)
             .exclude(speakers__in=[user])
-            .annotate(review_count=models.Count('reviews'))
-        )
-        limit_tracks = user.teams.filter(
-            models.Q(all_events=True)
-            | models.Q(
-                models.Q(all_events=False)
-                & models.Q(limit_events__in=[event])
-            ),
-            limit_tracks__isnull=False,
         )
-        if limit_tracks.exists():
-            tracks = set()
-            for team in limit_tracks:
-                tracks.update(team.limit_tracks.filter(event=event))
+        tracks = user.get_team_permissions(event)['reviewer_tracks']
+        if tracks:
             queryset = queryset.filter(track__in=tracks)
         if ignore:
             queryset = queryset.exclude(pk__in=[submission.pk for submission in ignore])
-        return queryset.order_by('review_count', '?')
+        return queryset
+
+    @classmethod
+    def find_next_submissions(cls, event, user, count=1, ignore=None):
+        """
+        Returns a list of the next ``count``
+        :class:`~pretalx.submission.models.submission.Submission` objects this
+        :class:`~pretalx.person.models.user.User` should review, in the order
+        of :meth:`find_missing_reviews`.
+
+        Instead of sorting all missing reviews, this looks up the lowest
+        review count, and then walks the submissions with this review count
+        by code, from the pivot of this user and then from the start. Each of
+        these queries can be answered from the index on the event, state,
+        review count and code of submissions.
+
+        :type event: :class:`~pretalx.event.models.event.Event`
+        :type user: :class:`~pretalx.person.models.user.User`
+        :type count: int
+        :rtype: list of :class:`~pretalx.submission.models.submission.Submission` objects
+        """
+        pivot = review_pivot(user)
+        queryset = cls._missing_reviews(event, user, ignore=ignore).select_related(
+            'event'
+        )
+        result = []
+        review_count = None
+        while len(result) < count:
+            levels = queryset.order_by('review_count')
+            if review_count is not None:
+                levels = levels.filter(review_count__gt=review_count)
+            review_count = levels.values_list('review_count', flat=True).first()
+            if review_count is None:
+                break
+            level = queryset.filter(review_count=review_count).order_by('code')
+            missing = count - len(result)
+            result += (
+                list(level.filter(code__gte=pivot)[:missing])
+                + list(level.filter(code__lt=pivot)[:missing])
+            )[:missing]
+        return result
 
     @cached_property
     def event(self):
@@ -94,6 +159,17 @@ class Review(models.Model):
         delete = '{base}{self.pk}/delete'
 
 
+@receiver(post_delete, sender=Review, dispatch_uid='review_deleted')
+def review_deleted(sender, instance, **kwargs):
+    # Reviews are also deleted by querysets and cascades, for example with
+    # their reviewer, which do not call Review.delete.
+    from pretalx.submission.models import Submission
+
+    submission = Submission.all_objects.filter(pk=instance.submission_id).first()
+    if submission:
+        submission.update_review_scores()
+
+
 class ReviewPhase(models.Model):
     """ReviewPhases determine reviewer access rights during a (potentially open) timeframe.
 
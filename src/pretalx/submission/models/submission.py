@@ -2,11 +2,12 @@ import re
 import statistics
 import string
 import uuid
+from collections import defaultdict
 from contextlib import suppress
 from datetime import timedelta
 
 from django.conf import settings
-from django.db import models
+from django.db import connection, models
 from django.db.models.fields.files import FieldFile
 from django.utils.crypto import get_random_string
 from django.utils.functional import cached_property
@@ -93,6 +94,15 @@ class AllSubmissionManager(models.Manager):
     pass
 
 
+class Median(models.Aggregate):
+    """Computes the median of all values. Only supported on PostgreSQL."""
+
+    function = 'PERCENTILE_CONT'
+    name = 'Median'
+    output_field = models.FloatField()
+    template = '%(function)s(0.5) WITHIN GROUP (ORDER BY %(expressions)s)'
+
+
 class Submission(LogMixin, models.Model):
     """Submissions are, next to :class:`~pretalx.event.models.event.Event`, the central model in pretalx.
 
@@ -111,8 +121,14 @@ class Submission(LogMixin, models.Model):
     :param image: An image illustrating the talk or topic.
     :param review_code: A token used in secret URLs giving read-access to the
         submission.
+    :param review_count: The number of reviews of this submission. Kept
+        current by the reviews, together with the ``median_score``. ``save()``
+        never writes these two fields for existing submissions, so that
+        outdated instances cannot overwrite them. Use
+        ``update_review_scores()`` to recalculate them.
     """
     created = models.DateTimeField(null=True, auto_now_add=True)
+    updated = models.DateTimeField(null=True, auto_now=True)
     code = models.CharField(max_length=16, unique=True)
     speakers = models.ManyToManyField(
         to='person.User', related_name='submissions', blank=True
@@ -204,12 +220,17 @@ class Submission(LogMixin, models.Model):
     review_code = models.CharField(
         max_length=32, unique=True, null=True, blank=True, default=generate_invite_code
     )
+    review_count = models.PositiveIntegerField(default=0, editable=False)
+    median_score = models.FloatField(null=True, editable=False)
     CODE_CHARSET = list('ABCDEFGHJKLMNPQRSTUVWXYZ3789')
 
     objects = SubmissionManager()
     deleted_objects = DeletedSubmissionManager()
     all_objects = AllSubmissionManager()
 
+    class Meta:
+        indexes = [models.Index(fields=['event', 'state', 'review_count', 'code'])]
+
     class urls(EventUrls):
         user_base = '{self.event.urls.user_submissions}{self.code}/'
         withdraw = '{user_base}withdraw'
@@ -259,8 +280,37 @@ class Submission(LogMixin, models.Model):
     def save(self, *args, **kwargs):
         if not self.code:
             self.assign_code()
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            # The review scores are updated by the reviews themselves, and
+            # must not be overwritten with outdated values.
+            kwargs['update_fields'] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in ('review_count', 'median_score')
+            ]
         super().save(*args, **kwargs)
 
+    def update_review_scores(self):
+        """Updates the ``review_count`` and ``median_score`` of this
+        submission. Called whenever a review is saved or deleted, including
+        deletions by querysets and cascades.
+
+        On PostgreSQL, the median is computed by the database."""
+        from pretalx.submission.models import Review
+
+        reviews = Review.objects.filter(submission=self)
+        scores = reviews.filter(score__isnull=False)
+        if connection.vendor == 'postgresql':
+            self.median_score = scores.aggregate(median=Median('score'))['median']
+        else:
+            values = list(scores.values_list('score', flat=True))
+            self.median_score = statistics.median(values) if values else None
+        self.review_count = reviews.count()
+        Submission.all_objects.filter(pk=self.pk).update(
+            review_count=self.review_count, median_score=self.median_score
+        )
+
     @property
     def editable(self):
         if self.state == SubmissionStates.SUBMITTED:
@@ -490,11 +540,6 @@ class Submission(LogMixin, models.Model):
             return end < now()
         return False
 
-    @cached_property
-    def median_score(self):
-        scores = [r.score for r in self.reviews.all() if r.score is not None]
-        return statistics.median(scores) if scores else None
-
     @cached_property
     def active_resources(self):
         return self.resources.exclude(resource=None).exclude(resource="")
@@ -524,12 +569,26 @@ class Submission(LogMixin, models.Model):
     @property
     def availabilities(self):
         """The intersection of all :class:`~pretalx.schedule.models.availability.Availability` objects of all speakers of this submission."""
-        from pretalx.schedule.models.availability import Availability
+        return self.availability_set.to_availabilities()
 
-        all_availabilities = self.event.availabilities.filter(
+    @cached_property
+    def availability_set(self):
+        """The times all speakers of this submission are available at, as an
+        :class:`~pretalx.schedule.models.availability.IntervalSet`.
+
+        Speakers without any availabilities are not taken into account."""
+        from pretalx.schedule.models.availability import IntervalSet
+
+        speaker_intervals = defaultdict(list)
+        for person_id, start, end in self.event.availabilities.filter(
             person__in=self.speaker_profiles
-        )
-        return Availability.intersection(all_availabilities)
+        ).values_list('person_id', 'start', 'end'):
+            speaker_intervals[person_id].append((start, end))
+        result = None
+        for intervals in speaker_intervals.values():
+            intervals = IntervalSet(intervals)
+            result = intervals if result is None else result & intervals
+        return result or IntervalSet()
 
     def get_content_for_mail(self):
         order = ['title', 'abstract', 'description', 'notes', 'duration', 'content_locale', 'do_not_record', 'image']
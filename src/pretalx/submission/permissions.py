@@ -1,5 +1,4 @@
 import rules
-from django.db.models import Q
 
 from pretalx.person.permissions import can_change_submissions, is_reviewer
 from pretalx.submission.models import SubmissionStates
@@ -7,15 +6,19 @@ from pretalx.submission.models import SubmissionStates
 
 @rules.predicate
 def has_submissions(user, obj):
-    event = obj.event
-    return event.submissions.filter(speakers__in=[user]).exists()
+    if not user or user.is_anonymous:
+        return False
+    states = user.get_speaker_submissions(obj.event).values()
+    return any(state != SubmissionStates.DELETED for state in states)
 
 
 @rules.predicate
 def is_speaker(user, obj):
     if hasattr(obj, 'submission'):
         obj = obj.submission
-    return obj and user in obj.speakers.all()
+    if not obj or not user or user.is_anonymous:
+        return False
+    return obj.pk in user.get_speaker_submissions(obj.event)
 
 
 @rules.predicate
@@ -109,12 +112,13 @@ def has_reviewer_access(user, obj):
         obj = obj.submission
     if not isinstance(obj, Submission):
         raise Exception('Incorrect use of reviewer permissions')
-    result = user.teams.filter(
-        Q(Q(all_events=True) | Q(limit_events__in=[obj.event]))
-        & Q(Q(limit_tracks__isnull=True) | Q(limit_tracks__in=[obj.track])),
-        is_reviewer=True,
-    )
-    return result.exists()
+    if not user or user.is_anonymous:
+        return False
+    permissions = user.get_team_permissions(obj.event)
+    if 'is_reviewer' not in permissions['permissions']:
+        return False
+    tracks = permissions['reviewer_tracks']
+    return tracks is None or obj.track_id in tracks
 
 
 @rules.predicate
@@ -0,0 +1,101 @@
+from collections import Counter
+
+import pytz
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import TruncDay
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from pretalx.common.models import ActivityLog, ArchivedActivityLog
+from pretalx.submission.models import Submission, SubmissionStates
+
+STATS_CACHE_TIMEOUT = 60 * 60 * 24
+TALK_STATES = (SubmissionStates.ACCEPTED, SubmissionStates.CONFIRMED)
+
+
+def get_stats_key(event_id):
+    return f'submission_stats_{event_id}'
+
+
+def _count_by(queryset, field):
+    return dict(
+        queryset.order_by().values_list(field).annotate(count=Count('id'))
+    )
+
+
+def _count_by_day(**filters):
+    """Counts the submission creation log entries of an event per (UTC) day,
+    including archived entries, and returns a dictionary mapping dates to
+    counts."""
+    result = Counter()
+    for model in (ActivityLog, ArchivedActivityLog):
+        result.update({
+            day.date(): count
+            for day, count in model.objects.filter(
+                action_type='pretalx.submission.create',
+                content_type=ContentType.objects.get_for_model(Submission),
+                **filters,
+            )
+            .order_by()
+            .annotate(day=TruncDay('timestamp', tzinfo=pytz.utc))
+            .values_list('day')
+            .annotate(count=Count('id'))
+        })
+    return dict(result)
+
+
+def _build_stats(event):
+    submissions = Submission.all_objects.filter(event=event)
+    talks = submissions.filter(state__in=TALK_STATES)
+    return {
+        'submissions': {
+            'state': _count_by(submissions, 'state'),
+            'type': _count_by(submissions, 'submission_type_id'),
+            'track': _count_by(submissions, 'track_id'),
+            'timeline': _count_by_day(event=event),
+        },
+        'talks': {
+            'state': _count_by(talks, 'state'),
+            'type': _count_by(talks, 'submission_type_id'),
+            'track': _count_by(talks, 'track_id'),
+            'timeline': _count_by_day(event=event, object_id__in=talks.values('pk')),
+        },
+    }
+
+
+def get_submission_stats(event) -> dict:
+    """Returns the number of submissions and of accepted or confirmed talks
+    of the given event, grouped by ``state``, ``type`` ID, ``track`` ID, and
+    by the day of their creation (``timeline``).
+
+    The numbers are computed with a handful of aggregate queries and are
+    cached until a submission of the event is created, changed or deleted."""
+    key = get_stats_key(event.pk)
+    result = cache.get(key)
+    if result is None:
+        result = _build_stats(event)
+        cache.set(key, result, STATS_CACHE_TIMEOUT)
+    return result
+
+
+def clear_submission_stats(event_id):
+    """Removes the cached statistics of the given event, both immediately and
+    once the current transaction is committed."""
+    key = get_stats_key(event_id)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+@receiver(post_save, sender=Submission, dispatch_uid='stats_submission_saved')
+@receiver(post_delete, sender=Submission, dispatch_uid='stats_submission_deleted')
+def submission_changed(sender, instance, **kwargs):
+    clear_submission_stats(instance.event_id)
+
+
+@receiver(post_save, sender=ActivityLog, dispatch_uid='stats_submission_logged')
+def submission_logged(sender, instance, created, **kwargs):
+    if created and instance.action_type == 'pretalx.submission.create':
+        clear_submission_stats(instance.event_id)
@@ -1,5 +1,6 @@
 import json
 import os
+import zipfile
 from glob import glob
 
 import pytest
@@ -9,6 +10,7 @@ from django.test import override_settings
 from django.urls import reverse
 from lxml import etree
 
+from pretalx.agenda.management.commands.export_schedule_html import update_zip
 from pretalx.agenda.tasks import export_schedule_html
 from pretalx.common.tasks import regenerate_css
 from pretalx.event.models import Event
@@ -31,7 +33,7 @@ def test_schedule_xsd_is_up_to_date():
 def test_schedule_frab_xml_export(
     slot, client, django_assert_num_queries, schedule_schema
 ):
-    with django_assert_num_queries(23):
+    with django_assert_num_queries(21):
         response = client.get(
             reverse(
                 f'agenda:export.schedule.xml',
@@ -39,18 +41,19 @@ def test_schedule_frab_xml_export(
             ),
             follow=True,
         )
-    assert response.status_code == 200, str(response.content.decode())
+    assert response.status_code == 200
+    assert response.streaming
     assert 'ETag' in response
 
-    content = response.content.decode()
-    assert slot.submission.title in content
-    assert slot.submission.urls.public.full() in content
+    content = b''.join(response.streaming_content)
+    assert slot.submission.title in content.decode()
+    assert slot.submission.urls.public.full() in content.decode()
 
     parser = etree.XMLParser(schema=schedule_schema)
     etree.fromstring(
-        response.content, parser
+        content, parser
     )  # Will raise if the schedule does not match the schema
-    with django_assert_num_queries(12):
+    with django_assert_num_queries(6):
         response = client.get(
             reverse(
                 f'agenda:export.schedule.xml',
@@ -67,7 +70,7 @@ def test_schedule_frab_xml_export_control_char(slot, client, django_assert_num_q
     slot.submission.description = "control char: \a"
     slot.submission.save()
 
-    with django_assert_num_queries(19):
+    with django_assert_num_queries(18):
         response = client.get(
             reverse(
                 f'agenda:export.schedule.xml',
@@ -77,7 +80,7 @@ def test_schedule_frab_xml_export_control_char(slot, client, django_assert_num_q
         )
 
     parser = etree.XMLParser()
-    etree.fromstring(response.content, parser)
+    etree.fromstring(b''.join(response.streaming_content), parser)
 
 
 @pytest.mark.django_db
@@ -89,7 +92,7 @@ def test_schedule_frab_json_export(
     django_assert_num_queries,
     orga_user,
 ):
-    with django_assert_num_queries(23):
+    with django_assert_num_queries(19):
         regular_response = client.get(
             reverse(
                 f'agenda:export.schedule.json',
@@ -98,7 +101,7 @@ def test_schedule_frab_json_export(
             follow=True,
         )
     client.force_login(orga_user)
-    with django_assert_num_queries(23):
+    with django_assert_num_queries(13):
         orga_response = client.get(
             reverse(
                 f'agenda:export.schedule.json',
@@ -109,8 +112,8 @@ def test_schedule_frab_json_export(
     assert regular_response.status_code == 200
     assert orga_response.status_code == 200
 
-    regular_content = regular_response.content.decode()
-    orga_content = orga_response.content.decode()
+    regular_content = b''.join(regular_response.streaming_content).decode()
+    orga_content = b''.join(orga_response.streaming_content).decode()
 
     assert slot.submission.title in regular_content
     assert slot.submission.title in orga_content
@@ -123,11 +126,13 @@ def test_schedule_frab_json_export(
     assert orga_content['schedule']
 
     assert regular_content != orga_content
+    assert 'ETag' in regular_response
+    assert 'ETag' not in orga_response
 
 
 @pytest.mark.django_db
 def test_schedule_frab_xcal_export(slot, client, django_assert_num_queries):
-    with django_assert_num_queries(20):
+    with django_assert_num_queries(19):
         response = client.get(
             reverse(
                 f'agenda:export.schedule.xcal',
@@ -143,7 +148,7 @@ def test_schedule_frab_xcal_export(slot, client, django_assert_num_queries):
 
 @pytest.mark.django_db
 def test_schedule_ical_export(slot, client, django_assert_num_queries):
-    with django_assert_num_queries(22):
+    with django_assert_num_queries(19):
         response = client.get(
             reverse(
                 f'agenda:export.schedule.ics',
@@ -159,7 +164,7 @@ def test_schedule_ical_export(slot, client, django_assert_num_queries):
 
 @pytest.mark.django_db
 def test_schedule_single_ical_export(slot, client, django_assert_num_queries):
-    with django_assert_num_queries(25):
+    with django_assert_num_queries(20):
         response = client.get(slot.submission.urls.ical, follow=True)
     assert response.status_code == 200
 
@@ -167,6 +172,19 @@ def test_schedule_single_ical_export(slot, client, django_assert_num_queries):
     assert slot.submission.title in content
 
 
+@pytest.mark.django_db
+def test_schedule_ical_exports_match(slot, client):
+    def get_vevent(url):
+        content = client.get(url, follow=True).content.decode()
+        lines = content.split('VEVENT')[1].splitlines()
+        return [line for line in lines if not line.startswith('DTSTAMP')]
+
+    schedule_url = reverse(
+        'agenda:export.schedule.ics', kwargs={'event': slot.submission.event.slug}
+    )
+    assert get_vevent(schedule_url) == get_vevent(slot.submission.urls.ical)
+
+
 @pytest.mark.django_db
 @pytest.mark.parametrize(
     'exporter',
@@ -177,7 +195,7 @@ def test_schedule_export_nonpublic(exporter, slot, client, django_assert_num_que
     slot.submission.event.save()
     exporter = 'feed' if exporter == 'feed' else f'export.{exporter}'
 
-    with django_assert_num_queries(16):
+    with django_assert_num_queries(11):
         response = client.get(
             reverse(f'agenda:{exporter}', kwargs={'event': slot.submission.event.slug}),
             follow=True,
@@ -191,7 +209,7 @@ def test_schedule_speaker_ical_export(
 ):
     speaker = slot.submission.speakers.all()[0]
     profile = speaker.profiles.get(event=slot.event)
-    with django_assert_num_queries(31):
+    with django_assert_num_queries(24):
         response = client.get(profile.urls.talks_ical, follow=True)
     assert response.status_code == 200
 
@@ -202,12 +220,81 @@ def test_schedule_speaker_ical_export(
 
 @pytest.mark.django_db
 def test_feed_view(slot, client, django_assert_num_queries, schedule):
-    with django_assert_num_queries(20):
+    with django_assert_num_queries(15):
         response = client.get(slot.submission.event.urls.feed)
     assert response.status_code == 200
     assert schedule.version in response.content.decode()
 
 
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    'url_name',
+    (
+        'schedule_ics',
+        'talk_ical',
+        'speaker_ical',
+        'feed',
+        'schedule',
+        'talk',
+        'speaker',
+    ),
+)
+def test_conditional_get(url_name, slot, client):
+    speaker = slot.submission.speakers.all()[0]
+    url = {
+        'schedule_ics': reverse(
+            'agenda:export.schedule.ics', kwargs={'event': slot.event.slug}
+        ),
+        'talk_ical': slot.submission.urls.ical,
+        'speaker_ical': speaker.profiles.get(event=slot.event).urls.talks_ical,
+        'feed': slot.event.urls.feed,
+        'schedule': slot.event.urls.schedule,
+        'talk': slot.submission.urls.public,
+        'speaker': speaker.profiles.get(event=slot.event).urls.public,
+    }[url_name]
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response['ETag']
+
+    response = client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+    assert response.status_code == 304
+    if url_name not in ('schedule', 'talk', 'speaker'):  # No modification time
+        response = client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        assert response.status_code == 304
+
+    if url_name != 'feed':
+        etag = response['ETag']
+        slot.submission.title = 'A new title'
+        slot.submission.save()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('exporter', ('frab_xml', 'frab_json'))
+def test_schedule_export_failure(exporter, slot, client, mocker, caplog):
+    from pretalx.schedule.exporters import FrabJsonExporter, FrabXmlExporter
+
+    exporter_class = {'frab_xml': FrabXmlExporter, 'frab_json': FrabJsonExporter}[exporter]
+    url = getattr(slot.submission.event.urls, exporter)
+
+    mocker.patch.object(exporter_class, 'render_stream', side_effect=ValueError)
+    response = client.get(url)
+    assert response.status_code == 404
+
+    def chunks():
+        yield 'first day'
+        raise ValueError('broken day')
+
+    exporter_class.render_stream.side_effect = None
+    exporter_class.render_stream.return_value = ('file', 'text/xml', chunks())
+    response = client.get(url)
+    assert response.status_code == 200
+    with pytest.raises(ValueError):
+        b''.join(response.streaming_content)
+    assert f'Export schedule.{exporter[5:]} of event {slot.submission.event.slug} failed.' in caplog.text
+
+
 @pytest.mark.django_db
 def test_html_export_event_required():
     from django.core.management import call_command
@@ -307,7 +394,7 @@ def test_schedule_orga_trigger_export(
 
     mocker.patch('pretalx.agenda.tasks.export_schedule_html.apply_async')
 
-    with django_assert_num_queries(41):
+    with django_assert_num_queries(25):
         response = orga_client.post(
             event.orga_urls.schedule_export_trigger, follow=True
         )
@@ -324,7 +411,7 @@ def test_schedule_orga_download_export(
     from pretalx.agenda.tasks import export_schedule_html
 
     export_schedule_html.apply_async(kwargs={'event_id': event.id, 'make_zip': True})
-    with django_assert_num_queries(12):
+    with django_assert_num_queries(8):
         response = orga_client.get(
             event.orga_urls.schedule_export_download, follow=True
         )
@@ -438,7 +525,7 @@ def test_html_export_full(event, other_event, slot, canceled_talk):
 
 @pytest.mark.django_db
 def test_speaker_csv_export(slot, orga_client, django_assert_num_queries):
-    with django_assert_num_queries(20):
+    with django_assert_num_queries(14):
         response = orga_client.get(
             reverse(
                 f'agenda:export',
@@ -448,3 +535,91 @@ def test_speaker_csv_export(slot, orga_client, django_assert_num_queries):
         )
     assert response.status_code == 200, str(response.content.decode())
     assert slot.submission.speakers.first().name in response.content.decode()
+
+
+def _write_files(root, files):
+    for name, content in files.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+
+def test_update_zip_appends_changed_files(tmp_path):
+    zip_path = str(tmp_path / 'export.zip')
+    files = {f'test/page{index}.html': os.urandom(2000).hex() for index in range(4)}
+    _write_files(tmp_path, files)
+    update_zip(zip_path, str(tmp_path), list(files), changed=list(files))
+    with zipfile.ZipFile(zip_path) as archive:
+        offsets = {info.filename: info.header_offset for info in archive.infolist()}
+
+    _write_files(tmp_path, {'test/page0.html': 'changed', 'test/new.html': 'new'})
+    (tmp_path / 'test/page3.html').unlink()
+    names = ['test/page0.html', 'test/page1.html', 'test/page2.html', 'test/new.html']
+    with open(zip_path, 'rb') as download:
+        update_zip(zip_path, str(tmp_path), names, changed=['test/page0.html'])
+        with zipfile.ZipFile(download) as archive:  # still the complete old file
+            assert archive.testzip() is None
+            assert sorted(archive.namelist()) == sorted(files)
+
+    with zipfile.ZipFile(zip_path) as archive:
+        assert archive.testzip() is None
+        assert sorted(archive.namelist()) == sorted(names)
+        assert archive.read('test/page0.html') == b'changed'
+        assert archive.read('test/new.html') == b'new'
+        for name in ('test/page1.html', 'test/page2.html'):
+            assert archive.getinfo(name).header_offset == offsets[name]
+
+
+def test_update_zip_compacts_unused_space(tmp_path):
+    zip_path = str(tmp_path / 'export.zip')
+    files = {f'test/page{index}.html': os.urandom(2000).hex() for index in range(4)}
+    _write_files(tmp_path, files)
+    update_zip(zip_path, str(tmp_path), list(files), changed=list(files))
+    size = os.path.getsize(zip_path)
+
+    _write_files(tmp_path, {name: 'changed' for name in files})
+    update_zip(zip_path, str(tmp_path), list(files), changed=list(files))
+
+    assert os.path.getsize(zip_path) < size
+    with zipfile.ZipFile(zip_path) as archive:
+        assert all(archive.read(name) == b'changed' for name in files)
+
+
+@pytest.mark.django_db
+def test_html_export_is_incremental(event, slot, other_slot):
+    from django.conf import settings
+    from django.core.management import call_command
+
+    def read(path):
+        with open(os.path.join(settings.HTMLEXPORT_ROOT, 'test', path)) as page:
+            return page.read()
+
+    def mtime(path):
+        return os.stat(os.path.join(settings.HTMLEXPORT_ROOT, 'test', path)).st_mtime_ns
+
+    from pretalx.common.models.settings import GlobalSettings
+
+    GlobalSettings().get_instance_identifier()  # created on first use otherwise
+    talk = f'test/talk/{slot.submission.code}/index.html'
+    other_talk = f'test/talk/{other_slot.submission.code}/index.html'
+    version = f'test/schedule/v/{slot.schedule.url_version}/index.html'
+    with override_settings(COMPRESS_ENABLED=True, COMPRESS_OFFLINE=True):
+        call_command('collectstatic', interactive=False, verbosity=0)
+        call_command('compress', verbosity=0)
+        call_command('export_schedule_html', event.slug, '--zip')
+        assert slot.submission.title in read(talk)
+        other_talk_mtime = mtime(other_talk)
+        version_mtime = mtime(version)
+        call_command('export_schedule_html', event.slug, '--zip')
+        assert mtime(version) == version_mtime
+
+        slot.submission.title = 'A completely new title'
+        slot.submission.save()
+        call_command('export_schedule_html', event.slug, '--zip')
+
+    assert 'A completely new title' in read(talk)
+    assert 'A completely new title' in read(version)
+    assert mtime(other_talk) == other_talk_mtime
+    with zipfile.ZipFile(os.path.join(settings.HTMLEXPORT_ROOT, 'test.zip')) as archive:
+        assert 'A completely new title' in archive.read(f'test/{talk}').decode()
+        assert other_slot.submission.title in archive.read(f'test/{other_talk}').decode()
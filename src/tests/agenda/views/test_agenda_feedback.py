@@ -4,7 +4,7 @@ import pytest
 @pytest.mark.django_db()
 def test_can_create_feedback(django_assert_num_queries, past_slot, client):
     assert past_slot.submission.speakers.count() == 1
-    with django_assert_num_queries(53):
+    with django_assert_num_queries(43):
         response = client.post(
             past_slot.submission.urls.feedback, {'review': 'cool!'}, follow=True
         )
@@ -24,7 +24,7 @@ def test_can_create_feedback_for_multiple_speakers(
     past_slot.submission.speakers.add(other_speaker)
     past_slot.submission.speakers.add(speaker)
     assert past_slot.submission.speakers.count() == 2
-    with django_assert_num_queries(55):
+    with django_assert_num_queries(45):
         response = client.post(
             past_slot.submission.urls.feedback, {'review': 'cool!'}, follow=True
         )
@@ -36,7 +36,7 @@ def test_can_create_feedback_for_multiple_speakers(
 
 @pytest.mark.django_db()
 def test_cannot_create_feedback_before_talk(django_assert_num_queries, slot, client):
-    with django_assert_num_queries(25):
+    with django_assert_num_queries(20):
         response = client.post(
             slot.submission.urls.feedback, {'review': 'cool!'}, follow=True
         )
@@ -48,7 +48,7 @@ def test_cannot_create_feedback_before_talk(django_assert_num_queries, slot, cli
 @pytest.mark.django_db()
 def test_can_see_feedback(django_assert_num_queries, feedback, client):
     client.force_login(feedback.talk.speakers.first())
-    with django_assert_num_queries(24):
+    with django_assert_num_queries(15):
         response = client.get(feedback.talk.urls.feedback)
     assert response.status_code == 200
     assert feedback.review in response.content.decode()
@@ -56,13 +56,13 @@ def test_can_see_feedback(django_assert_num_queries, feedback, client):
 
 @pytest.mark.django_db()
 def test_can_see_feedback_form(django_assert_num_queries, past_slot, client):
-    with django_assert_num_queries(23):
+    with django_assert_num_queries(18):
         response = client.get(past_slot.submission.urls.feedback, follow=True)
     assert response.status_code == 200
 
 
 @pytest.mark.django_db()
 def test_cannot_see_feedback_form_before_talk(django_assert_num_queries, slot, client):
-    with django_assert_num_queries(25):
+    with django_assert_num_queries(20):
         response = client.get(slot.submission.urls.feedback, follow=True)
     assert response.status_code == 200
@@ -14,7 +14,7 @@ def test_sneak_peek_invisible_because_schedule(
 ):
     event.settings.show_sneak_peek = True
     event.release_schedule("42")
-    with django_assert_num_queries(27):
+    with django_assert_num_queries(18):
         response = client.get(event.urls.sneakpeek, follow=True)
 
     # there might be multiple redirects to correct trailing slashes, so the
@@ -29,7 +29,7 @@ def test_sneak_peek_invisible_because_schedule(
 @pytest.mark.django_db
 def test_sneak_peek_visible(client, django_assert_num_queries, event):
     event.settings.show_sneak_peek = True
-    with django_assert_num_queries(17):
+    with django_assert_num_queries(14):
         response = client.get(event.urls.sneakpeek, follow=True)
     assert response.status_code == 200
     assert 'peek' in response.content.decode()
@@ -40,7 +40,7 @@ def test_sneak_peek_visible_despite_schedule(client, django_assert_num_queries,
     event.settings.show_sneak_peek = True
     event.settings.show_schedule = False
     event.release_schedule("42")
-    with django_assert_num_queries(17):
+    with django_assert_num_queries(14):
         response = client.get(event.urls.sneakpeek, follow=True)
     assert response.status_code == 200
     assert 'peek' in response.content.decode()
@@ -59,7 +59,7 @@ def test_sneak_peek_talk_list(
 
     event.settings.show_sneak_peek = True
 
-    with django_assert_num_queries(18):
+    with django_assert_num_queries(15):
         response = client.get(event.urls.sneakpeek, follow=True)
     assert response.status_code == 200
     content = response.content.decode()
@@ -1,6 +1,11 @@
 import json
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from pretalx.person.models import SpeakerProfile, User
+from pretalx.submission.models import Answer, Review, Submission
 
 
 @pytest.mark.django_db
@@ -402,3 +407,114 @@ def test_orga_can_see_room_speaker_info(orga_client, room):
     assert response.status_code == 200
     assert len(content['results']) == 1, content
     assert 'speaker_info' in content['results'][0]
+
+
+@pytest.mark.django_db
+def test_orga_can_page_submissions_with_cursor(orga_client, event, submission):
+    submissions = [submission]
+    for index in range(4):
+        submissions.append(
+            Submission.objects.create(
+                title=f'Talk {index}',
+                event=event,
+                submission_type=submission.submission_type,
+                content_locale='en',
+            )
+        )
+    url = event.api_urls.submissions + '?cursor=&limit=2'
+    titles = []
+    while url:
+        response = orga_client.get(url, follow=True)
+        assert response.status_code == 200
+        content = json.loads(response.content.decode())
+        assert 'count' not in content
+        assert len(content['results']) <= 2
+        titles += [result['title'] for result in content['results']]
+        url = content['next']
+    assert titles == [sub.title for sub in sorted(submissions, key=lambda sub: sub.pk)]
+
+
+@pytest.mark.django_db
+def test_events_are_paginated_only_with_cursor(client, event, other_event):
+    response = client.get('/api/events?cursor=&limit=1', follow=True)
+    content = json.loads(response.content.decode())
+    assert response.status_code == 200
+    assert len(content['results']) == 1
+    assert content['next']
+
+
+@pytest.mark.django_db
+def test_orga_can_stream_submissions(orga_client, event, submission, other_submission):
+    response = orga_client.get(
+        event.api_urls.submissions + '?format=ndjson', follow=True
+    )
+    assert response.status_code == 200
+    assert response['Content-Type'] == 'application/x-ndjson'
+    lines = b''.join(response.streaming_content).decode().splitlines()
+    assert [json.loads(line)['title'] for line in lines] == [
+        submission.title, other_submission.title,
+    ]
+
+
+@pytest.mark.django_db
+def test_can_stream_public_events(client, event, other_event):
+    other_event.is_public = False
+    other_event.save()
+    response = client.get('/api/events?format=ndjson', follow=True)
+    assert response.status_code == 200
+    lines = b''.join(response.streaming_content).decode().splitlines()
+    assert [json.loads(line)['slug'] for line in lines] == [event.slug]
+
+
+def _count_list_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url, follow=True)
+    assert response.status_code == 200
+    return len(context.captured_queries), json.loads(response.content.decode())
+
+
+def _add_submissions(event, submission, question, count):
+    offset = Submission.objects.count()
+    for index in range(offset, offset + count):
+        user = User.objects.create_user(
+            password='speakerpwd1!', name=f'Speaker {index}', email=f'{index}@speaker.org'
+        )
+        SpeakerProfile.objects.create(user=user, event=event, biography='Hi!')
+        sub = Submission.objects.create(
+            title=f'Talk {index}',
+            event=event,
+            submission_type=submission.submission_type,
+            content_locale='en',
+        )
+        sub.speakers.add(user)
+        Answer.objects.create(question=question, submission=sub, answer='3')
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('endpoint', ('submissions', 'speakers'))
+def test_orga_list_query_count_does_not_grow(
+    orga_client, event, submission, question, endpoint
+):
+    url = getattr(event.api_urls, endpoint)
+    _add_submissions(event, submission, question, 1)
+    _count_list_queries(orga_client, url)
+    queries, content = _count_list_queries(orga_client, url)
+    _add_submissions(event, submission, question, 5)
+    more_queries, more_content = _count_list_queries(orga_client, url)
+    assert more_content['count'] > content['count']
+    assert more_queries == queries
+
+
+@pytest.mark.django_db
+def test_review_list_query_count_does_not_grow(
+    orga_client, event, submission, review, question
+):
+    url = event.api_urls.reviews
+    _count_list_queries(orga_client, url)
+    queries, content = _count_list_queries(orga_client, url)
+    _add_submissions(event, submission, question, 5)
+    for sub in event.submissions.exclude(pk=submission.pk):
+        Review.objects.create(submission=sub, user=review.user, score=1)
+    more_queries, more_content = _count_list_queries(orga_client, url)
+    assert more_content['count'] == content['count'] + 5
+    assert more_queries == queries
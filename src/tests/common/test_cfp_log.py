@@ -1,5 +1,10 @@
+import json
+
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
+from pretalx.common.mixins.models import bulk_log_actions, log_buffer
 from pretalx.common.models.log import LOG_NAMES, ActivityLog
 
 
@@ -44,3 +49,44 @@ def test_log_urls(activity_log, submission, choice_question, answer, mail_templa
 
     activity_log.content_object = mail_template
     assert activity_log.get_orga_url() == mail_template.urls.base
+
+
+@pytest.mark.django_db
+def test_log_buffer(submission, other_submission, orga_user):
+    with CaptureQueriesContext(connection) as context:
+        with log_buffer():
+            submission.log_action('pretalx.submission.update', person=orga_user, orga=True)
+            with log_buffer():
+                other_submission.log_action(
+                    'pretalx.submission.update', data={'password': 'hunter2'}
+                )
+            assert ActivityLog.objects.count() == 0
+    inserts = [
+        query for query in context.captured_queries
+        if query['sql'].startswith('INSERT INTO "common_activitylog"')
+    ]
+    assert len(inserts) == 1
+    assert submission.logged_actions().get().person == orga_user
+    assert json.loads(other_submission.logged_actions().get().data) == {
+        'password': '********'
+    }
+
+
+@pytest.mark.django_db
+def test_log_buffer_discards_entries_on_error(submission):
+    with pytest.raises(ValueError):
+        with log_buffer():
+            submission.log_action('pretalx.submission.update')
+            raise ValueError()
+    assert ActivityLog.objects.count() == 0
+    submission.log_action('pretalx.submission.update')
+    assert ActivityLog.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_bulk_log_actions(submission, other_submission):
+    bulk_log_actions(
+        sub.build_log_entry('pretalx.submission.update')
+        for sub in (submission, other_submission, type(submission)())
+    )
+    assert ActivityLog.objects.count() == 2
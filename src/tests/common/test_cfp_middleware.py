@@ -2,7 +2,10 @@ from urllib.parse import urlparse
 
 import pytest
 from django.conf import settings
-from django.test.utils import override_settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from pretalx.event.utils import clear_event_cache
 
 
 @pytest.fixture(autouse=True)
@@ -108,3 +111,17 @@ def test_with_forwarded_host(event_on_foobar, client):
 
 
 settings.USE_X_FORWARDED_HOST = False
+
+
+@pytest.mark.django_db
+def test_event_is_loaded_from_cache(event, client):
+    def count_queries():
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(f'/{event.slug}/')
+        assert response.status_code == 200
+        return len(context.captured_queries)
+
+    count_queries()  # warm up sessions and settings
+    clear_event_cache()
+    uncached = count_queries()
+    assert count_queries() == uncached - 1
@@ -1,7 +1,46 @@
+from datetime import timedelta
+
 import pytest
 from django.core.management import call_command
+from django.utils.timezone import now
+
+from pretalx.common.models import ActivityLog, ArchivedActivityLog
 
 
 @pytest.mark.django_db
 def test_common_runperiodic():
     call_command('runperiodic')
+
+
+@pytest.mark.django_db
+def test_common_archive_logs(event, other_event, submission):
+    submission.log_action('pretalx.submission.create')
+    submission.log_action('pretalx.submission.update')
+    other_event.log_action('pretalx.event.update')
+    event.date_from = event.date_to = now().date() - timedelta(days=100)
+    event.save()
+    other_event.date_from = other_event.date_to = now().date()
+    other_event.save()
+    log_count = ActivityLog.objects.filter(event=event).count()
+
+    call_command('archive_logs')
+
+    assert not ActivityLog.objects.filter(event=event).exists()
+    assert ActivityLog.objects.filter(event=other_event).exists()
+    assert ArchivedActivityLog.objects.filter(event=event).count() == log_count
+    assert [log.action_type for log in submission.log_history()] == [
+        'pretalx.submission.update', 'pretalx.submission.create',
+    ]
+    submission.log_action('pretalx.submission.update')
+    history = list(submission.log_history())
+    assert len(history) == 3
+    assert all(isinstance(log, ActivityLog) for log in history)
+    assert history[0].content_object == submission
+
+
+@pytest.mark.django_db
+def test_common_archive_logs_of_event(event, submission):
+    submission.log_action('pretalx.submission.create')
+    call_command('archive_logs', event=event.slug)
+    assert not ActivityLog.objects.filter(event=event).exists()
+    assert submission.log_history()[0].action_type == 'pretalx.submission.create'
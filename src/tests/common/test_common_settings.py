@@ -0,0 +1,71 @@
+import pytest
+from django.test import override_settings
+
+from pretalx.common.models.settings import settings_loads, settings_scope
+from pretalx.event.models import Event
+
+
+@pytest.fixture
+def locmem_cache():
+    cache_settings = {
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+    }
+    with override_settings(CACHES=cache_settings):
+        yield
+
+
+@pytest.fixture
+def request_scope():
+    with settings_scope():
+        yield
+
+
+@pytest.mark.django_db
+def test_settings_are_loaded_once_per_request(
+    event, request_scope, django_assert_num_queries
+):
+    event.settings.set('custom_domain', 'https://talks.example.org')
+    instances = [Event.objects.get(pk=event.pk) for _ in range(3)]
+    settings_loads.clear()
+    with django_assert_num_queries(2):  # Event settings and global settings
+        for instance in instances:
+            assert instance.settings.custom_domain == 'https://talks.example.org'
+            assert instance.settings.use_tracks is False
+    assert settings_loads['database'] == 2
+    assert settings_loads['scope'] == 2
+
+
+@pytest.mark.django_db
+def test_settings_changes_are_visible_in_request(event, request_scope):
+    instance = Event.objects.get(pk=event.pk)
+    other_instance = Event.objects.get(pk=event.pk)
+    assert other_instance.settings.use_tracks is False
+    instance.settings.set('use_tracks', True)
+    assert other_instance.settings.use_tracks is True
+    instance.settings.delete('use_tracks')
+    assert other_instance.settings.use_tracks is False
+
+
+@pytest.mark.django_db
+def test_settings_are_cached_between_requests(
+    event, locmem_cache, django_assert_num_queries
+):
+    event.settings.set('custom_domain', 'https://talks.example.org')
+    assert Event.objects.get(pk=event.pk).settings.custom_domain
+    settings_loads.clear()
+    other_instance = Event.objects.get(pk=event.pk)
+    with django_assert_num_queries(0):
+        assert other_instance.settings.custom_domain == 'https://talks.example.org'
+    assert settings_loads['database'] == 0
+
+    event.settings.set('custom_domain', 'https://example.com')
+    assert Event.objects.get(pk=event.pk).settings.custom_domain == 'https://example.com'
+    event.settings.delete('custom_domain')
+    assert Event.objects.get(pk=event.pk).settings.custom_domain == ''
+
+
+@pytest.mark.django_db
+def test_settings_mutable_values_are_not_shared(event, request_scope):
+    event.settings.set('score_names', {'0': 'Bad'})
+    event.settings.get('score_names', as_type=dict)['1'] = 'Good'
+    assert event.settings.get('score_names', as_type=dict) == {'0': 'Bad'}
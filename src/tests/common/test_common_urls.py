@@ -0,0 +1,31 @@
+import pytest
+from django.conf import settings
+
+from pretalx.common.urls import get_base_url, get_url_context
+from pretalx.submission.models import Submission
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('name', ('public', 'ical', 'feedback', 'image', 'user_base'))
+def test_url_template_matches_urls(submission, name):
+    submission.event.settings.html_export_url = 'https://export.example.org'
+    submission.event.settings.custom_domain = 'https://talks.example.org'
+    template = get_url_context(submission.event).url_template(Submission, name)
+    url = getattr(submission.urls, name)
+    for _ in range(2):
+        assert template.path(submission) == url
+        assert template.full(submission) == url.full()
+
+
+@pytest.mark.django_db
+def test_event_urls_use_export_url(submission):
+    event = submission.event
+    event.settings.html_export_url = 'https://export.example.org'
+    assert submission.urls.public.full().startswith('https://export.example.org/')
+    assert submission.urls.user_base.full().startswith(settings.SITE_URL)
+    assert submission.orga_urls.base.full().startswith(settings.SITE_URL)
+    event.settings.custom_domain = 'https://talks.example.org'
+    assert submission.urls.user_base.full().startswith('https://talks.example.org/')
+    assert get_base_url(event) == 'https://talks.example.org'
+    event.settings.html_export_url = ''
+    assert submission.urls.public.full().startswith('https://talks.example.org/')
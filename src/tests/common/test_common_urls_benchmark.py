@@ -0,0 +1,67 @@
+import time
+from contextlib import suppress
+from urllib.parse import urlparse
+
+import pytest
+from django.conf import settings
+from django.urls import resolve
+
+from pretalx.common.urls import get_url_context
+from pretalx.submission.models import Submission
+
+TALK_COUNT = 1000
+
+
+def get_base_url_uncached(event, url):
+    """Returns the base URL the way it was done before the URL context: the
+    settings are read and the URL is resolved on every call."""
+    if url.startswith('/orga'):
+        return settings.SITE_URL
+    if event.settings.html_export_url:
+        with suppress(Exception):
+            if 'agenda' in resolve(url).namespaces:
+                return event.settings.html_export_url
+    return event.settings.custom_domain or settings.SITE_URL
+
+
+def full_uncached(submission):
+    url = str(submission.urls.public)
+    scheme = urlparse(get_base_url_uncached(submission.event, url)).scheme
+    netloc = urlparse(get_base_url_uncached(submission.event, url)).netloc
+    return f'{scheme}://{netloc}{url}'
+
+
+def urls_per_second(build_url, submissions):
+    start = time.perf_counter()
+    for submission in submissions:
+        build_url(submission)
+    return len(submissions) / (time.perf_counter() - start)
+
+
+def get_submissions(event):
+    event.settings.html_export_url = 'https://export.example.org'
+    return [Submission(event=event, code=f'T{index:05}') for index in range(TALK_COUNT)]
+
+
+@pytest.mark.django_db
+def test_url_building_methods_match(event):
+    submissions = get_submissions(event)
+    template = get_url_context(event).url_template(Submission, 'public')
+    before_urls = [full_uncached(submission) for submission in submissions]
+    urlman_urls = [submission.urls.public.full() for submission in submissions]
+    after_urls = [template.full(submission) for submission in submissions]
+    assert before_urls == urlman_urls == after_urls
+    assert after_urls[0] == f'https://export.example.org/{event.slug}/talk/T00000/'
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+def test_url_building_benchmark(event):
+    submissions = get_submissions(event)
+    template = get_url_context(event).url_template(Submission, 'public')
+    before = urls_per_second(full_uncached, submissions)
+    urlman = urls_per_second(
+        lambda submission: submission.urls.public.full(), submissions
+    )
+    after = urls_per_second(template.full, submissions)
+    assert after > urlman > before
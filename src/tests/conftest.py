@@ -6,6 +6,7 @@ from django.core.files.uploadedfile import SimpleUploadedFile
 from django.utils.timezone import now
 
 from pretalx.event.models import Event, Organiser, Team, TeamInvite
+from pretalx.event.utils import clear_event_cache
 from pretalx.mail.models import MailTemplate
 from pretalx.person.models import SpeakerInformation, SpeakerProfile, User
 from pretalx.schedule.models import Availability, Room, TalkSlot
@@ -15,6 +16,35 @@ from pretalx.submission.models import (
 )
 
 
+def pytest_addoption(parser):
+    parser.addoption(
+        '--benchmark',
+        action='store_true',
+        help='Also run the benchmarks, which compare timings and may be slow.',
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        'markers', 'benchmark: compares timings, only runs with --benchmark'
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption('--benchmark', default=False):
+        return
+    skip = pytest.mark.skip(reason='Benchmarks only run with --benchmark')
+    for item in items:
+        if 'benchmark' in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture(autouse=True)
+def event_cache():
+    # Events are cached per process, but every test starts with a new database
+    clear_event_cache()
+
+
 @pytest.fixture
 def template_patch(monkeypatch):
     # Patch out template rendering for performance improvements
@@ -0,0 +1,84 @@
+import pytest
+from django.test import override_settings
+
+from pretalx.event.models import Event
+from pretalx.event.revision import get_content_revision, get_revision_cache_key
+
+
+@pytest.fixture
+def locmem_cache():
+    cache_settings = {
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+    }
+    with override_settings(CACHES=cache_settings):
+        yield
+
+
+@pytest.mark.django_db
+def test_content_revision_is_cached(event, locmem_cache, django_assert_num_queries):
+    revision = get_content_revision(event)
+    with django_assert_num_queries(0):
+        assert get_content_revision(event) == revision
+    event.refresh_from_db()
+    assert event.content_revision == revision
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    'change',
+    (
+        lambda submission: submission.save(),
+        lambda submission: submission.speakers.clear(),
+        lambda submission: submission.track.save(),
+        lambda submission: submission.event.rooms.first().save(),
+        lambda submission: submission.event.settings.set('show_schedule', False),
+        lambda submission: submission.event.questions.all().delete(),
+        lambda submission: submission.event.release_schedule('new'),
+        lambda submission: submission.speakers.first()
+        .event_profile(submission.event)
+        .save(),
+        lambda submission: submission.speakers.first().save(),
+        lambda submission: submission.submission_type.save(),
+        lambda submission: submission.delete(),
+    ),
+)
+def test_content_revision_grows_with_changes(
+    submission, track, room, question, locmem_cache, change
+):
+    submission.track = track
+    submission.save()
+    event = submission.event
+    revision = get_content_revision(event)
+    key = get_revision_cache_key(event, 'part')
+    change(submission)
+    assert get_content_revision(event) > revision
+    assert get_revision_cache_key(event, 'part') != key
+
+
+@pytest.mark.django_db
+def test_content_revision_is_per_event(event, other_event, room, locmem_cache):
+    revision = get_content_revision(other_event)
+    room.save()
+    assert get_content_revision(other_event) == revision
+
+
+@pytest.mark.django_db
+def test_content_revision_grows_with_deleted_slots(slot, locmem_cache):
+    event = slot.submission.event
+    revision = get_content_revision(event)
+    slot.delete()
+    assert get_content_revision(event) > revision
+
+
+@pytest.mark.django_db
+def test_content_revision_survives_stale_event_save(event, room, locmem_cache):
+    stale_event = Event.objects.get(pk=event.pk)
+    room.save()
+    room.save()
+    revision = get_content_revision(event)
+    stale_event.name = 'A new name'
+    stale_event.save()
+    assert get_content_revision(event) == revision + 1
+    event.refresh_from_db()
+    assert event.content_revision == revision + 1
+    assert str(event.name) == 'A new name'
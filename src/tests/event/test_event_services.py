@@ -2,6 +2,7 @@ from datetime import timedelta
 
 import pytest
 from django.core import mail as djmail
+from django.core.management import call_command
 from django.utils.timezone import now
 
 from pretalx.common.models.log import ActivityLog
@@ -99,3 +100,24 @@ def test_periodic_event_services(event):
 @pytest.mark.django_db
 def test_periodic_event_fail():
     task_periodic_event_services('lololol')
+
+
+@pytest.mark.django_db
+def test_task_periodic_event_created_after_archiving(event):
+    djmail.outbox = []
+    ActivityLog.objects.create(event=event, content_object=event, action_type='test')
+    call_command('archive_logs', event=event.slug)
+    assert not event.log_entries.exists()
+    task_periodic_event_services(event.slug)
+    event = event.__class__.objects.get(slug=event.slug)
+    assert len(djmail.outbox) == 1
+    assert event.settings.sent_mail_event_created
+
+
+@pytest.mark.django_db
+def test_task_periodic_event_without_logs(event):
+    djmail.outbox = []
+    event.log_entries.all().delete()
+    task_periodic_event_services(event.slug)
+    event = event.__class__.objects.get(slug=event.slug)
+    assert not event.settings.sent_mail_event_created
@@ -1,7 +1,8 @@
 import pytest
 
-from pretalx.event.models import Organiser
-from pretalx.event.utils import create_organiser_with_user
+from pretalx.common.middleware.domains import get_request_event
+from pretalx.event.models import Event, Organiser
+from pretalx.event.utils import create_organiser_with_user, get_event_by_slug
 
 
 @pytest.mark.django_db
@@ -12,3 +13,52 @@ def test_user_organiser_init(user):
     assert Organiser.objects.count() == 1
     assert user.teams.count() == 1
     assert user.teams.get().organiser == Organiser.objects.get()
+
+
+@pytest.mark.django_db
+def test_get_event_by_slug_is_cached(event, django_assert_num_queries):
+    assert get_event_by_slug('TEST') == event
+    with django_assert_num_queries(0):
+        cached = get_event_by_slug('test')
+    assert cached == event
+    assert cached is not get_event_by_slug('test')
+
+
+@pytest.mark.django_db
+def test_get_event_by_slug_cache_is_cleared_on_save(event):
+    get_event_by_slug(event.slug)
+    event.name = 'New name'
+    event.save()
+    assert str(get_event_by_slug(event.slug).name) == 'New name'
+
+
+@pytest.mark.django_db
+def test_get_event_by_slug_cache_is_cleared_on_delete(event):
+    get_event_by_slug(event.slug)
+    event.shred()
+    with pytest.raises(Event.DoesNotExist):
+        get_event_by_slug(event.slug)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    'method,url,cached',
+    (
+        ('get', '/{}/schedule/', True),
+        ('post', '/{}/schedule/', False),
+        ('get', '/orga/event/{}/', False),
+    ),
+)
+def test_request_event_is_only_cached_for_reading(event, rf, method, url, cached):
+    get_event_by_slug(event.slug)
+    # Another process changes the event
+    Event.objects.filter(pk=event.pk).update(is_public=False)
+    request = getattr(rf, method)(url.format(event.slug))
+    request_event = get_request_event(request, event.slug)
+    assert request_event.is_public is cached
+    if not cached:
+        request_event.name = 'New name'
+        request_event.save()
+        event.refresh_from_db()
+        assert event.is_public is False
+        assert str(event.name) == 'New name'
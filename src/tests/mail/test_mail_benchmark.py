@@ -0,0 +1,60 @@
+import time
+
+import bleach
+import markdown
+import pytest
+from django.template.loader import get_template
+from inlinestyler.utils import inline_css
+
+from pretalx.mail.models import QueuedMail
+
+OUTBOX_SIZE = 1000
+
+
+def render_uncached(text, event):
+    """Renders a mail the way it was done before the wrapper was cached:
+    the full wrapper template is rendered and inlined for every mail."""
+    body_md = bleach.linkify(
+        bleach.clean(markdown.markdown(text), tags=bleach.ALLOWED_TAGS + ['p', 'pre'])
+    )
+    html = get_template('mail/mailwrapper.html').render(
+        {'body': body_md, 'event': event, 'color': event.primary_color or '#1c4a3b'}
+    )
+    return inline_css(html)
+
+
+def mails_per_second(render, mails, event):
+    start = time.perf_counter()
+    for mail in mails:
+        render(mail.text, event)
+    return len(mails) / (time.perf_counter() - start)
+
+
+def get_mails(event):
+    return [
+        QueuedMail(
+            event=event,
+            subject=f'Mail {index}',
+            text=f'Hi speaker {index},\n\nplease [confirm](https://example.org/{index}) your talk!',
+        )
+        for index in range(OUTBOX_SIZE)
+    ]
+
+
+@pytest.mark.django_db
+def test_mail_rendering_inlines_styles(event):
+    mail = get_mails(event)[0]
+    rendered = QueuedMail.make_html(mail.text, event)
+    assert '<style' not in rendered
+    assert '<a style="color: #1c4a3b;font-weight: bold" href="https://example.org/0"' in rendered
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+def test_mail_rendering_benchmark(event):
+    mails = get_mails(event)
+    # Inlining every mail is slow, so the previous behaviour is measured on a
+    # part of the outbox only.
+    before = mails_per_second(render_uncached, mails[:OUTBOX_SIZE // 10], event)
+    after = mails_per_second(QueuedMail.make_html, mails, event)
+    assert after > before
@@ -1,6 +1,12 @@
 import pytest
+from django.core import mail as djmail
+from django.core.cache import cache
+from django.core.mail.backends import locmem
+from django.test import override_settings
 
-from pretalx.common.mail import TolerantDict
+from pretalx.common.mail import TolerantDict, wait_for_mail_rate_limit
+from pretalx.common.models import ActivityLog
+from pretalx.event.models import Event
 from pretalx.mail.models import QueuedMail
 
 
@@ -44,3 +50,62 @@ def test_mail_make_subject(event, text, prefix, expected):
     if prefix:
         event.settings.mail_subject_prefix = prefix
     assert QueuedMail.make_subject(text, event) == expected
+
+
+@pytest.mark.django_db
+def test_send_many_mails_in_batches(settings, mail_template, event, speaker):
+    settings.MAIL_BATCH_SIZE = 2
+    for _ in range(5):
+        mail_template.to_mail(speaker, event)
+    djmail.outbox = []
+    assert QueuedMail.send_many(event.queued_mails.all()) == 5
+    assert len(djmail.outbox) == 5
+    assert all(speaker.email in message.to for message in djmail.outbox)
+    assert not event.queued_mails.filter(sent__isnull=True).exists()
+    assert ActivityLog.objects.filter(action_type='pretalx.mail.sent').count() == 5
+    assert QueuedMail.send_many(event.queued_mails.all()) == 0
+
+
+@pytest.mark.django_db
+def test_send_many_retries_failed_mails_individually(
+    monkeypatch, mail_template, event, speaker
+):
+    class FailingBackend(locmem.EmailBackend):
+        failures = 1
+
+        def send_messages(self, messages):
+            if FailingBackend.failures:
+                FailingBackend.failures -= 1
+                raise Exception('Connection dropped')
+            return super().send_messages(messages)
+
+    monkeypatch.setattr(
+        Event, 'get_mail_backend', lambda self, force_custom=False: FailingBackend()
+    )
+    for _ in range(3):
+        mail_template.to_mail(speaker, event)
+    djmail.outbox = []
+    QueuedMail.send_many(event.queued_mails.all())
+    assert len(djmail.outbox) == 3
+
+
+@pytest.mark.parametrize('rate,sent', ((2, [0, 0, 1, 1, 2]), (0.5, [0, 2, 4])))
+def test_mail_rate_limit_is_shared(settings, mocker, rate, sent):
+    settings.MAIL_RATE_LIMIT = rate
+    clock = [1000.0]
+    mocker.patch('pretalx.common.mail.time.time', side_effect=lambda: clock[0])
+    mocker.patch(
+        'pretalx.common.mail.time.sleep',
+        side_effect=lambda seconds: clock.__setitem__(0, clock[0] + seconds),
+    )
+    cache_settings = {
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+    }
+    with override_settings(CACHES=cache_settings):
+        cache.clear()
+        # Every call stands for a mail sent by any worker
+        send_times = []
+        for _ in sent:
+            wait_for_mail_rate_limit()
+            send_times.append(clock[0] - 1000)
+    assert send_times == sent
@@ -1,4 +1,6 @@
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
 from django.urls import reverse
 
 
@@ -95,3 +97,18 @@ def test_dashboard_organiser_list(orga_user, orga_client, speaker, event, other_
     else:
         current_url = response.redirect_chain[-1][0]
         assert 'login' in current_url
+
+
+@pytest.mark.django_db
+def test_dashboard_uses_cached_permissions(orga_client, event):
+    cache_settings = {
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+    }
+    with override_settings(CACHES=cache_settings):
+        orga_client.get(event.orga_urls.base, follow=True)
+        with CaptureQueriesContext(connection) as context:
+            response = orga_client.get(event.orga_urls.base, follow=True)
+    assert response.status_code == 200
+    assert not [
+        query for query in context.captured_queries if '"event_team"' in query['sql']
+    ]
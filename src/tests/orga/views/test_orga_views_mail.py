@@ -109,9 +109,11 @@ def test_orga_can_send_all_mails(orga_client, event, mail, other_mail, sent_mail
     response = orga_client.get(event.orga_urls.send_outbox, follow=True)
     assert response.status_code == 200
     assert QueuedMail.objects.filter(sent__isnull=True).count() == 2
+    djmail.outbox = []
     response = orga_client.post(event.orga_urls.send_outbox, follow=True)
     assert response.status_code == 200
     assert QueuedMail.objects.filter(sent__isnull=True).count() == 0
+    assert len(djmail.outbox) == 2
 
 
 @pytest.mark.django_db
@@ -1,4 +1,11 @@
+import math
+
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from pretalx.common.models import ActivityLog
+from pretalx.submission.models import Review, Submission
 
 
 @pytest.mark.django_db
@@ -232,17 +239,53 @@ def test_orga_can_see_review(orga_client, review):
 
 
 @pytest.mark.django_db
-@pytest.mark.parametrize('sort', ('count', '-count', 'score', '-score'))
+@pytest.mark.parametrize('sort', ('count', '-count', 'score', '-score', 'average', '-average'))
 def test_reviewer_can_see_dashboard(review_client, submission, review, sort, django_assert_num_queries, other_submission):
-    with django_assert_num_queries(49):
+    with django_assert_num_queries(22):
         response = review_client.get(submission.event.orga_urls.reviews + '?sort=' + sort)
     assert response.status_code == 200
 
 
+@pytest.mark.django_db
+def test_dashboard_sorts_and_counts_in_database(orga_client, event, submission, other_submission, orga_user, speaker, other_speaker):
+    Review.objects.create(submission=submission, user=speaker, score=1)
+    Review.objects.create(submission=submission, user=other_speaker, score=2)
+    Review.objects.create(submission=other_submission, user=speaker, score=3)
+
+    def get_submissions(sort):
+        with CaptureQueriesContext(connection) as context:
+            response = orga_client.get(event.orga_urls.reviews + '?sort=' + sort)
+        assert response.status_code == 200
+        return list(response.context['submissions']), len(context.captured_queries)
+
+    get_submissions('score')  # warm up sessions and settings
+    submissions, initial_count = get_submissions('score')
+    assert submissions == [other_submission, submission]
+    assert submissions[1].current_score == 1.5
+    assert get_submissions('-score')[0] == [submission, other_submission]
+    assert get_submissions('count')[0] == [submission, other_submission]
+    assert get_submissions('-count')[0] == [other_submission, submission]
+    submissions = get_submissions('average')[0]
+    assert submissions == [other_submission, submission]
+    assert [s.average_score for s in submissions] == [3, 1.5]
+    assert get_submissions('-average')[0] == [submission, other_submission]
+
+    for index in range(5):
+        new_submission = Submission.objects.create(
+            title=f'Talk {index}',
+            event=event,
+            submission_type=event.cfp.default_type,
+            content_locale='en',
+        )
+        new_submission.speakers.add(other_speaker)
+        Review.objects.create(submission=new_submission, user=speaker, score=index)
+    assert get_submissions('score')[1] == initial_count
+
+
 @pytest.mark.django_db
 def test_reviewer_with_track_limit_can_see_dashboard(review_client, review_user, track, submission, review, django_assert_num_queries, other_submission):
     review_user.teams.first().limit_tracks.add(track)
-    with django_assert_num_queries(44):
+    with django_assert_num_queries(17):
         response = review_client.get(submission.event.orga_urls.reviews)
     assert response.status_code == 200
 
@@ -258,3 +301,38 @@ def test_orga_cannot_add_review(orga_client, submission):
     )
     assert response.status_code == 200
     assert submission.reviews.count() == 0
+
+
+@pytest.mark.django_db
+def test_orga_can_bulk_accept_and_reject(orga_client, event, submission, speaker):
+    submissions = [submission]
+    for index in range(499):
+        other = Submission.objects.create(
+            title=f'Talk {index}',
+            event=event,
+            submission_type=event.cfp.default_type,
+            content_locale='en',
+        )
+        other.speakers.add(speaker)
+        submissions.append(other)
+    data = {f's-{sub.pk}': 'accept' for sub in submissions[:-1]}
+    data[f's-{submissions[-1].pk}'] = 'reject'
+    data['s-0'] = 'accept'
+
+    with CaptureQueriesContext(connection) as context:
+        response = orga_client.post(event.orga_urls.reviews, data=data)
+    assert response.status_code == 200
+    log_inserts = [
+        query for query in context.captured_queries
+        if query['sql'].startswith('INSERT INTO "common_activitylog"')
+    ]
+    # All log entries are written with one bulk insert, which some databases
+    # split into batches.
+    batch_size = connection.ops.bulk_batch_size(
+        ActivityLog._meta.concrete_fields, submissions
+    )
+    assert len(log_inserts) == math.ceil(len(submissions) / batch_size)
+    assert event.submissions.filter(state='accepted').count() == 499
+    assert event.submissions.filter(state='rejected').count() == 1
+    assert event.logged_actions().count() == 0
+    assert event.submissions.first().logged_actions().count() == 1
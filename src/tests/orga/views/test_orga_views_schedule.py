@@ -148,6 +148,13 @@ def test_orga_can_see_schedule_release_view(orga_client, event):
     assert response.status_code == 200
 
 
+@pytest.mark.django_db
+def test_orga_can_see_schedule_release_status(orga_client, event, schedule):
+    response = orga_client.get(event.orga_urls.release_schedule_status)
+    assert response.status_code == 200
+    assert json.loads(response.content.decode()) == {'state': None}
+
+
 @pytest.mark.django_db
 def test_orga_cannot_reset_to_wrong_version(orga_client, event):
     assert Schedule.objects.count() == 1
@@ -1,6 +1,9 @@
+import json
 from datetime import timedelta
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils.timezone import now
 
 from pretalx.submission.models import Submission, SubmissionStates
@@ -335,3 +338,40 @@ def test_orga_can_toggle_submission_featured(orga_client, event, submission):
     assert response.status_code == 200
     sub = event.submissions.first()
     assert sub.is_featured
+
+
+@pytest.mark.django_db
+def test_orga_submission_list_query_count(orga_client, event, speaker, submission):
+    def count_queries():
+        with CaptureQueriesContext(connection) as context:
+            response = orga_client.get(event.orga_urls.submissions, follow=True)
+        assert response.status_code == 200
+        return len(context.captured_queries)
+
+    count_queries()  # warm up sessions and settings
+    initial_count = count_queries()
+    for index in range(5):
+        other = Submission.objects.create(
+            title=f'Talk {index}',
+            event=event,
+            submission_type=event.cfp.default_type,
+            content_locale='en',
+        )
+        other.speakers.add(speaker)
+    assert count_queries() == initial_count
+
+
+@pytest.mark.django_db
+def test_orga_submission_statistics(orga_client, event, submission, other_submission):
+    submission.log_action('pretalx.submission.create')
+    other_submission.log_action('pretalx.submission.create')
+    other_submission.logged_actions().update(timestamp=now() - timedelta(days=2))
+    submission.accept()
+    response = orga_client.get(event.orga_urls.base + 'submissions/statistics/')
+    assert response.status_code == 200
+    assert response.context['submission_state_data'] == (
+        '[{"label": "accepted", "value": 1}, {"label": "submitted", "value": 1}]'
+    )
+    assert response.context['talk_state_data'] == '[{"label": "accepted", "value": 1}]'
+    assert [day['y'] for day in json.loads(response.context['submission_timeline_data'])] == [1, 0, 1]
+    assert response.context['talk_timeline_data'] == ''
@@ -1,5 +1,7 @@
 import pytest
+from django.test.utils import override_settings
 
+from pretalx.common.models import ActivityLog, ArchivedActivityLog
 from pretalx.person.models.user import User
 from pretalx.submission.models.question import Answer
 
@@ -73,3 +75,104 @@ def test_organizer_permissions(event, orga_user):
         'can_change_submissions',
     }
     assert orga_user.get_permissions_for_event(event) == permission_set
+
+
+@pytest.mark.django_db
+def test_team_permissions_reviewer_tracks(event, review_user, track, submission):
+    team = review_user.teams.get()
+    assert review_user.get_team_permissions(event)['reviewer_tracks'] is None
+    assert review_user.has_perm('submission.view_reviews', submission)
+    team.limit_tracks.add(track)
+    permissions = review_user.get_team_permissions(event)
+    assert permissions['has_teams'] is True
+    assert permissions['permissions'] == {'is_reviewer'}
+    assert permissions['reviewer_tracks'] == {track.pk}
+    assert not review_user.has_perm('submission.view_reviews', submission)
+    submission.track = track
+    submission.save()
+    assert review_user.has_perm('submission.view_reviews', submission)
+
+
+@pytest.mark.django_db
+def test_permission_cache(event, orga_user, submission, django_assert_num_queries):
+    orga_user.start_permission_cache()
+    with django_assert_num_queries(3):
+        for _ in range(3):
+            assert orga_user.has_perm('orga.view_submissions', event)
+            assert orga_user.has_perm('submission.edit_submission', submission)
+            assert orga_user.has_perm('orga.view_review_dashboard', event)
+
+
+@pytest.mark.django_db
+def test_permission_matrix_is_cached_and_invalidated(
+    event, other_event, orga_user, track, django_assert_num_queries
+):
+    cache_settings = {
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+    }
+    with override_settings(CACHES=cache_settings):
+        team = orga_user.teams.get()
+        assert orga_user.get_permissions_for_event(event)
+        with django_assert_num_queries(0):
+            assert orga_user.get_permissions_for_event(event)
+            assert not orga_user.get_permissions_for_event(other_event)
+
+        other_event.organiser = event.organiser
+        other_event.save()
+        team.limit_events.add(other_event)
+        assert 'can_change_submissions' in orga_user.get_permissions_for_event(other_event)
+
+        team.can_change_submissions = False
+        team.save()
+        assert 'can_change_submissions' not in orga_user.get_permissions_for_event(event)
+
+        team.is_reviewer = True
+        team.save()
+        assert orga_user.get_team_permissions(event)['reviewer_tracks'] is None
+        team.limit_tracks.add(track)
+        assert orga_user.get_team_permissions(event)['reviewer_tracks'] == {track.pk}
+
+        team.members.remove(orga_user)
+        assert orga_user.get_permissions_for_event(event) == set()
+        orga_user.teams.add(team)
+        assert orga_user.get_permissions_for_event(event)
+        team.delete()
+        assert orga_user.get_permissions_for_event(event) == set()
+
+
+@pytest.mark.django_db
+def test_user_actions_include_archived_logs(speaker, event):
+    speaker.log_action('pretalx.user.profile.update')
+    event.log_action('pretalx.event.update', person=speaker)
+    ArchivedActivityLog.archive(ActivityLog.objects.all())
+    assert not ActivityLog.objects.exists()
+    assert [log.action_type for log in speaker.logged_actions()] == [
+        'pretalx.user.profile.update'
+    ]
+    assert speaker.own_actions().count() == 2
+
+
+@pytest.mark.django_db
+def test_team_permissions_reviewer_tracks_per_event(
+    event, other_event, review_user, track
+):
+    team = review_user.teams.get()
+    other_event.organiser = event.organiser
+    other_event.save()
+    team.all_events = True
+    team.save()
+    team.limit_tracks.add(track)
+    assert review_user.get_team_permissions(event)['reviewer_tracks'] == {track.pk}
+    assert review_user.get_team_permissions(other_event)['reviewer_tracks'] is None
+
+
+@pytest.mark.django_db
+def test_team_permissions_after_track_deletion(event, review_user, track):
+    cache_settings = {
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+    }
+    with override_settings(CACHES=cache_settings):
+        review_user.teams.get().limit_tracks.add(track)
+        assert review_user.get_team_permissions(event)['reviewer_tracks'] == {track.pk}
+        track.delete()
+        assert review_user.get_team_permissions(event)['reviewer_tracks'] is None
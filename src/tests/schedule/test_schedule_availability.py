@@ -1,8 +1,10 @@
 import datetime
+import random
 
 import pytest
 
 from pretalx.schedule.models import Availability
+from pretalx.schedule.models.availability import IntervalSet
 
 
 @pytest.mark.django_db
@@ -261,10 +263,10 @@ def test_union(avails, expected):
                 Availability(start=datetime.datetime(2017, 1, 1, 0), end=datetime.datetime(2017, 1, 1, 3)),
                 Availability(start=datetime.datetime(2017, 1, 1, 6), end=datetime.datetime(2017, 1, 1, 8)),
             ],
-            [Availability(start=datetime.datetime(2017, 1, 1, 9), end=datetime.datetime(2017, 1, 1, 7))],
+            [Availability(start=datetime.datetime(2017, 1, 1, 4), end=datetime.datetime(2017, 1, 1, 9))],
         ],
         [
-            Availability(start=datetime.datetime(2017, 1, 1, 9), end=datetime.datetime(2017, 1, 1, 7)),
+            Availability(start=datetime.datetime(2017, 1, 1, 6), end=datetime.datetime(2017, 1, 1, 7)),
         ],
     ),
     (
@@ -385,3 +387,80 @@ def test_availability_contains(one, two, expected):
     one = Availability(start=datetime.datetime(*one[0]), end=datetime.datetime(*one[1]))
     two = Availability(start=datetime.datetime(*two[0]), end=datetime.datetime(*two[1]))
     assert one.contains(two) is expected
+
+
+def reference_union(availabilities):
+    """The previous quadratic implementation of Availability.union."""
+    if not availabilities:
+        return []
+    availabilities = sorted(availabilities, key=lambda a: a.start)
+    result = [availabilities[0]]
+    for avail in availabilities[1:]:
+        if avail.overlaps(result[-1], False):
+            result[-1] = result[-1].merge_with(avail)
+        else:
+            result.append(avail)
+    return result
+
+
+def reference_intersection(*availabilitysets):
+    """The previous quadratic implementation of Availability.intersection."""
+    availabilitysets = [reference_union(availset) for availset in availabilitysets]
+    if not availabilitysets or not all(availabilitysets):
+        return []
+    result = availabilitysets[0]
+    for availset in availabilitysets[1:]:
+        result = [
+            a.intersect_with(b) for a in result for b in availset if a.overlaps(b, True)
+        ]
+    return result
+
+
+def random_availabilities(rng, count):
+    base = datetime.datetime(2017, 1, 1)
+    result = []
+    for _ in range(count):
+        start = rng.randint(0, 200)
+        result.append(
+            Availability(
+                start=base + datetime.timedelta(hours=start),
+                end=base + datetime.timedelta(hours=start + rng.randint(1, 30)),
+            )
+        )
+    return result
+
+
+def as_tuples(availabilities):
+    return [(avail.start, avail.end) for avail in availabilities]
+
+
+@pytest.mark.parametrize('seed', range(50))
+def test_union_matches_reference(seed):
+    rng = random.Random(seed)
+    availabilities = random_availabilities(rng, rng.randint(0, 20))
+    assert as_tuples(Availability.union(availabilities)) == as_tuples(
+        reference_union(availabilities)
+    )
+
+
+@pytest.mark.parametrize('seed', range(50))
+def test_intersection_matches_reference(seed):
+    rng = random.Random(seed)
+    availabilitysets = [
+        random_availabilities(rng, rng.randint(0, 15)) for _ in range(rng.randint(1, 4))
+    ]
+    expected = as_tuples(reference_intersection(*availabilitysets))
+    assert as_tuples(Availability.intersection(*availabilitysets)) == expected
+    assert as_tuples(Availability.intersection(*reversed(availabilitysets))) == expected
+
+
+@pytest.mark.parametrize('seed', range(50))
+def test_interval_set_contains_matches_reference(seed):
+    rng = random.Random(seed)
+    availabilities = random_availabilities(rng, rng.randint(0, 20))
+    interval_set = IntervalSet.from_availabilities(availabilities)
+    for candidate in random_availabilities(rng, 20):
+        expected = any(
+            avail.contains(candidate) for avail in reference_union(availabilities)
+        )
+        assert interval_set.contains(candidate.start, candidate.end) == expected
@@ -0,0 +1,92 @@
+import datetime as dt
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils.timezone import now
+
+from pretalx.schedule.conflicts import get_talk_warnings
+from pretalx.schedule.models import Availability, TalkSlot
+from pretalx.submission.models import Submission
+
+
+def warning_types(warnings):
+    return sorted(warning['type'] for warning in warnings)
+
+
+@pytest.mark.django_db
+def test_talk_warnings_room_unavailable(slot):
+    assert warning_types(get_talk_warnings(slot.schedule)[slot.pk]) == ['room']
+    assert warning_types(slot.warnings) == ['room']
+
+
+@pytest.mark.django_db
+def test_talk_warnings_room_available(slot, room_availability):
+    assert get_talk_warnings(slot.schedule)[slot.pk] == []
+
+
+@pytest.mark.django_db
+def test_talk_warnings_speaker_unavailable(slot, room_availability, speaker):
+    Availability.objects.create(
+        event=slot.event,
+        person=speaker.event_profile(slot.event),
+        start=slot.start - dt.timedelta(days=2),
+        end=slot.start - dt.timedelta(days=1),
+    )
+    warnings = get_talk_warnings(slot.schedule)[slot.pk]
+    assert warning_types(warnings) == ['speaker']
+    assert warnings[0]['speaker'] == {'name': speaker.name, 'id': speaker.pk}
+
+
+@pytest.mark.django_db
+def test_talk_warnings_overlaps(slot, other_slot, room_availability, speaker):
+    other_slot.submission.speakers.add(speaker)
+    warnings = get_talk_warnings(slot.schedule)
+    assert warning_types(warnings[slot.pk]) == ['room_overlap', 'speaker_overlap']
+    assert warning_types(warnings[other_slot.pk]) == [
+        'room_overlap', 'speaker_overlap',
+    ]
+
+
+@pytest.mark.django_db
+def test_talk_warnings_adjacent_talks_do_not_overlap(
+    slot, other_slot, room_availability, speaker
+):
+    other_slot.submission.speakers.add(speaker)
+    other_slot.start = slot.end
+    other_slot.end = slot.end + dt.timedelta(minutes=30)
+    other_slot.save()
+    warnings = get_talk_warnings(slot.schedule)
+    assert warnings[slot.pk] == []
+    assert warnings[other_slot.pk] == []
+
+
+@pytest.mark.django_db
+def test_talk_warnings_query_count_is_constant(
+    event, slot, schedule, room, other_speaker
+):
+    def count_queries():
+        with CaptureQueriesContext(connection) as context:
+            get_talk_warnings(schedule)
+        return len(context.captured_queries)
+
+    count_queries()  # warm up settings
+    initial_count = count_queries()
+    for index in range(5):
+        submission = Submission.objects.create(
+            title=f'Talk {index}',
+            event=event,
+            submission_type=event.cfp.default_type,
+            state='confirmed',
+            content_locale='en',
+        )
+        submission.speakers.add(other_speaker)
+        TalkSlot.objects.create(
+            submission=submission,
+            schedule=schedule,
+            room=room,
+            start=now() + dt.timedelta(minutes=index),
+            end=now() + dt.timedelta(minutes=index + 30),
+            is_visible=True,
+        )
+    assert count_queries() == initial_count
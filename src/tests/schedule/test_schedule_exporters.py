@@ -0,0 +1,55 @@
+import datetime as dt
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils.timezone import now
+
+from pretalx.schedule.exporters import (
+    FrabJsonExporter, FrabXCalExporter, FrabXmlExporter, ICalExporter,
+)
+from pretalx.schedule.models import Schedule, TalkSlot
+from pretalx.submission.models import Answer, Submission
+
+
+def count_render_queries(exporter_class, event, schedule):
+    exporter = exporter_class(event, schedule=Schedule.objects.get(pk=schedule.pk))
+    exporter.is_orga = True
+    with CaptureQueriesContext(connection) as context:
+        exporter.render()
+    return len(context.captured_queries)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    'exporter_class', (FrabJsonExporter, FrabXmlExporter, FrabXCalExporter, ICalExporter)
+)
+def test_schedule_exporter_query_count_is_constant(
+    exporter_class, event, slot, schedule, room, personal_answer, other_speaker,
+    answered_choice_question,
+):
+    count_render_queries(exporter_class, event, schedule)  # warm up settings
+    initial_count = count_render_queries(exporter_class, event, schedule)
+
+    for index in range(5):
+        submission = Submission.objects.create(
+            title=f'Talk {index}',
+            event=event,
+            submission_type=event.cfp.default_type,
+            state='confirmed',
+            content_locale='en',
+        )
+        submission.speakers.add(other_speaker)
+        Answer.objects.create(
+            answer='True', submission=submission, question=personal_answer.question
+        )
+        TalkSlot.objects.create(
+            submission=submission,
+            schedule=schedule,
+            room=room,
+            start=now() + dt.timedelta(minutes=index),
+            end=now() + dt.timedelta(minutes=index + 30),
+            is_visible=True,
+        )
+
+    assert count_render_queries(exporter_class, event, schedule) == initial_count
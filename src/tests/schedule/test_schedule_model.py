@@ -2,11 +2,14 @@ from datetime import timedelta
 
 import pytest
 from django.core import mail as djmail
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.utils.timezone import now
 
 from pretalx.mail.models import QueuedMail
 from pretalx.schedule.models import Schedule, TalkSlot
-from pretalx.submission.models import Submission
+from pretalx.submission.models import Submission, SubmissionStates
 
 
 @pytest.mark.django_db
@@ -26,6 +29,50 @@ def test_copy_to_schedule(slot):
     assert new_slot.schedule == new_schedule
 
 
+def _slot_values(schedule):
+    return sorted(
+        schedule.talks.values_list('submission_id', 'room_id', 'is_visible', 'start', 'end')
+    )
+
+
+@pytest.mark.parametrize('insert_select', (True, False))
+@pytest.mark.django_db
+def test_copy_slots_to_schedule(slot, room, monkeypatch, insert_select):
+    from pretalx.schedule.models import slot as slot_module
+
+    if not insert_select:
+        monkeypatch.setattr(slot_module, 'INSERT_SELECT_VENDORS', ())
+    event = slot.event
+    for index in range(5):
+        sub = Submission.objects.create(
+            title=f'Talk {index}', event=event, submission_type=event.cfp.default_type
+        )
+        TalkSlot.objects.create(
+            submission=sub,
+            schedule=slot.schedule,
+            room=room if index % 2 else None,
+            start=now() + timedelta(hours=index),
+            end=now() + timedelta(hours=index + 1),
+            is_visible=bool(index % 2),
+        )
+    new_schedule = Schedule.objects.create(event=event, version='Version')
+    with CaptureQueriesContext(connection) as context:
+        count = slot.schedule.talks.all().copy_to_schedule(new_schedule)
+    assert count == 6
+    if insert_select:
+        assert len(context.captured_queries) == 1
+    assert _slot_values(new_schedule) == _slot_values(slot.schedule)
+    assert all(talk.updated for talk in new_schedule.talks.all())
+
+
+@pytest.mark.django_db
+def test_copy_empty_slots_to_schedule(slot):
+    new_schedule = Schedule.objects.create(event=slot.event, version='Version')
+    assert TalkSlot.objects.none().copy_to_schedule(new_schedule) == 0
+    assert slot.schedule.talks.filter(pk__in=[]).copy_to_schedule(new_schedule) == 0
+    assert not new_schedule.talks.exists()
+
+
 @pytest.mark.django_db
 def test_freeze(slot):
     slot_count = TalkSlot.objects.count()
@@ -101,9 +148,14 @@ def test_unfreeze_bug72(slot):
     TalkSlot.objects.create(submission=sub, room=slot.room, schedule=event.wip_schedule, is_visible=True)
     schedule2, _ = event.wip_schedule.freeze('Version 2')
 
+    new_slot = event.wip_schedule.talks.get(submission=sub)
     schedule1.unfreeze()
 
     assert event.wip_schedule.talks.count() == 2
+    assert _slot_values(event.wip_schedule) == sorted(
+        _slot_values(schedule1)
+        + [(sub.pk, new_slot.room_id, new_slot.is_visible, None, None)]
+    )
     # make sure the cache for wip_schedule is invalidated
     assert event.wip_schedule.version is None
 
@@ -212,3 +264,107 @@ def test_schedule_changes(event, slot, room, accepted_submission):
     schedule, _ = event.wip_schedule.freeze('test4')
     assert schedule.changes['count'] == 1
     assert len(schedule.changes['canceled_talks']) == 1
+
+
+@pytest.mark.django_db
+def test_schedule_snapshot_is_cached(slot, schedule, django_assert_num_queries):
+    cache_settings = {
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+    }
+    with override_settings(CACHES=cache_settings):
+        data = schedule.get_snapshot('data')
+        assert any(
+            talk['submission']['code'] == slot.submission.code
+            for day in data
+            for room in day['rooms']
+            for talk in room['talks']
+        )
+        with django_assert_num_queries(0):
+            assert schedule.get_snapshot('data') == data
+
+
+@pytest.mark.django_db
+def test_schedule_changes_query_count_is_constant(event, slot, room):
+    def count_change_queries():
+        schedule = Schedule.objects.get(pk=event.wip_schedule.pk)
+        schedule.previous_schedule  # noqa
+        with CaptureQueriesContext(connection) as context:
+            changes = schedule.changes
+        return len(context.captured_queries), changes
+
+    for talk in event.wip_schedule.talks.all():
+        talk.start += timedelta(hours=1)
+        talk.save()
+    initial_count, changes = count_change_queries()
+    assert len(changes['moved_talks']) == 1
+
+    for index in range(5):
+        submission = Submission.objects.create(
+            title=f'Talk {index}',
+            event=event,
+            submission_type=event.cfp.default_type,
+            state='confirmed',
+            content_locale='en',
+        )
+        TalkSlot.objects.create(
+            submission=submission,
+            schedule=event.wip_schedule,
+            room=room,
+            start=now() + timedelta(minutes=index),
+            end=now() + timedelta(minutes=index + 30),
+            is_visible=True,
+        )
+    count, changes = count_change_queries()
+    assert len(changes['new_talks']) == 5
+    assert count == initial_count
+
+
+@pytest.mark.django_db
+def test_schedule_changes_of_released_schedules_are_cached(
+    event, slot, django_assert_num_queries
+):
+    cache_settings = {
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+    }
+    with override_settings(CACHES=cache_settings):
+        wip_slot = event.wip_schedule.talks.get(submission=slot.submission)
+        wip_slot.start += timedelta(hours=1)
+        wip_slot.end += timedelta(hours=1)
+        wip_slot.save()
+        schedule, _ = event.wip_schedule.freeze('v2')
+        previous_schedule = schedule.previous_schedule
+        diff = schedule.get_slot_diff(previous_schedule)
+        assert len(diff['moved_talks']) == 1
+        with django_assert_num_queries(0):
+            assert schedule.get_slot_diff(previous_schedule) == diff
+
+        slot.submission.state = SubmissionStates.DELETED
+        slot.submission.save()
+        assert schedule.get_slot_diff(previous_schedule)['moved_talks'] == []
+
+
+@pytest.mark.django_db
+def test_schedule_notify_speakers_saves_recipients(event, slot, speaker):
+    QueuedMail.objects.all().delete()
+    progress = []
+    slot.schedule.notify_speakers(
+        progress=lambda done, total: progress.append((done, total))
+    )
+    mail = QueuedMail.objects.get()
+    assert list(mail.to_users.all()) == [speaker]
+    assert progress == [(1, 1)]
+
+
+@pytest.mark.django_db
+def test_schedule_release_tasks_report_status(event, slot):
+    cache_settings = {
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+    }
+    with override_settings(CACHES=cache_settings):
+        QueuedMail.objects.all().delete()
+        schedule = slot.schedule
+        assert schedule.release_status is None
+        schedule.set_release_status('pending')
+        schedule.start_release_tasks(notify_speakers=True)
+        assert schedule.release_status == {'state': 'done', 'done': 1, 'total': 1}
+        assert QueuedMail.objects.count() == 1
@@ -1,6 +1,7 @@
 import pytest
 
 from pretalx.submission.models import Review
+from pretalx.submission.models.review import review_pivot
 
 
 @pytest.mark.django_db
@@ -18,7 +19,9 @@ def test_median_review_score(submission, scores, expected):
     speaker = submission.speakers.first()
     reviews = [Review(submission=submission, score=score, user=speaker) for score in scores]
     Review.objects.bulk_create(reviews)
+    submission.update_review_scores()
     assert submission.median_score == expected
+    assert submission.review_count == len(scores)
     submission.reviews.all().delete()
 
 
@@ -34,3 +37,80 @@ def test_review_score_display(submission, score, override, expected, speaker):
     r = Review.objects.create(submission=submission, user=speaker, score=score, override_vote=override)
     assert submission.title in str(r)
     assert r.display_score == expected
+
+
+@pytest.mark.django_db
+def test_review_scores_are_kept_current(submission, speaker, other_speaker):
+    review = Review.objects.create(submission=submission, user=speaker, score=1)
+    Review.objects.create(submission=submission, user=other_speaker, score=2)
+    submission.refresh_from_db()
+    assert submission.review_count == 2
+    assert submission.median_score == 1.5
+    review.score = 3
+    review.save()
+    submission.refresh_from_db()
+    assert submission.median_score == 2.5
+    review.delete()
+    submission.refresh_from_db()
+    assert submission.review_count == 1
+    assert submission.median_score == 2
+
+
+@pytest.mark.django_db
+def test_review_scores_are_kept_current_on_queryset_deletes(submission, speaker, other_speaker):
+    Review.objects.create(submission=submission, user=speaker, score=1)
+    Review.objects.create(submission=submission, user=other_speaker, score=2)
+    Review.objects.filter(user=other_speaker).delete()
+    submission.refresh_from_db()
+    assert submission.review_count == 1
+    assert submission.median_score == 1
+    speaker.reviews.all().delete()
+    submission.refresh_from_db()
+    assert submission.review_count == 0
+    assert submission.median_score is None
+
+
+@pytest.mark.django_db
+def test_review_scores_are_not_overwritten(submission, speaker):
+    Review.objects.create(submission=submission, user=speaker, score=1)
+    stale = type(submission).objects.get(pk=submission.pk)
+    stale.review_count = 0
+    stale.median_score = None
+    stale.save()
+    submission.refresh_from_db()
+    assert submission.review_count == 1
+    assert submission.median_score == 1
+
+
+@pytest.mark.django_db
+def test_find_missing_reviews_order(event, submission, review_user, orga_user):
+    submissions = [submission] + [
+        type(submission).objects.create(
+            title=f'Talk {index}',
+            event=event,
+            submission_type=submission.submission_type,
+            content_locale='en',
+        )
+        for index in range(20)
+    ]
+    Review.objects.create(submission=submissions[1], user=orga_user, score=1)
+
+    order = list(Review.find_missing_reviews(event, review_user))
+    assert order == list(Review.find_missing_reviews(event, review_user))
+    assert set(order) == set(submissions)
+    assert order[-1] == submissions[1]
+    by_code = sorted(order[:-1], key=lambda submission: submission.code)
+    pivot = review_pivot(review_user)
+    assert order[:-1] == [s for s in by_code if s.code >= pivot] + [
+        s for s in by_code if s.code < pivot
+    ]
+    other_order = list(Review.find_missing_reviews(event, orga_user))
+    assert submissions[1] not in other_order
+    assert review_pivot(orga_user) != pivot
+
+    assert Review.find_next_submissions(event, review_user) == order[:1]
+    assert Review.find_next_submissions(event, review_user, count=3) == order[:3]
+    assert Review.find_next_submissions(
+        event, review_user, count=3, ignore=[order[0]]
+    ) == order[1:4]
+    assert Review.find_next_submissions(event, review_user, count=30) == order
@@ -1,4 +1,7 @@
+import datetime
+
 import pytest
+import pytz
 
 from pretalx.submission.models import Answer, SubmissionError, SubmissionStates
 from pretalx.submission.models.submission import submission_image_path
@@ -251,3 +254,26 @@ def test_submission_change_slot_count(accepted_submission):
     accepted_submission.save()
     accepted_submission.accept()
     assert accepted_submission.slots.filter(schedule=accepted_submission.event.wip_schedule).count() == 1
+
+
+@pytest.mark.django_db
+def test_submission_availabilities_intersect_speakers(submission, speaker, other_speaker):
+    from pretalx.schedule.models import Availability
+
+    submission.speakers.add(other_speaker)
+    base = datetime.datetime(2017, 1, 1, tzinfo=pytz.utc)
+    profile = speaker.profiles.get(event=submission.event)
+    other_profile = other_speaker.profiles.get(event=submission.event)
+    Availability.objects.create(
+        event=submission.event, person=profile, start=base, end=base + datetime.timedelta(hours=4)
+    )
+    Availability.objects.create(
+        event=submission.event,
+        person=other_profile,
+        start=base + datetime.timedelta(hours=2),
+        end=base + datetime.timedelta(hours=6),
+    )
+    availabilities = submission.availabilities
+    assert len(availabilities) == 1
+    assert availabilities[0].start == base + datetime.timedelta(hours=2)
+    assert availabilities[0].end == base + datetime.timedelta(hours=4)
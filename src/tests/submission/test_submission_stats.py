@@ -0,0 +1,53 @@
+import datetime as dt
+
+import pytest
+from django.test import override_settings
+from django.utils.timezone import now
+
+from pretalx.common.models import ActivityLog, ArchivedActivityLog
+from pretalx.submission.stats import clear_submission_stats, get_submission_stats
+
+
+@pytest.mark.django_db
+def test_submission_stats(submission, other_submission, track, django_assert_num_queries):
+    cache_settings = {
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+    }
+    with override_settings(CACHES=cache_settings):
+        event = submission.event
+        submission.log_action('pretalx.submission.create')
+        other_submission.log_action('pretalx.submission.create')
+        yesterday = now() - dt.timedelta(days=1)
+        other_submission.logged_actions().update(timestamp=yesterday)
+        submission.track = track
+        submission.save()
+
+        stats = get_submission_stats(event)
+        assert stats['submissions']['state'] == {'submitted': 2}
+        assert stats['submissions']['type'] == {
+            submission.submission_type_id: 1, other_submission.submission_type_id: 1,
+        }
+        assert stats['submissions']['track'] == {track.pk: 1, None: 1}
+        assert stats['submissions']['timeline'] == {
+            now().date(): 1, yesterday.date(): 1,
+        }
+        assert stats['talks']['state'] == {}
+        assert stats['talks']['timeline'] == {}
+        with django_assert_num_queries(0):
+            assert get_submission_stats(event) == stats
+
+        other_submission.accept()
+        stats = get_submission_stats(event)
+        assert stats['submissions']['state'] == {'submitted': 1, 'accepted': 1}
+        assert stats['talks']['state'] == {'accepted': 1}
+        assert stats['talks']['track'] == {None: 1}
+        assert stats['talks']['timeline'] == {yesterday.date(): 1}
+
+        ArchivedActivityLog.archive(ActivityLog.objects.filter(event=event))
+        clear_submission_stats(event.pk)
+        assert get_submission_stats(event) == stats
+
+        submission.delete()
+        stats = get_submission_stats(event)
+        assert stats['submissions']['state'] == {'accepted': 1}
+        assert stats['submissions']['track'] == {None: 1}